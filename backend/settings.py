@@ -148,6 +148,15 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'frontend' / 'static'] if (BASE_DIR / 'frontend' / 'static').exists() else []
 
+# Precomputed ML artifacts (memory-mapped .npy files), rebuilt when the catalog changes
+ML_ARTIFACTS_DIR = Path(os.getenv('ML_ARTIFACTS_DIR', BASE_DIR / 'ml_artifacts'))
+# Artifacts are written by `manage.py build_ml_artifacts`; set to also publish them from
+# whichever worker first fits a model for a catalog that has none yet
+ML_ARTIFACTS_WRITE_ON_DEMAND = os.getenv('ML_ARTIFACTS_WRITE_ON_DEMAND', 'false').lower() == 'true'
+
+# Runs tests against a throwaway ML_ARTIFACTS_DIR
+TEST_RUNNER = 'backend.test_runner.TestRunner'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -0,0 +1,23 @@
+import shutil
+import tempfile
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Default runner that points ML_ARTIFACTS_DIR at a temporary directory for the
+    whole run, so tests never write to (or prune) the real artifact bundles.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._artifacts_dir = tempfile.mkdtemp(prefix='ml_artifacts_')
+        self._artifacts_settings = override_settings(ML_ARTIFACTS_DIR=self._artifacts_dir)
+        self._artifacts_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._artifacts_settings.disable()
+        shutil.rmtree(self._artifacts_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,146 @@
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from ml.artifacts import open_bundle, write_bundle
+from ml.scoring import CareerScoringEngine
+from .models import CareerPath
+
+logger = logging.getLogger(__name__)
+
+CAREER_FIELDS = (
+    'id', 'title', 'description', 'entry_level_salary', 'mid_level_salary',
+    'senior_level_salary', 'growth_rate', 'demand_level',
+)
+
+
+class CatalogSnapshot:
+    """
+    Immutable, process-local view of the CareerPath catalog.
+
+    Holds every career's scalar fields, its required skill ids, the names and
+    categories of those skills and a lazily built scoring engine, so
+    recommendation code paths never have to touch the database for catalog data.
+    ``fingerprint`` is a content hash that stays stable across processes and
+    restarts; ``version`` is the local counter the snapshot was built at.
+    """
+
+    def __init__(self, version: int, careers: Dict[int, Dict[str, Any]],
+                 required_skills: Dict[int, List[int]], skills: Dict[int, Dict[str, str]]):
+        self.version = version
+        self.careers = careers
+        self.required_skills = required_skills
+        self.skills = skills
+        self.fingerprint = self._compute_fingerprint()
+        self._engine: Optional[CareerScoringEngine] = None
+        self._engine_lock = threading.Lock()
+
+    ENGINE_ARTIFACT = 'scoring_engine'
+
+    @property
+    def engine(self) -> CareerScoringEngine:
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    self._engine = self._load_engine()
+        return self._engine
+
+    def _load_engine(self) -> CareerScoringEngine:
+        # Prefer the memory-mapped matrices shared by every worker (written by build_ml_artifacts)
+        artifacts_dir = getattr(settings, 'ML_ARTIFACTS_DIR', None)
+        bundle = open_bundle(artifacts_dir, self.ENGINE_ARTIFACT, self.fingerprint)
+        if bundle is not None:
+            return CareerScoringEngine.from_bundle(bundle)
+
+        engine = CareerScoringEngine(self.required_skills)
+        if getattr(settings, 'ML_ARTIFACTS_WRITE_ON_DEMAND', False):
+            self.save_engine_artifacts(artifacts_dir, engine)
+        return engine
+
+    def save_engine_artifacts(self, artifacts_dir: Optional[str],
+                              engine: Optional[CareerScoringEngine] = None) -> Optional[str]:
+        """Persist the scoring engine's matrices so other processes can memory-map them"""
+        if not artifacts_dir:
+            return None
+        engine = engine or self.engine
+        try:
+            return write_bundle(artifacts_dir, self.ENGINE_ARTIFACT, self.fingerprint, **engine.artifacts(),
+                                meta={'careers': engine.n_careers})
+        except OSError:
+            logger.exception("Error saving scoring engine artifacts")
+            return None
+
+    def __len__(self):
+        return len(self.careers)
+
+    def __contains__(self, career_id):
+        return career_id in self.careers
+
+    def _compute_fingerprint(self) -> str:
+        digest = hashlib.sha1()
+        for career_id, info in self.careers.items():
+            digest.update(repr(tuple(info[f] for f in CAREER_FIELDS)).encode())
+            digest.update(repr(self.required_skills[career_id]).encode())
+        return digest.hexdigest()
+
+
+_lock = threading.Lock()
+_version = 0
+_snapshot: Optional[CatalogSnapshot] = None
+
+
+def catalog_version() -> int:
+    """Current local catalog version; bumped whenever the catalog is invalidated."""
+    return _version
+
+
+def invalidate_catalog():
+    """Mark the cached snapshot stale; the next get_catalog() call rebuilds it."""
+    global _version
+    with _lock:
+        _version += 1
+
+
+def invalidate_catalog_on_commit():
+    """Invalidate now and again once the surrounding transaction commits."""
+    invalidate_catalog()
+    transaction.on_commit(invalidate_catalog)
+
+
+def get_catalog() -> CatalogSnapshot:
+    """Return the current catalog snapshot, rebuilding it if it has been invalidated."""
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == _version:
+        return snapshot
+    return _rebuild()
+
+
+def _rebuild() -> CatalogSnapshot:
+    global _snapshot
+    with _lock:
+        if _snapshot is not None and _snapshot.version == _version:
+            return _snapshot
+        # Capture the version before reading so a concurrent invalidation
+        # forces another rebuild instead of being lost.
+        version = _version
+
+    careers = {row['id']: row for row in CareerPath.objects.order_by('id').values(*CAREER_FIELDS)}
+    required_skills: Dict[int, List[int]] = {career_id: [] for career_id in careers}
+    skills: Dict[int, Dict[str, str]] = {}
+    through = CareerPath.required_skills.through.objects.order_by('careerpath_id', 'skill_id')
+    for career_id, skill_id, name, category in through.values_list(
+        'careerpath_id', 'skill_id', 'skill__name', 'skill__category'
+    ):
+        if career_id in required_skills:
+            required_skills[career_id].append(skill_id)
+            skills[skill_id] = {'name': name, 'category': category}
+
+    snapshot = CatalogSnapshot(version, careers, required_skills, skills)
+    with _lock:
+        if _snapshot is None or _snapshot.version <= version:
+            _snapshot = snapshot
+    return snapshot
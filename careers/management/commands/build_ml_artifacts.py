@@ -0,0 +1,36 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ml.artifacts import bundle_path
+from ml.career_model import CareerRecommendationModel
+from careers.catalog import CatalogSnapshot, get_catalog
+
+
+class Command(BaseCommand):
+    help = 'Write the memory-mapped ML artifacts for the current catalog so workers start without refitting'
+
+    def handle(self, *args, **options):
+        artifacts_dir = getattr(settings, 'ML_ARTIFACTS_DIR', None)
+        if not artifacts_dir:
+            raise CommandError('ML_ARTIFACTS_DIR is not configured')
+
+        started = time.perf_counter()
+        catalog = get_catalog()
+        catalog.save_engine_artifacts(str(artifacts_dir))
+        # Loads an existing bundle, or fits the model and writes one
+        model = CareerRecommendationModel.from_catalog(catalog, artifacts_dir, write_artifacts=True)
+
+        for name, fingerprint in ((CatalogSnapshot.ENGINE_ARTIFACT, catalog.fingerprint),
+                                  (model.ARTIFACT_NAME, model.fingerprint)):
+            path = bundle_path(str(artifacts_dir), name, fingerprint)
+            if not os.path.isdir(path):
+                raise CommandError(f'Could not write {name} artifacts to {path}')
+            size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+            self.stdout.write(f'{name}: {path} ({size / 1024:.1f} KB)')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Built artifacts for {len(catalog)} careers in {time.perf_counter() - started:.2f}s'
+        ))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from ml.batch import precompute_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Precompute career recommendations for every user with skills'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Users scored per matrix product')
+        parser.add_argument('--workers', type=int, default=1, help='Scoring processes (1 = in-process)')
+        parser.add_argument('--quiet', action='store_true', help='Only print the final summary')
+
+    def handle(self, *args, **options):
+        def progress(stats):
+            self.stdout.write(f"  {stats['users']} users, {stats['users_per_second']} users/sec")
+
+        stats = precompute_recommendations(
+            chunk_size=options['chunk_size'],
+            workers=options['workers'],
+            progress=None if options['quiet'] else progress,
+        )
+
+        peak = stats['peak_memory_mb']
+        self.stdout.write(self.style.SUCCESS(
+            f"Scored {stats['users']} users in {stats['elapsed_seconds']}s "
+            f"({stats['users_per_second']} users/sec); "
+            f"{stats['created']} created, {stats['updated']} updated, {stats['deleted']} deleted; "
+            f"peak memory {peak if peak is not None else 'n/a'} MB"
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from ml.collaborative import refresh_neighbor_table
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the nearest-neighbour user table used for "users like you" career suggestions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--k', type=int, default=20, help='Neighbours kept per user')
+        parser.add_argument('--block-size', type=int, default=256, help='Users per similarity block')
+        parser.add_argument('--min-similarity', type=float, default=0.05)
+
+    def handle(self, *args, **options):
+        stats = refresh_neighbor_table(
+            k=options['k'],
+            block_size=options['block_size'],
+            min_similarity=options['min_similarity'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {stats['neighbors']} neighbours for {stats['users']} users in {stats['elapsed_seconds']}s"
+        ))
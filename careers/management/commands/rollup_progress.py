@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from careers.progress import rollup_progress
+
+
+class Command(BaseCommand):
+    help = 'Compact old roadmap progress points into daily and weekly buckets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--raw-days', type=int, default=7, help='Keep raw points for this many days')
+        parser.add_argument('--daily-days', type=int, default=90, help='Keep daily points for this many days')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        stats = rollup_progress(
+            raw_retention_days=options['raw_days'],
+            daily_retention_days=options['daily_days'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Compacted {stats['raw_compacted']} raw points into {stats['day_written']} daily points and "
+            f"{stats['day_compacted']} daily points into {stats['week_written']} weekly points"
+        ))
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def drop_duplicate_recommendations(apps, schema_editor):
+    # Rows were rebuilt by delete-then-insert without a unique constraint, so
+    # concurrent rebuilds could leave several rows per (user, career_path); keep the newest.
+    CareerRecommendation = apps.get_model('careers', 'CareerRecommendation')
+    duplicates = (
+        CareerRecommendation.objects.values('user_id', 'career_path_id')
+        .annotate(rows=Count('id')).filter(rows__gt=1)
+    )
+    for pair in duplicates:
+        rows = CareerRecommendation.objects.filter(user_id=pair['user_id'], career_path_id=pair['career_path_id'])
+        newest = rows.order_by('-created_at', '-id').values_list('id', flat=True).first()
+        rows.exclude(id=newest).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0002_careerpath_demand_level_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skills_version', models.PositiveIntegerField(default=0, help_text="Bumped whenever the user's skills change")),
+                ('synced_skills_version', models.PositiveIntegerField(blank=True, null=True)),
+                ('catalog_fingerprint', models.CharField(blank=True, max_length=40)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(drop_duplicate_recommendations, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='careerrecommendation',
+            unique_together={('user', 'career_path')},
+        ),
+        migrations.AddIndex(
+            model_name='careerrecommendation',
+            index=models.Index(fields=['user', '-score'], name='careers_rec_user_score_idx'),
+        ),
+        migrations.AddField(
+            model_name='recommendationstate',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='recommendation_state', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:17
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+STATUS_FIELDS = {
+    'pending': 'milestones_pending',
+    'in_progress': 'milestones_in_progress',
+    'completed': 'milestones_completed',
+    'skipped': 'milestones_skipped',
+}
+COUNTER_FIELDS = ['milestones_total', 'estimated_hours_total', 'completed_hours', *STATUS_FIELDS.values()]
+
+
+def backfill_counters(apps, schema_editor):
+    PersonalizedRoadmap = apps.get_model('careers', 'PersonalizedRoadmap')
+    aggregates = {
+        'n_total': Count('milestones'),
+        'n_hours': Sum('milestones__estimated_hours'),
+        'n_completed_hours': Sum('milestones__estimated_hours', filter=Q(milestones__status='completed')),
+    }
+    for value in STATUS_FIELDS:
+        aggregates[f'n_{value}'] = Count('milestones', filter=Q(milestones__status=value))
+
+    batch = []
+    for roadmap in PersonalizedRoadmap.objects.annotate(**aggregates).iterator(chunk_size=500):
+        roadmap.milestones_total = roadmap.n_total
+        roadmap.estimated_hours_total = roadmap.n_hours or 0
+        roadmap.completed_hours = roadmap.n_completed_hours or 0
+        for value, field in STATUS_FIELDS.items():
+            setattr(roadmap, field, getattr(roadmap, f'n_{value}'))
+        batch.append(roadmap)
+        if len(batch) >= 500:
+            PersonalizedRoadmap.objects.bulk_update(batch, COUNTER_FIELDS)
+            batch = []
+    if batch:
+        PersonalizedRoadmap.objects.bulk_update(batch, COUNTER_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0004_userneighbor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personalizedroadmap',
+            name='completed_hours',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='personalizedroadmap',
+            name='estimated_hours_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='personalizedroadmap',
+            name='milestones_completed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='personalizedroadmap',
+            name='milestones_in_progress',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='personalizedroadmap',
+            name='milestones_pending',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='personalizedroadmap',
+            name='milestones_skipped',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='personalizedroadmap',
+            name='milestones_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
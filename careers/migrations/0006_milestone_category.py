@@ -0,0 +1,39 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:19
+
+from django.db import migrations, models
+
+
+# Title keywords used to classify milestones before the category field existed, in priority order
+TITLE_CATEGORIES = [
+    ('project', 'project'),
+    ('certification', 'certification'),
+    ('interview', 'interview'),
+    ('network', 'networking'),
+]
+
+
+def backfill_categories(apps, schema_editor):
+    RoadmapMilestone = apps.get_model('careers', 'RoadmapMilestone')
+    for keyword, category in TITLE_CATEGORIES:
+        RoadmapMilestone.objects.filter(category='skill', title__icontains=keyword).update(category=category)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0005_roadmap_milestone_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personalizedroadmap',
+            name='milestones_version',
+            field=models.PositiveIntegerField(default=0, help_text='Bumped whenever milestones change'),
+        ),
+        migrations.AddField(
+            model_name='roadmapmilestone',
+            name='category',
+            field=models.CharField(choices=[('skill', 'Skill'), ('project', 'Project'), ('certification', 'Certification'), ('interview', 'Interview Preparation'), ('networking', 'Networking')], default='skill', max_length=20),
+        ),
+        migrations.RunPython(backfill_categories, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_snapshots(apps, schema_editor):
+    CareerProgressTracker = apps.get_model('careers', 'CareerProgressTracker')
+    ProgressPoint = apps.get_model('careers', 'ProgressPoint')
+    batch = []
+    for snapshot in CareerProgressTracker.objects.order_by('id').iterator(chunk_size=2000):
+        batch.append(ProgressPoint(
+            roadmap_id=snapshot.roadmap_id,
+            resolution='raw',
+            bucket_start=snapshot.created_at,
+            progress_percentage=snapshot.progress_percentage,
+            job_readiness_score=max(snapshot.job_readiness_score, 0),
+            completed_milestones=max(snapshot.completed_milestones, 0),
+            total_milestones=max(snapshot.total_milestones, 0),
+        ))
+        if len(batch) >= 2000:
+            ProgressPoint.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        ProgressPoint.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0006_milestone_category'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressPoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('raw', 'Raw'), ('day', 'Daily'), ('week', 'Weekly')], default='raw', max_length=4)),
+                ('bucket_start', models.DateTimeField()),
+                ('progress_percentage', models.FloatField(default=0.0)),
+                ('job_readiness_score', models.PositiveSmallIntegerField(default=0)),
+                ('completed_milestones', models.PositiveSmallIntegerField(default=0)),
+                ('total_milestones', models.PositiveSmallIntegerField(default=0)),
+                ('samples', models.PositiveIntegerField(default=1)),
+                ('roadmap', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_points', to='careers.personalizedroadmap')),
+            ],
+            options={
+                'ordering': ['roadmap', 'bucket_start'],
+                'indexes': [models.Index(fields=['roadmap', 'bucket_start'], name='careers_progress_range_idx')],
+                'unique_together': {('roadmap', 'resolution', 'bucket_start')},
+            },
+        ),
+        migrations.RunPython(copy_snapshots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0007_progress_points'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personalizedroadmap',
+            name='schedule',
+            field=models.JSONField(blank=True, help_text='Cached prerequisite schedule (careers.scheduler)', null=True),
+        ),
+    ]
@@ -43,10 +43,28 @@ class PersonalizedRoadmap(models.Model):
     current_phase = models.CharField(max_length=100, default='Foundation')
     overall_progress_percentage = models.FloatField(default=0.0)
     job_readiness_score = models.IntegerField(default=0, help_text="Score 0-100 for job readiness")
+    # Denormalised milestone counters, maintained by careers.services.update_milestone_status
+    milestones_total = models.PositiveIntegerField(default=0)
+    milestones_pending = models.PositiveIntegerField(default=0)
+    milestones_in_progress = models.PositiveIntegerField(default=0)
+    milestones_completed = models.PositiveIntegerField(default=0)
+    milestones_skipped = models.PositiveIntegerField(default=0)
+    estimated_hours_total = models.PositiveIntegerField(default=0)
+    completed_hours = models.PositiveIntegerField(default=0)
+    milestones_version = models.PositiveIntegerField(default=0, help_text="Bumped whenever milestones change")
+    schedule = models.JSONField(null=True, blank=True, help_text="Cached prerequisite schedule (careers.scheduler)")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    STATUS_COUNTER_FIELDS = {
+        'pending': 'milestones_pending',
+        'in_progress': 'milestones_in_progress',
+        'completed': 'milestones_completed',
+        'skipped': 'milestones_skipped',
+    }
+    COUNTER_FIELDS = ('milestones_total', *STATUS_COUNTER_FIELDS.values(), 'estimated_hours_total', 'completed_hours')
+
     class Meta:
         ordering = ['-created_at']
         unique_together = ['user', 'target_career']
@@ -54,18 +72,37 @@ class PersonalizedRoadmap(models.Model):
     def __str__(self):
         return f"{self.user.username} -> {self.target_career.title}"
 
-    def update_progress(self):
-        """Calculate and update overall progress"""
-        milestones = self.milestones.all()
-        if milestones.exists():
-            completed = milestones.filter(status='completed').count()
-            self.overall_progress_percentage = (completed / milestones.count()) * 100
+    def update_progress(self, save=True):
+        """Calculate and update overall progress from the milestone counters"""
+        if self.milestones_total:
+            self.overall_progress_percentage = (self.milestones_completed / self.milestones_total) * 100
         else:
             self.overall_progress_percentage = 0
-        
-        # Update job readiness score based on completed milestones
-        self.job_readiness_score = min(int(self.overall_progress_percentage * 0.9), 100)
-        self.save()
+        # job_readiness_score is stored by careers.services.update_milestone_status from the readiness breakdown
+        if save:
+            self.save(update_fields=['overall_progress_percentage', 'updated_at'])
+
+    def recount_milestones(self, save=True):
+        """Rebuild the counters from the milestone rows with one aggregate query"""
+        counts = self.milestones.aggregate(**milestone_counter_aggregates())
+        for field in self.COUNTER_FIELDS:
+            setattr(self, field, counts[field] or 0)
+        if save:
+            self.save(update_fields=[*self.COUNTER_FIELDS, 'updated_at'])
+
+
+def milestone_counter_aggregates(prefix=''):
+    """Aggregate expressions producing every PersonalizedRoadmap counter field"""
+    status = f'{prefix}status'
+    hours = f'{prefix}estimated_hours'
+    aggregates = {
+        'milestones_total': models.Count(f'{prefix}id'),
+        'estimated_hours_total': models.Sum(hours),
+        'completed_hours': models.Sum(hours, filter=models.Q(**{status: 'completed'})),
+    }
+    for value, field in PersonalizedRoadmap.STATUS_COUNTER_FIELDS.items():
+        aggregates[field] = models.Count(f'{prefix}id', filter=models.Q(**{status: value}))
+    return aggregates
 
 
 class RoadmapMilestone(models.Model):
@@ -80,6 +117,13 @@ class RoadmapMilestone(models.Model):
         ('Specialization', 'Specialization (12+ months)')
     ])
     order_in_phase = models.IntegerField(default=0)
+    category = models.CharField(max_length=20, choices=[
+        ('skill', 'Skill'),
+        ('project', 'Project'),
+        ('certification', 'Certification'),
+        ('interview', 'Interview Preparation'),
+        ('networking', 'Networking')
+    ], default='skill')
     estimated_hours = models.IntegerField(default=10)
     estimated_weeks = models.IntegerField(default=2)
     prerequisites = models.ManyToManyField('self', blank=True, symmetrical=False)
@@ -161,7 +205,7 @@ class SkillGapAnalysis(models.Model):
 
 
 class CareerProgressTracker(models.Model):
-    """Track user's progress over time"""
+    """Track user's progress over time (legacy per-change snapshots; new points go to ProgressPoint)"""
     roadmap = models.ForeignKey(PersonalizedRoadmap, on_delete=models.CASCADE, related_name='progress_snapshots')
     completed_milestones = models.IntegerField(default=0)
     total_milestones = models.IntegerField(default=0)
@@ -178,6 +222,38 @@ class CareerProgressTracker(models.Model):
         return f"{self.roadmap.title} Progress - {self.progress_percentage}%"
 
 
+class ProgressPoint(models.Model):
+    """
+    Compact progress time series for a roadmap.
+
+    Every milestone status change appends a ``raw`` point; the rollup_progress job
+    later folds old raw points into one ``day`` point and old day points into one
+    ``week`` point, keeping the last value of each bucket and how many samples it covers.
+    """
+    RESOLUTIONS = ('raw', 'day', 'week')
+
+    roadmap = models.ForeignKey(PersonalizedRoadmap, on_delete=models.CASCADE, related_name='progress_points')
+    resolution = models.CharField(max_length=4, choices=[
+        ('raw', 'Raw'),
+        ('day', 'Daily'),
+        ('week', 'Weekly')
+    ], default='raw')
+    bucket_start = models.DateTimeField()
+    progress_percentage = models.FloatField(default=0.0)
+    job_readiness_score = models.PositiveSmallIntegerField(default=0)
+    completed_milestones = models.PositiveSmallIntegerField(default=0)
+    total_milestones = models.PositiveSmallIntegerField(default=0)
+    samples = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        ordering = ['roadmap', 'bucket_start']
+        unique_together = ['roadmap', 'resolution', 'bucket_start']
+        indexes = [models.Index(fields=['roadmap', 'bucket_start'], name='careers_progress_range_idx')]
+
+    def __str__(self):
+        return f"{self.roadmap_id} {self.resolution} {self.bucket_start:%Y-%m-%d %H:%M} - {self.progress_percentage}%"
+
+
 class CareerRecommendation(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='career_recommendations')
     career_path = models.ForeignKey(CareerPath, on_delete=models.CASCADE, related_name='recommendations')
@@ -186,11 +262,44 @@ class CareerRecommendation(models.Model):
 
     class Meta:
         ordering = ['-score', '-created_at']
+        unique_together = ['user', 'career_path']
+        indexes = [models.Index(fields=['user', '-score'], name='careers_rec_user_score_idx')]
 
     def __str__(self):
         return f"{self.user.username} -> {self.career_path.title} ({self.score:.2f})"
 
 
+class RecommendationState(models.Model):
+    """Tracks whether a user's stored CareerRecommendation rows are up to date"""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='recommendation_state')
+    skills_version = models.PositiveIntegerField(default=0, help_text="Bumped whenever the user's skills change")
+    synced_skills_version = models.PositiveIntegerField(null=True, blank=True)
+    catalog_fingerprint = models.CharField(max_length=40, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username} recommendations (skills v{self.skills_version})"
+
+    def is_current(self, catalog_fingerprint):
+        return (self.synced_skills_version == self.skills_version
+                and self.catalog_fingerprint == catalog_fingerprint)
+
+
+class UserNeighbor(models.Model):
+    """Precomputed nearest-neighbour users by skill-profile cosine similarity"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='skill_neighbors')
+    neighbor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    similarity = models.FloatField()
+    rank = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        ordering = ['user', 'rank']
+        unique_together = ['user', 'neighbor']
+
+    def __str__(self):
+        return f"{self.user_id} ~ {self.neighbor_id} ({self.similarity:.2f})"
+
+
 class RoadmapStep(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='roadmap_steps')
     career_path = models.ForeignKey('CareerPath', on_delete=models.CASCADE, related_name='roadmaps')
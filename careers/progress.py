@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.db.models.functions import TruncDay, TruncHour, TruncMonth, TruncWeek, TruncYear
+from django.utils import timezone
+
+from .models import PersonalizedRoadmap, ProgressPoint
+
+
+VALUE_FIELDS = ('progress_percentage', 'job_readiness_score', 'completed_milestones', 'total_milestones')
+# Calendar buckets the database can group by, finest first; month and year widths are nominal
+CALENDAR_BUCKETS = (
+    ('hour', TruncHour, 3600),
+    ('day', TruncDay, 86400),
+    ('week', TruncWeek, 7 * 86400),
+    ('month', TruncMonth, 30 * 86400),
+    ('year', TruncYear, 365 * 86400),
+)
+MAX_POINTS = 1000
+
+
+def record_progress(roadmap: PersonalizedRoadmap) -> ProgressPoint:
+    """Append a raw point with the roadmap's current (counter-backed) progress"""
+    return ProgressPoint.objects.create(
+        roadmap=roadmap,
+        resolution='raw',
+        bucket_start=timezone.now(),
+        progress_percentage=roadmap.overall_progress_percentage,
+        job_readiness_score=max(roadmap.job_readiness_score, 0),
+        completed_milestones=roadmap.milestones_completed,
+        total_milestones=roadmap.milestones_total,
+    )
+
+
+def bucket_floor(moment: datetime, resolution: str) -> datetime:
+    """Start of the day or ISO week (Monday) containing ``moment``, in the current time zone"""
+    local = timezone.localtime(moment) if timezone.is_aware(moment) else moment
+    start = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    if resolution == 'week':
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def rollup_progress(now: Optional[datetime] = None, raw_retention_days: int = 7, daily_retention_days: int = 90,
+                    batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Compact old points: raw points older than ``raw_retention_days`` become one point per
+    day, and daily points older than ``daily_retention_days`` one point per week. Each
+    bucket keeps the last value and the total sample count. Only whole buckets are
+    compacted, so running the job repeatedly is safe.
+    """
+    now = now or timezone.now()
+    stats = {}
+    for source, target, days in (('raw', 'day', raw_retention_days), ('day', 'week', daily_retention_days)):
+        cutoff = bucket_floor(now - timedelta(days=days), target)
+        stats[f'{source}_compacted'], stats[f'{target}_written'] = _compact(source, target, cutoff, batch_size)
+    return stats
+
+
+def _compact(source: str, target: str, cutoff: datetime, batch_size: int) -> Tuple[int, int]:
+    points = ProgressPoint.objects.filter(resolution=source, bucket_start__lt=cutoff).order_by(
+        'roadmap_id', 'bucket_start'
+    ).values_list('id', 'roadmap_id', 'bucket_start', 'samples', *VALUE_FIELDS)
+
+    compacted = written = 0
+    buckets: Dict[Tuple[int, datetime], ProgressPoint] = {}
+    consumed: List[int] = []
+    for point_id, roadmap_id, bucket_start, samples, *values in points.iterator(chunk_size=batch_size):
+        key = (roadmap_id, bucket_floor(bucket_start, target))
+        if key not in buckets and len(consumed) >= batch_size:
+            # Flush only on a bucket boundary so no bucket is split across batches
+            written += _flush(buckets, consumed)
+            compacted += len(consumed)
+            buckets, consumed = {}, []
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = ProgressPoint(
+                roadmap_id=roadmap_id, resolution=target, bucket_start=key[1], samples=0
+            )
+        bucket.samples += samples
+        for field, value in zip(VALUE_FIELDS, values):
+            setattr(bucket, field, value)
+        consumed.append(point_id)
+
+    if consumed:
+        written += _flush(buckets, consumed)
+        compacted += len(consumed)
+    return compacted, written
+
+
+def _flush(buckets: Dict[Any, ProgressPoint], consumed: List[int]) -> int:
+    with transaction.atomic():
+        ProgressPoint.objects.bulk_create(
+            buckets.values(),
+            update_conflicts=True,
+            unique_fields=['roadmap', 'resolution', 'bucket_start'],
+            update_fields=['samples', *VALUE_FIELDS],
+        )
+        ProgressPoint.objects.filter(id__in=consumed).delete()
+    return len(buckets)
+
+
+def progress_series(roadmap: PersonalizedRoadmap, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                    resolution: str = 'auto', max_points: int = 200) -> Dict[str, Any]:
+    """
+    Progress between ``start`` and ``end`` as at most ``max_points`` points, oldest first.
+
+    One aggregate over the range index picks the bucket size up front: stored points
+    are returned as-is when they already fit (``'auto'`` only), otherwise the finest
+    calendar bucket, no finer than ``resolution``, that fits ``max_points``. The
+    database then returns only the last point of each bucket, so the rows read are
+    bounded by the bucket count rather than by how many points are stored.
+    """
+    max_points = min(max(max_points, 1), MAX_POINTS)
+    queryset = ProgressPoint.objects.filter(roadmap=roadmap)
+    if start:
+        queryset = queryset.filter(bucket_start__gte=start)
+    if end:
+        queryset = queryset.filter(bucket_start__lt=end)
+    stats = queryset.aggregate(count=Count('id'), first=Min('bucket_start'), last=Max('bucket_start'))
+
+    bucket_seconds = None
+    if not stats['count']:
+        rows = []
+    elif resolution == 'auto' and stats['count'] <= max_points:
+        rows = list(queryset.order_by('bucket_start').values_list('bucket_start', *VALUE_FIELDS)[:max_points])
+    else:
+        span = (stats['last'] - stats['first']).total_seconds()
+        names = [name for name, _, _ in CALENDAR_BUCKETS]
+        buckets = CALENDAR_BUCKETS[names.index(resolution) if resolution in names else 0:]
+        # Calendar alignment can add one bucket at each end of the span
+        _, trunc, bucket_seconds = next(
+            (bucket for bucket in buckets if span // bucket[2] + 2 <= max_points), buckets[-1]
+        )
+        rows = _last_per_calendar_bucket(queryset, trunc)
+
+    if len(rows) > max_points:
+        # Only reachable with yearly buckets; the rows are already one per bucket
+        first, last = rows[0][0], rows[-1][0]
+        width = (last - first) / max_points + timedelta(microseconds=1)
+        rows = _last_per_bucket(rows, lambda moment: first + ((moment - first) // width) * width)
+        bucket_seconds = max(bucket_seconds or 0, int(width.total_seconds()))
+
+    return {
+        'resolution': resolution,
+        'bucket_seconds': bucket_seconds,
+        'points': [dict(zip(('timestamp', *VALUE_FIELDS), row)) for row in rows],
+    }
+
+
+def _last_per_calendar_bucket(queryset, trunc) -> List[tuple]:
+    """Last stored point of each calendar bucket, stamped with the bucket start, in one query"""
+    last_moments = queryset.order_by().annotate(bucket=trunc('bucket_start')).values('bucket').annotate(
+        last=Max('bucket_start')
+    ).values('last')
+    rows = queryset.filter(bucket_start__in=last_moments).annotate(bucket=trunc('bucket_start')).order_by(
+        'bucket_start'
+    ).values_list('bucket', *VALUE_FIELDS)
+    # A rolled-up and a raw point can share a timestamp; keep one per bucket
+    return _last_per_bucket(rows, lambda moment: moment)
+
+
+def _last_per_bucket(rows: Iterable[tuple], floor) -> List[tuple]:
+    """Keep the last row of each bucket, stamped with the bucket start (rows must be sorted by time)"""
+    buckets: Dict[datetime, tuple] = {}
+    for row in rows:
+        start = floor(row[0])
+        buckets[start] = (start, *row[1:])
+    return list(buckets.values())
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+def cache_key(*parts: Any) -> str:
+    """Stable hash of JSON-serialisable parts (dict keys sorted)"""
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Bounded, process-local LRU of computed response payloads with stale-while-revalidate.
+
+    An entry is fresh for ``ttl`` seconds and served as is. For the following
+    ``stale_ttl`` seconds it is still served, but a single background thread per key
+    recomputes it; after that it counts as a miss and is rebuilt synchronously.
+    ``get`` returns the payload and how it was served: 'HIT', 'STALE' or 'MISS'.
+    Payloads rejected by ``cacheable`` (e.g. error bodies) are returned but never stored.
+    """
+
+    def __init__(self, name: str, ttl: float = 300, stale_ttl: float = 3600, maxsize: int = 4096,
+                 cleanup: Optional[Callable[[], None]] = None, clock: Callable[[], float] = time.monotonic,
+                 cacheable: Callable[[Any], bool] = lambda value: True):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self._cleanup = cleanup
+        self._clock = clock
+        self._cacheable = cacheable
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refresh_errors': 0}
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Tuple[Any, str]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry[0]
+                if age <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    return entry[1], 'HIT'
+                if age <= self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self._counters['stale_hits'] += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(
+                            target=self._refresh_in_background, args=(key, compute),
+                            name=f'{self.name}-refresh', daemon=True,
+                        ).start()
+                    return entry[1], 'STALE'
+            self._counters['misses'] += 1
+
+        value = compute()
+        if self._cacheable(value):
+            self._store(key, value)
+        return value, 'MISS'
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for counter in self._counters:
+                self._counters[counter] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            served = self._counters['hits'] + self._counters['stale_hits'] + self._counters['misses']
+            return {
+                'name': self.name,
+                'entries': len(self._entries),
+                **self._counters,
+                'hit_rate': round((served - self._counters['misses']) / served, 4) if served else None,
+            }
+
+    def _store(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _refresh_in_background(self, key: Hashable, compute: Callable[[], Any]):
+        try:
+            value = compute()
+            if self._cacheable(value):
+                self._store(key, value)
+            else:
+                # The payload turned into an error; let the next request compute and return it
+                with self._lock:
+                    self._entries.pop(key, None)
+        except Exception:
+            # Keep serving the stale entry until it expires; the next stale hit retries.
+            with self._lock:
+                self._counters['refresh_errors'] += 1
+            logger.exception("Error refreshing %s cache entry", self.name)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+            if self._cleanup:
+                self._cleanup()
@@ -0,0 +1,118 @@
+import heapq
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+def build_schedule(durations: Dict[int, float], edges: Iterable[Tuple[int, int]]) -> Dict[str, Any]:
+    """
+    Earliest start/finish (in hours of remaining work) for every milestone of a
+    prerequisite DAG, plus the critical path, in O(V + E).
+
+    ``durations`` maps milestone id to remaining hours (0 once completed or skipped);
+    ``edges`` are (milestone id, prerequisite id) pairs. Raises ValueError on a cycle.
+    The result is JSON-serialisable and is what ``reschedule`` updates in place.
+    """
+    nodes = {
+        str(mid): {'hours': hours, 'prereqs': [], 'children': [], 'pos': 0, 'es': 0, 'ef': 0}
+        for mid, hours in durations.items()
+    }
+    for mid, prereq in edges:
+        if str(mid) in nodes and str(prereq) in nodes:
+            nodes[str(mid)]['prereqs'].append(str(prereq))
+            nodes[str(prereq)]['children'].append(str(mid))
+
+    # Kahn's algorithm: visit each node once its prerequisites are scheduled
+    indegree = {key: len(node['prereqs']) for key, node in nodes.items()}
+    ready = [key for key, degree in indegree.items() if degree == 0]
+    order = []
+    while ready:
+        key = ready.pop()
+        node = nodes[key]
+        node['pos'] = len(order)
+        order.append(key)
+        node['es'] = max((nodes[p]['ef'] for p in node['prereqs']), default=0)
+        node['ef'] = node['es'] + node['hours']
+        for child in node['children']:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+    if len(order) != len(nodes):
+        raise ValueError('Milestone prerequisites contain a cycle')
+
+    schedule = {'nodes': nodes, 'remaining_hours': sum(node['hours'] for node in nodes.values())}
+    _update_critical_path(schedule)
+    return schedule
+
+
+def reschedule(schedule: Dict[str, Any], milestone_id: int, hours: float) -> int:
+    """
+    Change one milestone's remaining hours and propagate earliest start/finish only
+    through the descendants whose times actually change, in topological order.
+    Returns the number of milestones recomputed.
+    """
+    nodes = schedule['nodes']
+    key = str(milestone_id)
+    if key not in nodes:
+        raise KeyError(milestone_id)
+    schedule['remaining_hours'] += hours - nodes[key]['hours']
+    nodes[key]['hours'] = hours
+
+    queued = {key}
+    heap = [(nodes[key]['pos'], key)]
+    recomputed = 0
+    while heap:
+        _, current = heapq.heappop(heap)
+        node = nodes[current]
+        es = max((nodes[p]['ef'] for p in node['prereqs']), default=0)
+        ef = es + node['hours']
+        recomputed += 1
+        if (es, ef) == (node['es'], node['ef']):
+            continue
+        node['es'], node['ef'] = es, ef
+        for child in node['children']:
+            if child not in queued:
+                queued.add(child)
+                heapq.heappush(heap, (nodes[child]['pos'], child))
+
+    _update_critical_path(schedule)
+    return recomputed
+
+
+def completion_weeks(schedule: Dict[str, Any], hours_per_week: int) -> float:
+    """
+    Weeks to finish all remaining work. A single learner works through milestones one
+    at a time, so this is the remaining hours at ``hours_per_week``; the critical path
+    (always a subset of that work) only gives the lower bound reported alongside it,
+    i.e. the duration if independent milestones could be worked on in parallel.
+    """
+    return schedule['remaining_hours'] / max(hours_per_week, 1)
+
+
+def timeline(schedule: Dict[str, Any], hours_per_week: int) -> List[Dict[str, Any]]:
+    """Per-milestone earliest start and finish in weeks, in topological order"""
+    hours_per_week = max(hours_per_week, 1)
+    critical = {str(mid) for mid in schedule['critical_path']}
+    nodes = sorted(schedule['nodes'].items(), key=lambda item: item[1]['pos'])
+    return [
+        {
+            'milestone_id': int(key),
+            'earliest_start_week': round(node['es'] / hours_per_week, 2),
+            'earliest_finish_week': round(node['ef'] / hours_per_week, 2),
+            'critical': key in critical,
+        }
+        for key, node in nodes
+    ]
+
+
+def _update_critical_path(schedule: Dict[str, Any]):
+    # A linear scan over cached finish times; no start/finish values are recomputed here
+    nodes = schedule['nodes']
+    if not nodes:
+        schedule['critical_path'], schedule['critical_path_hours'] = [], 0
+        return
+    key = min(nodes, key=lambda k: (-nodes[k]['ef'], nodes[k]['pos']))
+    schedule['critical_path_hours'] = nodes[key]['ef']
+    path = [key]
+    while nodes[key]['prereqs']:
+        key = min(nodes[key]['prereqs'], key=lambda k: (-nodes[k]['ef'], nodes[k]['pos']))
+        path.append(key)
+    schedule['critical_path'] = [int(k) for k in reversed(path)]
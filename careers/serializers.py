@@ -1,10 +1,12 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 from .models import (
     CareerPath, CareerRecommendation, RoadmapStep, ProjectRecommendation,
-    PersonalizedRoadmap, RoadmapMilestone, LearningResource, SkillGapAnalysis, CareerProgressTracker
+    PersonalizedRoadmap, RoadmapMilestone, LearningResource, SkillGapAnalysis, CareerProgressTracker, ProgressPoint
 )
 from skills.serializers import SkillSerializer
 from skills.models import Skill
+from .scheduler import completion_weeks, timeline
 
 
 class CareerPathSerializer(serializers.ModelSerializer):
@@ -89,30 +91,127 @@ class CareerProgressTrackerSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'created_at')
 
 
+class ProgressSnapshotSerializer(serializers.ModelSerializer):
+    """
+    A ProgressPoint in the CareerProgressTracker shape that ``progress_snapshots`` has always
+    returned. Snapshots never recorded skills or hours, so those keep the tracker defaults.
+    """
+    skills_acquired = serializers.SerializerMethodField()
+    time_spent_hours = serializers.SerializerMethodField()
+    created_at = serializers.DateTimeField(source='bucket_start', read_only=True)
+
+    class Meta:
+        model = ProgressPoint
+        fields = ('id', 'roadmap', 'completed_milestones', 'total_milestones', 'progress_percentage',
+                  'job_readiness_score', 'skills_acquired', 'time_spent_hours', 'created_at')
+        read_only_fields = fields
+
+    def get_skills_acquired(self, obj):
+        return []
+
+    def get_time_spent_hours(self, obj):
+        return 0
+
+
 class PersonalizedRoadmapSerializer(serializers.ModelSerializer):
+    """
+    Full roadmap tree by default. ``fields`` limits the top-level fields and ``expand``
+    picks which nested relations to include; given either, nested relations not named
+    in ``expand`` (or in ``fields``) are left out. Use ``prefetch`` to load exactly the
+    relations the serializer will read.
+    """
+    NESTED_FIELDS = ('target_career', 'milestones', 'skill_gap_analysis', 'progress_snapshots')
+    # Only the most recent points are inlined; the full series is served by RoadmapProgressView
+    INLINE_PROGRESS_POINTS = 20
+    
     target_career = CareerPathSerializer(read_only=True)
     target_career_id = serializers.PrimaryKeyRelatedField(write_only=True, queryset=CareerPath.objects.all(), source='target_career')
     milestones = RoadmapMilestoneSerializer(many=True, read_only=True)
     skill_gap_analysis = SkillGapAnalysisSerializer(read_only=True)
-    progress_snapshots = CareerProgressTrackerSerializer(many=True, read_only=True)
+    progress_snapshots = serializers.SerializerMethodField()
     milestone_summary = serializers.SerializerMethodField()
+    schedule = serializers.SerializerMethodField()
     
     class Meta:
         model = PersonalizedRoadmap
         fields = '__all__'
-        read_only_fields = ('id', 'created_at', 'updated_at', 'overall_progress_percentage', 'job_readiness_score')
+        read_only_fields = (
+            'id', 'created_at', 'updated_at', 'overall_progress_percentage', 'job_readiness_score',
+            *PersonalizedRoadmap.COUNTER_FIELDS,
+        )
+    
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.selected_fields(self.fields.keys(), fields, expand)
+        if selected is not None:
+            for name in set(self.fields) - selected:
+                self.fields.pop(name)
+    
+    @classmethod
+    def selected_fields(cls, names, fields=None, expand=None):
+        """Names to keep, or None for everything"""
+        if fields is None and expand is None:
+            return None
+        expanded = set(expand or ()) & set(cls.NESTED_FIELDS)
+        if fields is None:
+            return {name for name in names if name not in cls.NESTED_FIELDS} | expanded
+        return set(fields) | expanded
+    
+    @classmethod
+    def prefetch(cls, queryset, fields=None, expand=None):
+        """Attach the select/prefetch plan for the nested relations that will be serialized"""
+        selected = cls.selected_fields(cls.NESTED_FIELDS, fields, expand)
+        nested = set(cls.NESTED_FIELDS) if selected is None else selected & set(cls.NESTED_FIELDS)
+        
+        if 'target_career' in nested:
+            queryset = queryset.select_related('target_career').prefetch_related('target_career__required_skills')
+        if 'skill_gap_analysis' in nested:
+            queryset = queryset.select_related('skill_gap_analysis')
+        if 'milestones' in nested:
+            queryset = queryset.prefetch_related(Prefetch(
+                'milestones',
+                queryset=RoadmapMilestone.objects.order_by('phase', 'order_in_phase').prefetch_related(
+                    'resources',
+                    'related_skills',
+                    Prefetch('prerequisites', queryset=RoadmapMilestone.objects.only('id', 'title', 'status')),
+                ),
+            ))
+        if 'progress_snapshots' in nested:
+            queryset = queryset.prefetch_related(Prefetch(
+                'progress_points',
+                queryset=ProgressPoint.objects.order_by('-bucket_start')[:cls.INLINE_PROGRESS_POINTS],
+                to_attr='recent_progress_points',
+            ))
+        return queryset
+    
+    def get_schedule(self, obj):
+        """Critical path and per-milestone timeline in weeks from the cached schedule"""
+        if obj.schedule is None:
+            return None
+        return {
+            'completion_weeks': round(completion_weeks(obj.schedule, obj.hours_per_week), 2),
+            'critical_path': obj.schedule['critical_path'],
+            'critical_path_weeks': round(obj.schedule['critical_path_hours'] / max(obj.hours_per_week, 1), 2),
+            'milestones': timeline(obj.schedule, obj.hours_per_week),
+        }
+    
+    def get_progress_snapshots(self, obj):
+        points = getattr(obj, 'recent_progress_points', None)
+        if points is None:
+            points = obj.progress_points.order_by('-bucket_start')[:self.INLINE_PROGRESS_POINTS]
+        return ProgressSnapshotSerializer(points, many=True).data
     
     def get_milestone_summary(self, obj):
-        milestones = obj.milestones.all()
-        total = milestones.count()
-        completed = milestones.filter(status='completed').count()
-        in_progress = milestones.filter(status='in_progress').count()
-        pending = milestones.filter(status='pending').count()
+        # Read from the denormalised counters; no per-status COUNT queries
+        total = obj.milestones_total
+        completed = obj.milestones_completed
         
         return {
             'total': total,
             'completed': completed,
-            'in_progress': in_progress,
-            'pending': pending,
-            'completion_rate': round((completed / total * 100) if total > 0 else 0, 1)
+            'in_progress': obj.milestones_in_progress,
+            'pending': obj.milestones_pending,
+            'completion_rate': round((completed / total * 100) if total > 0 else 0, 1),
+            'estimated_hours': obj.estimated_hours_total,
+            'completed_hours': obj.completed_hours,
         }
@@ -0,0 +1,651 @@
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from ml.scoring import UserBaseline, baseline_cache
+from skills.graph import SkillGraph, get_skill_graph
+from skills.models import UserSkill
+from .catalog import CatalogSnapshot, get_catalog
+from .models import (
+    CareerRecommendation, LearningResource, PersonalizedRoadmap, ProjectRecommendation, RecommendationState,
+    RoadmapMilestone, RoadmapStep, SkillGapAnalysis,
+)
+from .scheduler import build_schedule, completion_weeks, reschedule
+
+
+def ensure_user_recommendations(user, catalog: Optional[CatalogSnapshot] = None) -> bool:
+    """
+    Recompute the user's stored recommendations only if their skills or the catalog changed.
+    Returns True when a refresh happened; in steady state this is a single indexed read.
+    """
+    catalog = catalog or get_catalog()
+    state = RecommendationState.objects.filter(user=user).first()
+    if state is not None and state.is_current(catalog.fingerprint):
+        return False
+    refresh_user_recommendations(user, catalog, skills_version=state.skills_version if state else 0)
+    return True
+
+
+def refresh_user_recommendations(user, catalog: Optional[CatalogSnapshot] = None, skills_version: int = 0):
+    """Rescore one user against the catalog and upsert only the scores that changed"""
+    catalog = catalog or get_catalog()
+    user_skill_levels = dict(UserSkill.objects.filter(user=user).values_list('skill_id', 'level'))
+    # Only positive scores are stored, so careers sharing no skill with the user are skipped
+    scored = catalog.engine.score_candidates(user_skill_levels)
+    sync_recommendations({user.id: scored}, catalog.fingerprint, {user.id: skills_version})
+
+
+def sync_recommendations(scores_by_user: Dict[int, List[Tuple[int, float]]], catalog_fingerprint: str,
+                         skills_versions: Dict[int, int]) -> Dict[str, int]:
+    """
+    Bring CareerRecommendation rows for the given users in line with freshly computed scores.
+
+    Only positive scores are stored. Rows whose score is unchanged are left untouched,
+    changed scores are bulk-updated, new careers bulk-inserted and careers that dropped
+    to zero deleted. Each user's RecommendationState is marked as synced at the skills
+    version that was read before scoring, so a concurrent skill edit keeps it stale.
+    """
+    desired = {
+        user_id: {cid: score for cid, score in scored if score > 0}
+        for user_id, scored in scores_by_user.items()
+    }
+    existing = CareerRecommendation.objects.filter(user_id__in=desired.keys()).values_list(
+        'id', 'user_id', 'career_path_id', 'score'
+    )
+
+    to_update = []
+    to_delete = []
+    seen = set()
+    for rec_id, user_id, career_id, score in existing:
+        wanted = desired[user_id].get(career_id)
+        seen.add((user_id, career_id))
+        if wanted is None:
+            to_delete.append(rec_id)
+        elif wanted != score:
+            to_update.append(CareerRecommendation(id=rec_id, score=wanted))
+
+    to_create = [
+        CareerRecommendation(user_id=user_id, career_path_id=cid, score=score)
+        for user_id, scores in desired.items()
+        for cid, score in scores.items()
+        if (user_id, cid) not in seen
+    ]
+    states = [
+        RecommendationState(
+            user_id=user_id,
+            skills_version=skills_versions.get(user_id, 0),
+            synced_skills_version=skills_versions.get(user_id, 0),
+            catalog_fingerprint=catalog_fingerprint,
+        )
+        for user_id in desired
+    ]
+
+    with transaction.atomic():
+        if to_delete:
+            CareerRecommendation.objects.filter(id__in=to_delete).delete()
+        if to_update:
+            CareerRecommendation.objects.bulk_update(to_update, ['score'])
+        if to_create:
+            # A concurrent refresh for the same user may have inserted the row since it was read
+            CareerRecommendation.objects.bulk_create(
+                to_create,
+                update_conflicts=True,
+                unique_fields=['user', 'career_path'],
+                update_fields=['score'],
+            )
+        RecommendationState.objects.bulk_create(
+            states,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['synced_skills_version', 'catalog_fingerprint', 'updated_at'],
+        )
+
+    return {'created': len(to_create), 'updated': len(to_update), 'deleted': len(to_delete)}
+
+
+def get_user_baseline(user, catalog: Optional[CatalogSnapshot] = None) -> UserBaseline:
+    """
+    Cached baseline scores for the user's stored skill levels.
+    Keyed on the persisted skills version, so a skill change made in any process is picked up.
+    """
+    catalog = catalog or get_catalog()
+    version = RecommendationState.objects.filter(user=user).values_list('skills_version', flat=True).first() or 0
+    return baseline_cache.get(
+        user.id, catalog.engine, version,
+        lambda: dict(UserSkill.objects.filter(user=user).values_list('skill_id', 'level')),
+    )
+
+
+def mark_recommendations_stale(user_id, create: bool = True):
+    """
+    Bump the user's skills version so the next read recomputes their recommendations.
+    Pass create=False from delete paths: the user may be going away with the cascade.
+    """
+    updated = RecommendationState.objects.filter(user_id=user_id).update(skills_version=F('skills_version') + 1)
+    if not updated and create:
+        RecommendationState.objects.get_or_create(user_id=user_id, defaults={'skills_version': 1})
+    baseline_cache.invalidate(user_id)
+
+
+# Level treated as proficient for every required skill of the target career
+PROFICIENT_LEVEL = 80
+
+# 'requires' names the advanced milestones that must come first; 'skills' means every skill milestone
+ADVANCED_MILESTONES = [
+    {
+        'title': 'Build Portfolio Project #1',
+        'requires': ['skills'],
+        'category': 'project',
+        'description': 'Create a comprehensive project showcasing your newly acquired skills.',
+        'hours': 25,
+        'weeks': 4
+    },
+    {
+        'title': 'Gain Industry Certification',
+        'requires': ['Build Portfolio Project #1'],
+        'category': 'certification',
+        'description': 'Obtain a relevant certification to validate your skills.',
+        'hours': 30,
+        'weeks': 6
+    },
+    {
+        'title': 'Build Portfolio Project #2',
+        'requires': ['Build Portfolio Project #1'],
+        'category': 'project',
+        'description': 'Create an advanced project demonstrating mastery of the tech stack.',
+        'hours': 35,
+        'weeks': 5
+    },
+    {
+        'title': 'Practice Technical Interviews',
+        'requires': ['Build Portfolio Project #2', 'Gain Industry Certification'],
+        'category': 'interview',
+        'description': 'Prepare for job interviews with coding challenges and system design.',
+        'hours': 20,
+        'weeks': 4
+    },
+    {
+        'title': 'Network and Apply for Jobs',
+        'requires': ['Practice Technical Interviews'],
+        'category': 'networking',
+        'description': 'Build professional network and start applying for positions.',
+        'hours': 15,
+        'weeks': 8
+    }
+]
+
+# Resource templates based on learning style; unknown styles use self_paced
+RESOURCE_TEMPLATES = {
+    'self_paced': [
+        {'title': 'Coursera Course', 'type': 'course', 'provider': 'Coursera', 'cost': 'paid'},
+        {'title': 'Free Tutorial Series', 'type': 'tutorial', 'provider': 'YouTube', 'cost': 'free'},
+        {'title': 'Documentation', 'type': 'documentation', 'provider': 'Official Docs', 'cost': 'free'}
+    ],
+    'bootcamp': [
+        {'title': 'Bootcamp Program', 'type': 'bootcamp', 'provider': 'Various', 'cost': 'paid'},
+        {'title': 'Intensive Workshop', 'type': 'course', 'provider': 'Udemy', 'cost': 'paid'}
+    ],
+    'certification': [
+        {'title': 'Official Certification', 'type': 'certification', 'provider': 'Industry Standard', 'cost': 'paid'},
+        {'title': 'Practice Tests', 'type': 'practice', 'provider': 'Practice Platform', 'cost': 'freemium'}
+    ]
+}
+
+
+def analyze_skill_gap(required_skills: Dict[str, int], current_skills: Dict[str, int]) -> Dict[str, Any]:
+    """Split the target career's skills into missing, weak and strong for the given current levels"""
+    missing_skills = []
+    weak_skills = []
+    strong_skills = []
+
+    for skill_name, required_level in required_skills.items():
+        current_level = current_skills.get(skill_name, 0)
+
+        if current_level == 0:
+            missing_skills.append(skill_name)
+        elif current_level < required_level:
+            weak_skills.append({
+                'skill': skill_name,
+                'current_level': current_level,
+                'required_level': required_level,
+                'gap': required_level - current_level
+            })
+        else:
+            strong_skills.append({
+                'skill': skill_name,
+                'current_level': current_level,
+                'required_level': required_level
+            })
+
+    total_skills = len(required_skills)
+    matched_skills = len(strong_skills) + len([s for s in weak_skills if s['current_level'] >= s['required_level'] * 0.7])
+    return {
+        'current_skills': current_skills,
+        'required_skills': required_skills,
+        'missing_skills': missing_skills,
+        'weak_skills': weak_skills,
+        'strong_skills': strong_skills,
+        'skill_match_percentage': (matched_skills / total_skills * 100) if total_skills > 0 else 0,
+    }
+
+
+class ResourceSpec(NamedTuple):
+    title: str
+    resource_type: str
+    provider: str
+    cost_type: str
+    difficulty_level: str
+
+
+class MilestoneSpec(NamedTuple):
+    title: str
+    description: str
+    phase: str
+    order_in_phase: int
+    estimated_hours: int
+    estimated_weeks: int
+    priority: str
+    category: str
+    resources: Tuple[ResourceSpec, ...]
+    prerequisites: Tuple[int, ...] = ()
+
+
+class RoadmapPlan(NamedTuple):
+    """Immutable milestone and resource layout shared by every roadmap with the same gap and style"""
+    milestones: Tuple[MilestoneSpec, ...]
+    total_hours: int
+
+    def build_milestones(self, roadmap: PersonalizedRoadmap) -> List[RoadmapMilestone]:
+        return [
+            RoadmapMilestone(
+                roadmap=roadmap, title=spec.title, description=spec.description, phase=spec.phase,
+                order_in_phase=spec.order_in_phase, estimated_hours=spec.estimated_hours,
+                estimated_weeks=spec.estimated_weeks, priority=spec.priority, category=spec.category,
+            )
+            for spec in self.milestones
+        ]
+
+    def build_resources(self, milestones: List[RoadmapMilestone]) -> List[LearningResource]:
+        """Resources for the saved milestones returned by build_milestones, in the same order"""
+        return [
+            LearningResource(
+                milestone=milestone, title=resource.title, resource_type=resource.resource_type,
+                provider=resource.provider, cost_type=resource.cost_type,
+                difficulty_level=resource.difficulty_level, is_recommended=True,
+            )
+            for milestone, spec in zip(milestones, self.milestones)
+            for resource in spec.resources
+        ]
+
+    def build_prerequisites(self, milestones: List[RoadmapMilestone]) -> List[Any]:
+        """Prerequisite through-table rows for the saved milestones returned by build_milestones"""
+        through = RoadmapMilestone.prerequisites.through
+        return [
+            through(from_roadmapmilestone_id=mid, to_roadmapmilestone_id=prereq)
+            for mid, prereq in self.prerequisite_edges(milestones)
+        ]
+
+    def prerequisite_edges(self, milestones: List[RoadmapMilestone]) -> List[Tuple[int, int]]:
+        """(milestone id, prerequisite id) pairs for the saved milestones"""
+        return [
+            (milestone.id, milestones[index].id)
+            for milestone, spec in zip(milestones, self.milestones)
+            for index in spec.prerequisites
+        ]
+
+
+def plan_signature(skill_gap: Dict[str, Any], learning_style: str,
+                   skill_prerequisites: Tuple[Tuple[str, str], ...] = ()) -> Tuple:
+    """
+    Normalised cache key: the gap's missing and weak skills, the resource style actually
+    used and the prerequisite pairs between gap skills
+    """
+    return (
+        tuple(skill_gap['missing_skills']),
+        tuple((w['skill'], w['current_level'], w['required_level']) for w in skill_gap['weak_skills']),
+        learning_style if learning_style in RESOURCE_TEMPLATES else 'self_paced',
+        skill_prerequisites,
+    )
+
+
+def gap_prerequisites(skill_gap: Dict[str, Any], skill_ids: Dict[str, int], graph: SkillGraph) -> Tuple:
+    """(skill, prerequisite) name pairs between the gap's missing and weak skills, implied pairs dropped"""
+    names = {sid: name for name, sid in skill_ids.items()}
+    gap = [*skill_gap['missing_skills'], *(w['skill'] for w in skill_gap['weak_skills'])]
+    return tuple(
+        (names[skill_id], names[prerequisite_id])
+        for skill_id, prerequisite_id in graph.edges_within(skill_ids[name] for name in gap)
+    )
+
+
+@lru_cache(maxsize=1024)
+def roadmap_plan(missing_skills: Tuple[str, ...], weak_skills: Tuple[Tuple[str, int, int], ...],
+                 resource_style: str, skill_prerequisites: Tuple[Tuple[str, str], ...] = ()) -> RoadmapPlan:
+    """
+    Milestones for missing skills (Foundation), weak skills (Intermediate) and career
+    prep (Advanced), each with its learning resources. ``skill_prerequisites`` are
+    (skill, prerequisite) name pairs between gap skills that become milestone
+    prerequisites. Memoised on the gap signature, so a cohort picking the same career
+    with the same gap pays for one generation.
+    """
+    templates = RESOURCE_TEMPLATES[resource_style]
+    layout = []
+    for order, skill_name in enumerate(missing_skills, start=1):
+        layout.append((
+            f"Learn {skill_name} Fundamentals",
+            f"Start learning {skill_name} from scratch. Focus on basic concepts and hands-on practice.",
+            'Foundation', order, 20, 3, 'high' if order <= 3 else 'medium', 'skill',
+        ))
+    for order, (skill_name, current_level, required_level) in enumerate(weak_skills, start=1):
+        layout.append((
+            f"Master {skill_name}",
+            f"Improve your {skill_name} skills from level {current_level} to {required_level}.",
+            'Intermediate', order, 15, 2, 'medium', 'skill',
+        ))
+    skill_indexes = tuple(range(len(layout)))
+    advanced_indexes = {spec['title']: len(layout) + i for i, spec in enumerate(ADVANCED_MILESTONES)}
+    gap_indexes = {name: i for i, name in enumerate([*missing_skills, *(w[0] for w in weak_skills)])}
+    prerequisites = [[] for _ in layout]
+    for skill_name, prerequisite_name in skill_prerequisites:
+        prerequisites[gap_indexes[skill_name]].append(gap_indexes[prerequisite_name])
+    prerequisites = [tuple(indexes) for indexes in prerequisites]
+    for order, spec in enumerate(ADVANCED_MILESTONES, start=1):
+        layout.append((
+            spec['title'], spec['description'], 'Advanced', order, spec['hours'], spec['weeks'], 'medium',
+            spec['category'],
+        ))
+        prerequisites.append(tuple(
+            index
+            for name in spec['requires']
+            for index in (skill_indexes if name == 'skills' else (advanced_indexes[name],))
+        ))
+
+    milestones = tuple(
+        MilestoneSpec(*fields, prerequisites=requires, resources=tuple(
+            ResourceSpec(
+                title=f"{template['title']} for {fields[0]}",
+                resource_type=template['type'],
+                provider=template['provider'],
+                cost_type=template['cost'],
+                difficulty_level='beginner' if fields[2] == 'Foundation' else 'intermediate',
+            )
+            for template in templates
+        ))
+        for fields, requires in zip(layout, prerequisites)
+    )
+    return RoadmapPlan(milestones, sum(m.estimated_hours for m in milestones))
+
+
+def generate_personalized_roadmap(user, career_id: int, learning_style: str = 'mixed', hours_per_week: int = 10,
+                                  current_skills: Optional[Dict[str, int]] = None,
+                                  catalog: Optional[CatalogSnapshot] = None) -> PersonalizedRoadmap:
+    """
+    Create or regenerate the user's roadmap for a catalog career in one transaction.
+
+    The skill gap is computed in memory from the catalog snapshot and the milestone
+    layout comes from the memoised ``roadmap_plan``. Everything is then written with a
+    fixed number of queries (roadmap upsert, skill gap upsert, milestone delete, one
+    bulk insert each for milestones, resources and prerequisites, schedule update) no
+    matter how many milestones the roadmap has.
+    """
+    catalog = catalog or get_catalog()
+    current_skills = current_skills or {}
+    # Prerequisites first, so milestones within a phase follow the skill graph
+    graph = get_skill_graph()
+    skill_ids = {catalog.skills[sid]['name']: sid for sid in graph.order(catalog.required_skills[career_id])}
+    required_skills = {name: PROFICIENT_LEVEL for name in skill_ids}
+    skill_gap = analyze_skill_gap(required_skills, current_skills)
+    plan = roadmap_plan(*plan_signature(skill_gap, learning_style, gap_prerequisites(skill_gap, skill_ids, graph)))
+
+    with transaction.atomic():
+        roadmap = PersonalizedRoadmap.objects.filter(user=user, target_career_id=career_id).first()
+        created = roadmap is None
+        if created:
+            roadmap = PersonalizedRoadmap(
+                user=user, target_career_id=career_id, title=f"Path to {catalog.careers[career_id]['title']}"
+            )
+        roadmap.learning_style = learning_style
+        roadmap.hours_per_week = hours_per_week
+        roadmap.is_active = True
+
+        # Regeneration starts every milestone over as pending
+        for field in PersonalizedRoadmap.COUNTER_FIELDS:
+            setattr(roadmap, field, 0)
+        roadmap.milestones_total = roadmap.milestones_pending = len(plan.milestones)
+        roadmap.estimated_hours_total = plan.total_hours
+        roadmap.overall_progress_percentage = 0
+        # Every milestone starts pending, so only the skills part counts
+        roadmap.job_readiness_score = int(readiness_score({'skills': skill_gap['skill_match_percentage']}))
+        roadmap.milestones_version += 1
+        roadmap.save()
+
+        if created:
+            SkillGapAnalysis.objects.create(roadmap=roadmap, **skill_gap)
+        else:
+            SkillGapAnalysis.objects.update_or_create(roadmap=roadmap, defaults=skill_gap)
+            roadmap.milestones.all().delete()
+
+        milestones = RoadmapMilestone.objects.bulk_create(plan.build_milestones(roadmap))
+        LearningResource.objects.bulk_create(plan.build_resources(milestones))
+        RoadmapMilestone.prerequisites.through.objects.bulk_create(plan.build_prerequisites(milestones))
+
+        roadmap.schedule = build_schedule(
+            {m.id: m.estimated_hours for m in milestones}, plan.prerequisite_edges(milestones)
+        )
+        _apply_timeline(roadmap)
+        PersonalizedRoadmap.objects.filter(id=roadmap.id).update(
+            schedule=roadmap.schedule,
+            estimated_completion_weeks=roadmap.estimated_completion_weeks,
+            target_completion_date=roadmap.target_completion_date,
+        )
+
+    return roadmap
+
+
+def remaining_hours(status: str, estimated_hours: int) -> int:
+    return 0 if status in ('completed', 'skipped') else estimated_hours
+
+
+def ensure_schedule(roadmap: PersonalizedRoadmap) -> Dict[str, Any]:
+    """The roadmap's cached schedule, built from the milestone rows when missing (two queries)"""
+    if roadmap.schedule is None:
+        durations = {
+            mid: remaining_hours(status, hours)
+            for mid, status, hours in roadmap.milestones.values_list('id', 'status', 'estimated_hours')
+        }
+        edges = RoadmapMilestone.prerequisites.through.objects.filter(
+            from_roadmapmilestone__roadmap=roadmap
+        ).values_list('from_roadmapmilestone_id', 'to_roadmapmilestone_id')
+        roadmap.schedule = build_schedule(durations, edges)
+    return roadmap.schedule
+
+
+def _apply_timeline(roadmap: PersonalizedRoadmap):
+    weeks = completion_weeks(roadmap.schedule, roadmap.hours_per_week)
+    roadmap.estimated_completion_weeks = int(weeks)
+    roadmap.target_completion_date = timezone.now() + timedelta(weeks=weeks)
+
+
+def update_milestone_status(roadmap: PersonalizedRoadmap, milestone: RoadmapMilestone, new_status: str) -> bool:
+    """
+    Move ``milestone`` to ``new_status`` and shift the roadmap's denormalised counters with
+    F() expressions in the same transaction, then refresh progress from the counters.
+    Returns False (and writes nothing) when the milestone already had that status.
+    """
+    counter_fields = PersonalizedRoadmap.STATUS_COUNTER_FIELDS
+    if new_status not in counter_fields:
+        raise ValueError(f'Unknown milestone status: {new_status}')
+
+    with transaction.atomic():
+        old_status = RoadmapMilestone.objects.select_for_update().filter(id=milestone.id).values_list(
+            'status', flat=True
+        ).get()
+        if old_status == new_status:
+            milestone.status = new_status
+            return False
+
+        now = timezone.now()
+        changes = {'status': new_status}
+        if new_status == 'completed':
+            changes['completion_date'] = now
+        elif new_status == 'in_progress':
+            changes['start_date'] = now
+        RoadmapMilestone.objects.filter(id=milestone.id).update(**changes)
+        for field, value in changes.items():
+            setattr(milestone, field, value)
+
+        counters = {
+            counter_fields[old_status]: F(counter_fields[old_status]) - 1,
+            counter_fields[new_status]: F(counter_fields[new_status]) + 1,
+        }
+        if new_status == 'completed':
+            counters['completed_hours'] = F('completed_hours') + milestone.estimated_hours
+        elif old_status == 'completed':
+            counters['completed_hours'] = F('completed_hours') - milestone.estimated_hours
+        PersonalizedRoadmap.objects.filter(id=roadmap.id).update(
+            **counters, milestones_version=F('milestones_version') + 1
+        )
+        # The counter update holds the roadmap row lock, so the schedule read here is current
+        roadmap.refresh_from_db(fields=[*PersonalizedRoadmap.COUNTER_FIELDS, 'milestones_version', 'schedule'])
+        schedule = ensure_schedule(roadmap)
+        if str(milestone.id) in schedule['nodes']:
+            reschedule(schedule, milestone.id, remaining_hours(new_status, milestone.estimated_hours))
+        _apply_timeline(roadmap)
+        roadmap.update_progress(save=False)
+        roadmap.job_readiness_score = int(job_readiness(roadmap)['score'])
+        roadmap.save(update_fields=[
+            'overall_progress_percentage', 'job_readiness_score', 'schedule', 'estimated_completion_weeks',
+            'target_completion_date', 'updated_at',
+        ])
+    return True
+
+
+# Weighted parts of the job readiness score; milestone-based parts use the completion rate of that category
+READINESS_WEIGHTS = {
+    'skills': 0.4,
+    'project': 0.3,
+    'certification': 0.2,
+    'interview': 0.1,
+}
+
+
+def job_readiness(roadmap: PersonalizedRoadmap) -> Dict[str, Any]:
+    """
+    Readiness score and per-part completion from one conditional aggregate over the roadmap's
+    milestones joined to its skill gap analysis. Milestone changes store the same score in
+    ``job_readiness_score``, so views reading the stored field agree with this breakdown.
+    """
+    categories = [c for c in READINESS_WEIGHTS if c != 'skills']
+    aggregates = {}
+    for category in categories:
+        aggregates[f'{category}_total'] = Count('milestones', filter=Q(milestones__category=category))
+        aggregates[f'{category}_completed'] = Count(
+            'milestones', filter=Q(milestones__category=category, milestones__status='completed')
+        )
+    counts = PersonalizedRoadmap.objects.filter(id=roadmap.id).order_by().values(
+        skill_match=F('skill_gap_analysis__skill_match_percentage')
+    ).annotate(**aggregates).get()
+
+    parts = {'skills': counts['skill_match'] or 0}
+    for category in categories:
+        parts[category] = counts[f'{category}_completed'] / max(counts[f'{category}_total'], 1) * 100
+    return {'score': readiness_score(parts), 'parts': parts}
+
+
+def readiness_score(parts: Dict[str, float]) -> float:
+    return sum(parts.get(part, 0) * weight for part, weight in READINESS_WEIGHTS.items())
+
+
+def sync_rows(model, existing, desired: Dict[Any, Dict[str, Any]], key, defaults: Dict[str, Any]) -> bool:
+    """
+    Apply the minimal inserts, updates and deletes that turn ``existing`` rows into ``desired``.
+
+    ``desired`` maps each row's ``key(row)`` to its field values (key fields included);
+    ``defaults`` are the values shared by every new row (e.g. the owning user). Unchanged rows keep their ids and are not
+    written, duplicates of a key are deleted. Returns True when anything was written.
+    """
+    to_update, update_fields, to_delete = [], set(), []
+    seen = set()
+    for row in existing:
+        row_key = key(row)
+        values = desired.get(row_key)
+        if values is None or row_key in seen:
+            to_delete.append(row.pk)
+            continue
+        seen.add(row_key)
+        changed = [field for field, value in values.items() if getattr(row, field) != value]
+        if changed:
+            for field in changed:
+                setattr(row, field, values[field])
+            update_fields.update(changed)
+            to_update.append(row)
+    to_create = [model(**defaults, **values) for row_key, values in desired.items() if row_key not in seen]
+
+    if not (to_update or to_delete or to_create):
+        return False
+    with transaction.atomic():
+        if to_delete:
+            model.objects.filter(pk__in=to_delete).delete()
+        if to_update:
+            model.objects.bulk_update(to_update, sorted(update_fields))
+        if to_create:
+            model.objects.bulk_create(to_create)
+    return True
+
+
+def sync_roadmap_steps(user, career_id: int, catalog: Optional[CatalogSnapshot] = None) -> List[RoadmapStep]:
+    """
+    The user's skill steps for a catalog career: one per required skill below ``PROFICIENT_LEVEL``.
+    Existing steps are diffed in place, so generating twice with the same skills writes nothing.
+    """
+    catalog = catalog or get_catalog()
+    required = catalog.required_skills[career_id]
+    levels = dict(UserSkill.objects.filter(user=user, skill_id__in=required).values_list('skill_id', 'level'))
+    desired = {}
+    for sid in required:
+        if levels.get(sid, 0) < PROFICIENT_LEVEL:
+            desired[sid] = {
+                'skill_id': sid,
+                'title': f"Improve {sid} to {PROFICIENT_LEVEL}+",
+                'description': "Follow curated resources to reach proficiency.",
+                'order': len(desired) + 1,
+                'estimated_hours': 10,
+                'resource_url': "https://roadmap.sh/",
+            }
+
+    steps = RoadmapStep.objects.filter(user=user, career_path_id=career_id).select_related('skill', 'career_path')
+    existing = list(steps)
+    if sync_rows(RoadmapStep, existing, desired, key=lambda step: step.skill_id,
+                 defaults={'user': user, 'career_path_id': career_id}):
+        existing = list(steps.all())
+    return existing
+
+
+def ensure_project_recommendations(user) -> List[ProjectRecommendation]:
+    """
+    Project ideas for the user's top recommended career, served from stored rows.
+    Rows are only written when the top career (and so the desired set) changed.
+    """
+    top = CareerRecommendation.objects.filter(user=user).select_related('career_path').order_by('-score').first()
+    if not top:
+        return []
+    career = top.career_path
+    samples = [
+        (f"Build a {career.title} demo", "Create a small app featuring core skills", 'intermediate'),
+        ("Capstone portfolio project", "End-to-end project with docs and tests", 'advanced'),
+    ]
+    desired = {
+        title: {'title': title, 'description': description, 'difficulty': difficulty}
+        for title, description, difficulty in samples
+    }
+
+    projects = ProjectRecommendation.objects.filter(user=user, career_path=career).select_related('career_path')
+    existing = list(projects)
+    if sync_rows(ProjectRecommendation, existing, desired, key=lambda project: project.title,
+                 defaults={'user': user, 'career_path': career}):
+        existing = list(projects.all())
+    return existing
@@ -0,0 +1,39 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from skills.models import Skill, UserSkill
+from .catalog import invalidate_catalog_on_commit
+from .models import CareerPath
+from .services import mark_recommendations_stale
+
+
+@receiver(post_save, sender=CareerPath)
+@receiver(post_delete, sender=CareerPath)
+def career_path_changed(sender, **kwargs):
+    invalidate_catalog_on_commit()
+
+
+@receiver(m2m_changed, sender=CareerPath.required_skills.through)
+def career_required_skills_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_catalog_on_commit()
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def skill_changed(sender, **kwargs):
+    # The snapshot carries skill names, and deleting a skill cascades through the
+    # required_skills table without sending m2m_changed.
+    invalidate_catalog_on_commit()
+
+
+@receiver(post_save, sender=UserSkill)
+def user_skill_saved(sender, instance, **kwargs):
+    mark_recommendations_stale(instance.user_id)
+
+
+@receiver(post_delete, sender=UserSkill)
+def user_skill_deleted(sender, instance, **kwargs):
+    # Without a state row there are no synced recommendations to invalidate, and
+    # creating one here would reference a user whose delete is cascading
+    mark_recommendations_stale(instance.user_id, create=False)
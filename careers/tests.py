@@ -1,3 +1,862 @@
-from django.test import TestCase
+import io
+import os
+import random
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ml.artifacts import open_bundle, write_bundle
+from ml.batch import load_user_skill_chunk, precompute_recommendations
+from ml.career_model import CareerRecommendationModel, career_model_registry, get_career_model
+from ml.recommender import score_career_paths
+from ml.scoring import CareerScoringEngine
+from skills.graph import add_prerequisite, get_skill_graph, invalidate_skill_graph
+from skills.models import Skill, UserSkill
+from .catalog import CatalogSnapshot, get_catalog
+from ml.collaborative import refresh_neighbor_table
+from ml.registry import ModelRegistry
+from .models import (
+    CareerPath, CareerRecommendation, LearningResource, PersonalizedRoadmap, ProgressPoint, ProjectRecommendation,
+    RecommendationState, SkillGapAnalysis, UserNeighbor,
+)
+from .progress import progress_series, rollup_progress
+from .response_cache import ResponseCache
+from .scheduler import build_schedule, completion_weeks, reschedule
+from .serializers import CareerProgressTrackerSerializer, PersonalizedRoadmapSerializer
+from .services import (
+    ensure_schedule, generate_personalized_roadmap, job_readiness, roadmap_plan,
+    sync_recommendations,
+)
+from .views import roadmap_response_cache
 
 # Create your tests here.
+
+
+class CareerScoringEngineTests(SimpleTestCase):
+    mapping = {
+        1: [10, 11, 12],
+        2: [10],
+        3: [],
+        4: [13, 14],
+    }
+
+    def test_scores_match_overlap_formula(self):
+        levels = {10: 90, 11: 150, 12: -5, 14: 40}
+        self.assertEqual(score_career_paths(levels, self.mapping), [
+            (2, 90.0),
+            (1, 63.33),
+            (4, 20.0),
+            (3, 0.0),
+        ])
+
+    def test_limit_returns_top_k_in_order(self):
+        engine = CareerScoringEngine(self.mapping)
+        self.assertEqual(engine.score({10: 50, 13: 100, 14: 100}, limit=2), [(4, 100.0), (2, 50.0)])
+        self.assertEqual(engine.score({}, limit=0), [])
+
+    def test_candidate_top_k_matches_full_ranking_with_ties_at_the_cut(self):
+        mapping = {career_id: [10 + career_id % 3] for career_id in range(1, 31)}
+        engine = CareerScoringEngine(mapping)
+        levels = {10: 60, 11: 60, 12: 30}
+        full = engine.score_candidates(levels)
+        self.assertEqual(len(full), 30)
+        for limit in (1, 5, 10, 20, 29, 30, 40):
+            self.assertEqual(engine.score_candidates(levels, limit=limit), full[:limit])
+        self.assertEqual([career_id for career_id, _ in full[:3]], [1, 3, 4])
+
+    def test_engine_reopened_from_memory_mapped_bundle(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        engine = CareerScoringEngine(self.mapping)
+        write_bundle(root, 'scoring_engine', 'abc', **engine.artifacts())
+
+        self.assertIsNone(open_bundle(root, 'scoring_engine', 'other'))
+        shared = CareerScoringEngine.from_bundle(open_bundle(root, 'scoring_engine', 'abc'))
+        self.assertIsInstance(shared.career_ids, np.memmap)
+        levels = {10: 90, 11: 150, 12: -5, 14: 40}
+        self.assertEqual(shared.score(levels), engine.score(levels))
+        self.assertEqual(shared.score_candidates(levels, limit=2), engine.score_candidates(levels, limit=2))
+
+
+class CatalogSnapshotTests(TestCase):
+    def setUp(self):
+        self.python = Skill.objects.create(name='Python')
+        self.sql = Skill.objects.create(name='SQL')
+        self.career = CareerPath.objects.create(title='Backend Developer')
+        self.career.required_skills.set([self.python])
+
+    def test_snapshot_is_reused_until_catalog_changes(self):
+        catalog = get_catalog()
+        self.assertEqual(catalog.required_skills[self.career.id], [self.python.id])
+        with self.assertNumQueries(0):
+            self.assertIs(get_catalog(), catalog)
+
+        self.career.required_skills.add(self.sql)
+        refreshed = get_catalog()
+        self.assertIsNot(refreshed, catalog)
+        self.assertEqual(refreshed.required_skills[self.career.id], [self.python.id, self.sql.id])
+
+    def test_requests_leave_artifact_writing_to_the_build_command(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        with self.settings(ML_ARTIFACTS_DIR=root):
+            get_catalog().engine
+            self.assertEqual(os.listdir(root), [])
+
+            call_command('build_ml_artifacts', stdout=io.StringIO())
+            self.assertIsNotNone(open_bundle(root, 'scoring_engine', get_catalog().fingerprint))
+
+    def test_score_career_paths_reuses_catalog_engine(self):
+        get_catalog().engine
+        with mock.patch('ml.recommender.CareerScoringEngine') as build, self.assertNumQueries(0):
+            scores = score_career_paths({self.python.id: 80})
+        build.assert_not_called()
+        self.assertEqual(scores, [(self.career.id, 80.0)])
+
+
+class RecommendationListViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(username='carol', password='Str0ngP@ss!')
+        self.client.force_authenticate(self.user)
+        self.python = Skill.objects.create(name='Python')
+        self.sql = Skill.objects.create(name='SQL')
+        self.backend = CareerPath.objects.create(title='Backend Developer')
+        self.backend.required_skills.set([self.python, self.sql])
+        self.analyst = CareerPath.objects.create(title='Data Analyst')
+        self.analyst.required_skills.set([self.sql])
+        UserSkill.objects.create(user=self.user, skill=self.python, level=80)
+
+    def test_get_is_read_only_until_skills_change(self):
+        r = self.client.get('/recommendations/')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([(rec['career_path']['id'], rec['score']) for rec in r.data], [(self.backend.id, 40.0)])
+        rec_id = r.data[0]['id']
+
+        with self.assertNumQueries(3):  # state, recommendations, required skills prefetch; no writes
+            self.client.get('/recommendations/')
+
+        UserSkill.objects.create(user=self.user, skill=self.sql, level=60)
+        r = self.client.get('/recommendations/')
+        self.assertEqual([(rec['career_path']['id'], rec['score']) for rec in r.data],
+                         [(self.backend.id, 70.0), (self.analyst.id, 60.0)])
+        # Existing rows are updated in place rather than recreated
+        self.assertEqual(r.data[0]['id'], rec_id)
+        self.assertEqual(CareerRecommendation.objects.filter(user=self.user).count(), 2)
+
+    def test_sync_upserts_rows_inserted_by_a_concurrent_refresh(self):
+        CareerRecommendation.objects.create(user=self.user, career_path=self.backend, score=10)
+        # The other request's row was committed after this one read the existing rows
+        with mock.patch.object(CareerRecommendation.objects, 'filter') as stale_read:
+            stale_read.return_value.values_list.return_value = []
+            sync_recommendations({self.user.id: [(self.backend.id, 40.0)]}, 'fp', {self.user.id: 0})
+        self.assertEqual(list(CareerRecommendation.objects.filter(user=self.user).values_list('score', flat=True)),
+                         [40.0])
+
+    def test_deleting_a_user_with_skills_leaves_no_state_behind(self):
+        self.client.get('/recommendations/')
+        # The user delete cascades to RecommendationState before UserSkill; replay that
+        # order here (deleting the user itself would also touch unmigrated gamification tables)
+        RecommendationState.objects.filter(user=self.user).delete()
+        UserSkill.objects.filter(user=self.user).delete()
+        self.assertFalse(RecommendationState.objects.exists())
+
+    def test_removing_a_skill_marks_recommendations_stale(self):
+        self.client.get('/recommendations/')
+        UserSkill.objects.filter(user=self.user).delete()
+        self.assertEqual(self.client.get('/recommendations/').data, [])
+
+    def test_limit_returns_top_recommendations(self):
+        UserSkill.objects.create(user=self.user, skill=self.sql, level=60)
+        r = self.client.get('/recommendations/?limit=1')
+        self.assertEqual([rec['career_path']['id'] for rec in r.data], [self.backend.id])
+        self.assertEqual(self.client.get('/recommendations/?limit=0').status_code, 400)
+
+
+class ModelRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.version = 1
+        self.builds = []
+
+    def _build(self):
+        if self.version == 'broken':
+            raise RuntimeError('boom')
+        self.builds.append(self.version)
+        return f'model-{self.version}'
+
+    def _refit(self, registry):
+        registry.get()
+        for thread in threading.enumerate():
+            if thread.name == 'test-model-refit':
+                thread.join(5)
+
+    def test_refit_swaps_in_new_model_and_logs_failures(self):
+        registry = ModelRegistry('test-model', self._build, lambda: self.version)
+        self.assertEqual(registry.get(), 'model-1')
+
+        self.version = 2
+        self._refit(registry)
+        self.assertEqual((registry.get(), registry.status()['version']), ('model-2', 2))
+
+        self.version = 'broken'
+        with self.assertLogs('ml.registry', 'ERROR'):
+            self._refit(registry)
+        # The previous model keeps being served
+        status = registry.status()
+        self.assertEqual((status['version'], status['last_error'], status['refitting']), (2, 'boom', False))
+
+
+class ResponseCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.cache = ResponseCache('test', ttl=10, stale_ttl=20, clock=lambda: self.now)
+
+    def _wait_for_refresh(self):
+        for thread in threading.enumerate():
+            if thread.name == 'test-refresh':
+                thread.join(5)
+
+    def test_fresh_stale_and_expired_entries(self):
+        self.assertEqual(self.cache.get('k', lambda: 1), (1, 'MISS'))
+        self.assertEqual(self.cache.get('k', lambda: 2), (1, 'HIT'))
+
+        # Stale entries are served immediately and recomputed in the background
+        self.now = 15
+        self.assertEqual(self.cache.get('k', lambda: 3), (1, 'STALE'))
+        self._wait_for_refresh()
+        self.assertEqual(self.cache.get('k', lambda: 4), (3, 'HIT'))
+
+        self.now = 100
+        self.assertEqual(self.cache.get('k', lambda: 5), (5, 'MISS'))
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['stale_hits'], stats['misses']), (2, 1, 2))
+
+    def test_failed_refresh_keeps_serving_stale_entry(self):
+        self.cache.get('k', lambda: 1)
+        self.now = 15
+
+        def fail():
+            raise RuntimeError('boom')
+
+        with self.assertLogs('careers.response_cache', 'ERROR'):
+            self.assertEqual(self.cache.get('k', fail), (1, 'STALE'))
+            self._wait_for_refresh()
+        self.assertEqual(self.cache.get('k', lambda: 2), (1, 'STALE'))
+        self._wait_for_refresh()
+        self.assertEqual(self.cache.stats()['refresh_errors'], 1)
+
+    def test_uncacheable_payloads_are_not_stored(self):
+        cache = ResponseCache('test', ttl=10, stale_ttl=20, clock=lambda: self.now,
+                              cacheable=lambda value: value != 'error')
+        self.assertEqual(cache.get('k', lambda: 'error'), ('error', 'MISS'))
+        self.assertEqual(cache.get('k', lambda: 'ok'), ('ok', 'MISS'))
+
+        # A stale entry whose refresh now fails is dropped instead of being served on
+        self.now = 15
+        self.assertEqual(cache.get('k', lambda: 'error'), ('ok', 'STALE'))
+        self._wait_for_refresh()
+        self.assertEqual(cache.get('k', lambda: 'error'), ('error', 'MISS'))
+
+
+class CareerRoadmapViewTests(TestCase):
+    def setUp(self):
+        career_model_registry.reset()
+        roadmap_response_cache.clear()
+        self.artifacts_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.artifacts_dir)
+        artifacts = self.settings(ML_ARTIFACTS_DIR=self.artifacts_dir, ML_ARTIFACTS_WRITE_ON_DEMAND=True)
+        artifacts.enable()
+        self.addCleanup(artifacts.disable)
+
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(username='dave', password='Str0ngP@ss!')
+        self.client.force_authenticate(self.user)
+        python = Skill.objects.create(name='Python', category='Programming')
+        career = CareerPath.objects.create(title='Data Engineer', description='Build data pipelines')
+        career.required_skills.set([python, Skill.objects.create(name='Airflow', category='Data')])
+        analyst = CareerPath.objects.create(title='Data Analyst', description='Analyse data for reports')
+        analyst.required_skills.set([python, Skill.objects.create(name='Tableau', category='Data')])
+        designer = CareerPath.objects.create(title='Designer', description='Design interfaces')
+        designer.required_skills.set([Skill.objects.create(name='Figma', category='Design')])
+
+    def test_model_is_fitted_from_catalog_once(self):
+        r = self.client.post('/recommendations/career-roadmap/', {'target_career': 'Data Engineer'}, format='json')
+        self.assertEqual(r.status_code, 200)
+        # Python is required by two careers, so it ranks as the foundation skill
+        phases = r.data['roadmap']['phases']
+        self.assertEqual([step['skill'] for step in phases['Foundation (0-3 months)']], ['Python'])
+        self.assertEqual([step['skill'] for step in phases['Advanced (6-12 months)']], ['Airflow'])
+
+        model = get_career_model()
+        self.client.post('/recommendations/career-roadmap/', {'target_career': 'Data Engineer'}, format='json')
+        self.assertIs(get_career_model(), model)
+
+    def test_importance_is_ranked_within_each_career(self):
+        self.assertEqual(CareerRecommendationModel._ranked_importance(5), [0.95, 0.837, 0.725, 0.613, 0.5])
+        self.assertEqual(CareerRecommendationModel._ranked_importance(1), [0.95])
+
+    def test_duplicate_titles_keep_the_first_career(self):
+        # CareerPath.title is unique, so build the clashing snapshot by hand
+        careers = {
+            career_id: dict(get_catalog().careers[CareerPath.objects.get(title='Designer').id], id=career_id)
+            for career_id in (7, 8)
+        }
+        careers[8]['description'] = 'Design buildings'
+        catalog = CatalogSnapshot(1, careers, {7: [], 8: []}, {})
+        with self.assertLogs('ml.career_model', 'WARNING'):
+            model = CareerRecommendationModel.from_catalog(catalog)
+        self.assertEqual(model.career_names.count('Designer'), 1)
+        self.assertEqual(model.career_data['Designer']['description'], 'Design interfaces')
+
+    def test_repeat_requests_are_served_from_cache(self):
+        url = '/recommendations/career-roadmap/'
+        first = self.client.post(url, {'target_career': 'Data Engineer'}, format='json')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        second = self.client.post(url, {'target_career': 'Data Engineer'}, format='json')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+        r = self.client.post(url, {'target_career': 'Data Engineer', 'interests': ['reports']}, format='json')
+        self.assertEqual(r['X-Cache'], 'MISS')
+        r = self.client.post(url, {'target_career': 'Astronaut'}, format='json')
+        self.assertEqual(r.status_code, 404)
+        stats = roadmap_response_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 3))
+
+        # Error bodies are not cached
+        r = self.client.post(url, {'target_career': 'Astronaut'}, format='json')
+        self.assertEqual((r.status_code, r['X-Cache']), (404, 'MISS'))
+        self.assertEqual(roadmap_response_cache.stats()['entries'], 2)
+
+    def test_alternatives_come_from_persisted_similarity_index(self):
+        r = self.client.post('/recommendations/career-roadmap/', {'target_career': 'Data Engineer'}, format='json')
+        alternatives = r.data['alternative_careers']
+        self.assertEqual([a['career'] for a in alternatives], ['Data Analyst'])
+        self.assertGreater(alternatives[0]['similarity'], 0)
+        self.assertIn('missing_skills', alternatives[0])
+
+        # A second process memory-maps the persisted artifacts instead of refitting
+        model = get_career_model()
+        reopened = CareerRecommendationModel(model.career_data, artifacts_dir=self.artifacts_dir)
+        self.assertIsInstance(reopened.similarity_index.neighbors, np.memmap)
+        self.assertIsNot(reopened.tfidf_vectorizer, model.tfidf_vectorizer)
+        self.assertEqual(reopened.similar_careers({}, 'Data Engineer', ['reports']),
+                         model.similar_careers({}, 'Data Engineer', ['reports']))
+
+    def test_alternatives_fall_back_to_top_ranked_careers(self):
+        # Designer shares no skill or description term with any other career
+        model = get_career_model()
+        self.assertEqual(model.similarity_index.neighbors_of(model.career_rows['Designer']), [])
+        alternatives = model.similar_careers({'Python': 80}, 'Designer')
+        self.assertEqual({a['career'] for a in alternatives}, {'Data Engineer', 'Data Analyst'})
+        self.assertEqual({a['similarity'] for a in alternatives}, {0.0})
+
+
+class BatchSimulationViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(username='erin', password='Str0ngP@ss!')
+        self.client.force_authenticate(self.user)
+        self.python = Skill.objects.create(name='Python')
+        self.sql = Skill.objects.create(name='SQL')
+        self.backend = CareerPath.objects.create(title='Backend Developer')
+        self.backend.required_skills.set([self.python, self.sql])
+        self.analyst = CareerPath.objects.create(title='Data Analyst')
+        self.analyst.required_skills.set([self.sql])
+        UserSkill.objects.create(user=self.user, skill=self.python, level=60)
+
+    def test_batch_matches_single_simulations(self):
+        scenarios = [{str(self.sql.id): 100}, {'adjustments': {str(self.python.id): 20}}]
+        r = self.client.post('/recommendations/simulate/batch/', {'scenarios': scenarios, 'top_k': 2}, format='json')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data['baseline'][0], {'career_path_id': self.backend.id, 'score': 30.0})
+
+        for scenario, result in zip(scenarios, r.data['scenarios']):
+            adjustments = scenario.get('adjustments', scenario)
+            single = self.client.post('/recommendations/simulate/', {'adjustments': adjustments}, format='json')
+            self.assertEqual([(t['career_path_id'], t['score']) for t in result['top']],
+                             [(s['career_path_id'], s['score']) for s in single.data[:2]])
+        self.assertEqual(r.data['scenarios'][0]['top'][0],
+                         {'career_path_id': self.analyst.id, 'score': 100.0, 'delta': 100.0})
+        self.assertEqual(r.data['scenarios'][1]['top'][0]['delta'], -20.0)
+
+    def test_single_simulation_uses_fresh_baseline_after_skill_change(self):
+        adjustments = {str(self.sql.id): 50}
+        r = self.client.post('/recommendations/simulate/', {'adjustments': adjustments, 'limit': 1}, format='json')
+        self.assertEqual(r.data, [{'career_path_id': self.backend.id, 'score': 55.0}])
+
+        user_skill = UserSkill.objects.get(user=self.user, skill=self.python)
+        user_skill.level = 0
+        user_skill.save()
+        r = self.client.post('/recommendations/simulate/', {'adjustments': adjustments, 'limit': 1}, format='json')
+        self.assertEqual(r.data, [{'career_path_id': self.analyst.id, 'score': 50.0}])
+
+
+class PrecomputeRecommendationsTests(TestCase):
+    def setUp(self):
+        self.python = Skill.objects.create(name='Python')
+        self.backend = CareerPath.objects.create(title='Backend Developer')
+        self.backend.required_skills.set([self.python])
+        self.users = [
+            get_user_model().objects.create_user(username=f'batch{i}', password='Str0ngP@ss!') for i in range(3)
+        ]
+        for i, user in enumerate(self.users):
+            UserSkill.objects.create(user=user, skill=self.python, level=20 * (i + 1))
+
+    def test_scores_every_user_in_chunks(self):
+        stats = precompute_recommendations(chunk_size=2)
+        self.assertEqual(stats['users'], 3)
+        self.assertEqual(list(CareerRecommendation.objects.order_by('user_id').values_list('score', flat=True)),
+                         [20.0, 40.0, 60.0])
+
+    def test_skill_edit_during_batch_leaves_user_stale(self):
+        racing = self.users[0]
+
+        def load_then_edit(user_ids):
+            chunk = load_user_skill_chunk(user_ids)
+            if racing.id in user_ids:
+                user_skill = UserSkill.objects.get(user=racing)
+                user_skill.level = 100
+                user_skill.save()
+            return chunk
+
+        with mock.patch('ml.batch.load_user_skill_chunk', side_effect=load_then_edit):
+            precompute_recommendations(chunk_size=2)
+        state = RecommendationState.objects.get(user=racing)
+        self.assertNotEqual(state.synced_skills_version, state.skills_version)
+        self.assertEqual(RecommendationState.objects.get(user=self.users[2]).synced_skills_version,
+                         RecommendationState.objects.get(user=self.users[2]).skills_version)
+
+
+class PeerCareerViewTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username='me', email='me@example.com', password='pw')
+        self.peer = User.objects.create_user(username='peer', email='peer@example.com', password='pw')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        python = Skill.objects.create(name='Python', category='programming')
+        sql = Skill.objects.create(name='SQL', category='data')
+        design = Skill.objects.create(name='Figma', category='design')
+        self.backend = CareerPath.objects.create(title='Backend Developer')
+        self.designer = CareerPath.objects.create(title='Product Designer')
+
+        for user, skill, level in [(self.user, python, 70), (self.user, sql, 40),
+                                   (self.peer, python, 60), (self.peer, sql, 50),
+                                   (self.other, design, 90)]:
+            UserSkill.objects.create(user=user, skill=skill, level=level)
+        PersonalizedRoadmap.objects.create(user=self.peer, target_career=self.backend, title='Backend',
+                                           overall_progress_percentage=40.0)
+        PersonalizedRoadmap.objects.create(user=self.other, target_career=self.designer, title='Design')
+
+    def test_suggests_careers_of_similar_users(self):
+        stats = refresh_neighbor_table(k=5)
+        self.assertEqual(stats['users'], 3)
+        self.assertEqual(list(UserNeighbor.objects.filter(user=self.user).values_list('neighbor_id', flat=True)),
+                         [self.peer.id])
+
+        get_catalog()
+        with self.assertNumQueries(2):
+            r = self.client.get('/recommendations/peers/')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(len(r.data), 1)
+        self.assertEqual(r.data[0]['career_path_id'], self.backend.id)
+        self.assertEqual(r.data[0]['peer_count'], 1)
+        self.assertEqual(r.data[0]['average_peer_progress'], 40.0)
+        roadmap = r.data[0]['peer_roadmaps'][0]
+        self.assertEqual((roadmap['title'], roadmap['progress'], roadmap['learning_style']), ('Backend', 40.0, 'mixed'))
+        self.assertNotIn('user_id', roadmap)
+
+    def test_skips_careers_the_user_already_pursues(self):
+        PersonalizedRoadmap.objects.create(user=self.user, target_career=self.backend, title='Mine')
+        refresh_neighbor_table(k=5)
+        r = self.client.get('/recommendations/peers/')
+        self.assertEqual(r.data, [])
+
+
+class DiffSyncViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='hal', password='Str0ngP@ss!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.skills = [Skill.objects.create(name=f'Tool {i}', category='General') for i in range(3)]
+        self.career = CareerPath.objects.create(title='Platform Engineer')
+        self.career.required_skills.set(self.skills)
+        self.other = CareerPath.objects.create(title='SRE')
+
+    def _writes(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as ctx:
+            r = getattr(self.client, method)(url, data, format='json')
+        writes = [q['sql'] for q in ctx.captured_queries if q['sql'].split()[0] in ('INSERT', 'UPDATE', 'DELETE')]
+        return r, writes
+
+    def test_generate_steps_diffs_against_existing_rows(self):
+        url = '/recommendations/roadmap/'
+        r, _ = self._writes('post', url, {'career_path_id': self.career.id})
+        self.assertEqual([step['skill'] for step in r.data], [s.id for s in self.skills])
+        ids = {step['skill']: step['id'] for step in r.data}
+
+        r, writes = self._writes('post', url, {'career_path_id': self.career.id})
+        self.assertEqual(writes, [])
+        self.assertEqual({step['skill']: step['id'] for step in r.data}, ids)
+
+        UserSkill.objects.create(user=self.user, skill=self.skills[0], level=90)
+        r, writes = self._writes('post', url, {'career_path_id': self.career.id})
+        self.assertEqual([(step['skill'], step['order']) for step in r.data],
+                         [(self.skills[1].id, 1), (self.skills[2].id, 2)])
+        self.assertEqual([step['id'] for step in r.data], [ids[self.skills[1].id], ids[self.skills[2].id]])
+        self.assertEqual(len(writes), 2)  # one delete, one bulk update
+
+    def test_projects_are_served_from_stored_rows_until_top_career_changes(self):
+        CareerRecommendation.objects.create(user=self.user, career_path=self.career, score=70)
+        r, writes = self._writes('get', '/recommendations/projects/')
+        self.assertEqual(len(r.data), 2)
+        self.assertEqual(len(writes), 1)
+        ids = sorted(project['id'] for project in r.data)
+
+        r, writes = self._writes('get', '/recommendations/projects/')
+        self.assertEqual(writes, [])
+        self.assertEqual(sorted(project['id'] for project in r.data), ids)
+
+        CareerRecommendation.objects.create(user=self.user, career_path=self.other, score=90)
+        r = self.client.get('/recommendations/projects/')
+        self.assertEqual({project['career_path'] for project in r.data}, {self.other.id})
+        self.assertEqual(ProjectRecommendation.objects.filter(user=self.user, career_path=self.career).count(), 2)
+
+
+class RoadmapGenerationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='erin', password='Str0ngP@ss!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        skills = [Skill.objects.create(name=f'Skill {i}', category='General') for i in range(8)]
+        self.small = CareerPath.objects.create(title='Small')
+        self.small.required_skills.set(skills[:2])
+        self.large = CareerPath.objects.create(title='Large')
+        self.large.required_skills.set(skills)
+
+    def _queries(self, career, **kwargs):
+        get_catalog()
+        get_skill_graph()
+        with CaptureQueriesContext(connection) as ctx:
+            generate_personalized_roadmap(self.user, career.id, **kwargs)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_depend_on_milestone_count(self):
+        small = self._queries(self.small)
+        large = self._queries(self.large, current_skills={'Skill 0': 50, 'Skill 1': 90})
+        self.assertEqual(small, large)
+        # Includes the prerequisite insert and the schedule write
+        self.assertLessEqual(small, 10)
+        # Regenerating replaces the milestones with the same fixed cost
+        self.assertEqual(self._queries(self.large), self._queries(self.large))
+
+    def test_post_builds_milestones_resources_and_timeline(self):
+        r = self.client.post('/recommendations/personalized-roadmap/', {
+            'target_career_id': self.small.id, 'learning_style': 'bootcamp', 'hours_per_week': 5,
+            'current_skills': {'Skill 0': 50},
+        }, format='json')
+        self.assertEqual(r.status_code, 201)
+        roadmap = PersonalizedRoadmap.objects.get(user=self.user)
+        phases = list(roadmap.milestones.values_list('phase', flat=True))
+        self.assertEqual(phases.count('Foundation'), 1)
+        self.assertEqual(phases.count('Intermediate'), 1)
+        self.assertEqual(LearningResource.objects.filter(milestone__roadmap=roadmap).count(), len(phases) * 2)
+        self.assertEqual(roadmap.estimated_completion_weeks, (20 + 15 + 125) // 5)
+        self.assertEqual(r.data['skill_gap_analysis']['missing_skills'], ['Skill 1'])
+
+        r = self.client.post('/recommendations/personalized-roadmap/', {'target_career_id': 'x'}, format='json')
+        self.assertEqual(r.status_code, 400)
+
+    def test_skill_prerequisites_order_milestones(self):
+        invalidate_skill_graph()
+        self.addCleanup(invalidate_skill_graph)
+        skills = {s.name: s.id for s in Skill.objects.filter(name__in=['Skill 0', 'Skill 1', 'Skill 2'])}
+        with self.captureOnCommitCallbacks(execute=True):
+            add_prerequisite(skills['Skill 0'], skills['Skill 2'])
+            add_prerequisite(skills['Skill 2'], skills['Skill 1'])
+
+        roadmap = generate_personalized_roadmap(self.user, self.large.id, current_skills={'Skill 1': 40})
+        foundation = list(roadmap.milestones.filter(phase='Foundation').order_by('order_in_phase'))
+        titles = [m.title for m in foundation]
+        self.assertLess(titles.index('Learn Skill 2 Fundamentals'), titles.index('Learn Skill 0 Fundamentals'))
+        skill_0 = foundation[titles.index('Learn Skill 0 Fundamentals')]
+        self.assertEqual([m.title for m in skill_0.prerequisites.all()], ['Learn Skill 2 Fundamentals'])
+        skill_2 = foundation[titles.index('Learn Skill 2 Fundamentals')]
+        self.assertEqual([m.title for m in skill_2.prerequisites.all()], ['Master Skill 1'])
+        nodes = roadmap.schedule['nodes']
+        self.assertEqual(nodes[str(skill_0.id)]['es'], 15 + 20)
+
+    def test_cohort_with_same_gap_reuses_one_plan(self):
+        roadmap_plan.cache_clear()
+        cohort = [get_user_model().objects.create_user(username=f'student{i}', password='pw') for i in range(3)]
+        roadmaps = [
+            generate_personalized_roadmap(user, self.large.id, 'certification', current_skills={'Skill 2': 40})
+            for user in cohort
+        ]
+        info = roadmap_plan.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 2))
+
+        layouts = [
+            list(LearningResource.objects.filter(milestone__roadmap=r).order_by('id')
+                 .values_list('milestone__title', 'title', 'cost_type'))
+            for r in roadmaps
+        ]
+        self.assertEqual(layouts[0], layouts[2])
+        self.assertEqual(len(layouts[0]), (7 + 1 + 5) * 2)
+
+
+class SchedulerTests(SimpleTestCase):
+    def _random_dag(self, rng, n=60):
+        durations = {i: rng.randint(1, 40) for i in range(n)}
+        edges = [(i, j) for i in range(n) for j in range(i) if rng.random() < 0.08]
+        return durations, edges
+
+    def test_incremental_updates_match_full_rebuild(self):
+        rng = random.Random(7)
+        durations, edges = self._random_dag(rng)
+        schedule = build_schedule(durations, edges)
+        for _ in range(40):
+            mid = rng.randrange(len(durations))
+            durations[mid] = rng.choice([0, rng.randint(1, 40)])
+            reschedule(schedule, mid, durations[mid])
+            fresh = build_schedule(durations, edges)
+            for key, node in fresh['nodes'].items():
+                self.assertEqual((schedule['nodes'][key]['es'], schedule['nodes'][key]['ef']), (node['es'], node['ef']))
+            self.assertEqual(schedule['critical_path_hours'], fresh['critical_path_hours'])
+            self.assertEqual(schedule['remaining_hours'], sum(durations.values()))
+
+    def test_only_descendants_are_recomputed(self):
+        # Two independent chains: 1 -> 2 -> 3 and 4 -> 5
+        schedule = build_schedule({1: 10, 2: 10, 3: 10, 4: 5, 5: 5}, [(2, 1), (3, 2), (5, 4)])
+        self.assertEqual(schedule['critical_path'], [1, 2, 3])
+        self.assertEqual(reschedule(schedule, 2, 0), 2)
+        self.assertEqual(schedule['nodes']['3']['es'], 10)
+        # A change that does not move finish times stops at the milestone itself
+        self.assertEqual(reschedule(schedule, 4, 5), 1)
+
+    def test_completion_is_sequential_and_critical_path_a_lower_bound(self):
+        schedule = build_schedule({1: 10, 2: 10, 3: 10, 4: 5, 5: 5}, [(2, 1), (3, 2), (5, 4)])
+        self.assertEqual(completion_weeks(schedule, 10), 4.0)
+        self.assertEqual(schedule['critical_path_hours'], 30)
+
+    def test_cycle_is_rejected(self):
+        with self.assertRaises(ValueError):
+            build_schedule({1: 1, 2: 1, 3: 1}, [(2, 1), (3, 2), (1, 3)])
+
+
+class MilestoneCounterTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='fay', password='Str0ngP@ss!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        career = CareerPath.objects.create(title='Analyst')
+        career.required_skills.set([Skill.objects.create(name='SQL', category='Data')])
+        self.roadmap = generate_personalized_roadmap(self.user, career.id)
+        self.milestones = list(self.roadmap.milestones.order_by('id'))
+
+    def _patch(self, milestone, new_status):
+        url = f'/recommendations/roadmap/{self.roadmap.id}/milestones/{milestone.id}/'
+        return self.client.patch(url, {'status': new_status}, format='json')
+
+    def test_status_changes_move_counters(self):
+        self.assertEqual((self.roadmap.milestones_total, self.roadmap.milestones_pending), (6, 6))
+        self.assertEqual(self.roadmap.estimated_hours_total, 20 + 125)
+
+        self._patch(self.milestones[0], 'in_progress')
+        self._patch(self.milestones[0], 'completed')
+        self._patch(self.milestones[1], 'skipped')
+        self._patch(self.milestones[1], 'skipped')
+
+        roadmap = PersonalizedRoadmap.objects.get(id=self.roadmap.id)
+        self.assertEqual(
+            (roadmap.milestones_pending, roadmap.milestones_in_progress, roadmap.milestones_completed,
+             roadmap.milestones_skipped, roadmap.completed_hours),
+            (4, 0, 1, 1, 20),
+        )
+        self.assertAlmostEqual(roadmap.overall_progress_percentage, 100 / 6)
+        self.assertEqual(roadmap.progress_points.filter(resolution='raw').count(), 3)
+
+        expected = {field: getattr(roadmap, field) for field in PersonalizedRoadmap.COUNTER_FIELDS}
+        roadmap.recount_milestones(save=False)
+        self.assertEqual({field: getattr(roadmap, field) for field in PersonalizedRoadmap.COUNTER_FIELDS}, expected)
+
+        self._patch(self.milestones[0], 'pending')
+        roadmap.refresh_from_db()
+        self.assertEqual((roadmap.milestones_completed, roadmap.completed_hours), (0, 0))
+
+    def test_status_change_reschedules_downstream_milestones(self):
+        skill, project = self.milestones[0], self.milestones[1]
+        self.assertEqual(list(project.prerequisites.all()), [skill])
+        self.assertEqual(self.roadmap.schedule['critical_path'][0], skill.id)
+        self.assertEqual(self.roadmap.schedule['nodes'][str(project.id)]['es'], 20)
+
+        self._patch(skill, 'completed')
+        roadmap = PersonalizedRoadmap.objects.get(id=self.roadmap.id)
+        self.assertEqual(roadmap.schedule['nodes'][str(project.id)]['es'], 0)
+        self.assertEqual(roadmap.schedule['remaining_hours'], 125)
+        self.assertEqual(roadmap.estimated_completion_weeks, 125 // 10)
+
+        # The cached schedule matches a full rebuild from the milestone rows
+        roadmap.schedule = None
+        rebuilt = ensure_schedule(roadmap)['nodes']
+        cached = PersonalizedRoadmap.objects.get(id=roadmap.id).schedule['nodes']
+        self.assertEqual({k: (n['es'], n['ef']) for k, n in cached.items()},
+                         {k: (n['es'], n['ef']) for k, n in rebuilt.items()})
+
+        r = self.client.get('/recommendations/personalized-roadmap/?fields=id,schedule')
+        self.assertEqual(r.data[0]['schedule']['completion_weeks'], 12.5)
+        self.assertEqual(r.data[0]['schedule']['critical_path'][-1], self.milestones[-1].id)
+        self.assertEqual(len(r.data[0]['schedule']['milestones']), 6)
+
+    def test_summary_reads_counters_without_queries(self):
+        self._patch(self.milestones[0], 'completed')
+        roadmap = PersonalizedRoadmap.objects.get(id=self.roadmap.id)
+        with self.assertNumQueries(0):
+            summary = PersonalizedRoadmapSerializer().get_milestone_summary(roadmap)
+        self.assertEqual(summary['completed'], 1)
+        self.assertEqual(summary['completion_rate'], round(100 / 6, 1))
+
+    def test_readiness_uses_categories_in_one_query(self):
+        url = f'/recommendations/roadmap/{self.roadmap.id}/job-readiness/'
+        r = self.client.get(url)
+        self.assertEqual(r.data['breakdown']['project_portfolio']['score'], 0)
+        with self.assertNumQueries(2):  # roadmap, readiness aggregate
+            self.client.get(url)
+
+        projects = [m for m in self.milestones if m.category == 'project']
+        self.assertEqual([m.title for m in projects], ['Build Portfolio Project #1', 'Build Portfolio Project #2'])
+        self._patch(projects[0], 'completed')
+        r = self.client.get(url)
+        self.assertEqual(r.data['breakdown']['project_portfolio']['score'], 50.0)
+        self.assertEqual(r.data['job_readiness_score'], 15)
+        # The stored score other views read matches the breakdown
+        self.assertEqual(PersonalizedRoadmap.objects.get(id=self.roadmap.id).job_readiness_score, 15)
+
+    def test_readiness_follows_a_regenerated_skill_gap(self):
+        SkillGapAnalysis.objects.filter(roadmap=self.roadmap).update(skill_match_percentage=50)
+        self.assertEqual(job_readiness(self.roadmap)['parts']['skills'], 50)
+
+    def test_readiness_callers_cannot_corrupt_the_memoised_value(self):
+        readiness = job_readiness(self.roadmap)
+        readiness['parts']['project'] = 100
+        readiness['request_only'] = True
+        self.assertEqual(job_readiness(self.roadmap), {'score': readiness['score'], 'parts': {
+            **readiness['parts'], 'project': 0.0,
+        }})
+
+
+class PersonalizedRoadmapListTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='gus', password='Str0ngP@ss!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        skills = [Skill.objects.create(name=f'Skill {i}', category='General') for i in range(6)]
+        self.careers = []
+        for i in range(3):
+            career = CareerPath.objects.create(title=f'Career {i}')
+            career.required_skills.set(skills[:2 * (i + 1)])
+            self.careers.append(career)
+
+    def _get(self, query=''):
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get(f'/recommendations/personalized-roadmap/{query}')
+        self.assertEqual(r.status_code, 200)
+        return r, len(ctx.captured_queries)
+
+    def test_full_tree_query_count_is_independent_of_size(self):
+        generate_personalized_roadmap(self.user, self.careers[0].id)
+        _, one = self._get()
+        for career in self.careers[1:]:
+            generate_personalized_roadmap(self.user, career.id)
+        r, three = self._get()
+        self.assertEqual(one, three)
+        self.assertEqual(len(r.data), 3)
+        self.assertEqual(len(r.data[0]['milestones'][0]['resources']), 3)
+        self.assertIn('skill_gap_analysis', r.data[0])
+
+    def test_sparse_fieldsets(self):
+        generate_personalized_roadmap(self.user, self.careers[0].id)
+        r, queries = self._get('?fields=id,title,milestone_summary')
+        self.assertEqual(set(r.data[0]), {'id', 'title', 'milestone_summary'})
+        self.assertEqual(queries, 1)
+
+        r, _ = self._get('?expand=skill_gap_analysis')
+        self.assertIn('skill_gap_analysis', r.data[0])
+        self.assertIn('overall_progress_percentage', r.data[0])
+        self.assertNotIn('milestones', r.data[0])
+
+
+class ProgressSeriesTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='hal', password='Str0ngP@ss!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        career = CareerPath.objects.create(title='Tester')
+        self.roadmap = generate_personalized_roadmap(self.user, career.id)
+        self.now = timezone.now()
+        # Two points every six hours for 60 days, oldest first
+        ProgressPoint.objects.bulk_create([
+            ProgressPoint(roadmap=self.roadmap, bucket_start=self.now - timedelta(hours=6 * i),
+                          progress_percentage=float(240 - i), completed_milestones=1, total_milestones=5)
+            for i in range(240, 0, -1)
+        ])
+
+    def test_rollup_compacts_old_points_and_is_idempotent(self):
+        stats = rollup_progress(now=self.now, raw_retention_days=7, daily_retention_days=30)
+        self.assertGreater(stats['raw_compacted'], 0)
+        points = ProgressPoint.objects.filter(roadmap=self.roadmap)
+        self.assertTrue(points.filter(resolution='week').exists())
+        self.assertLessEqual(points.filter(resolution='raw').count(), 8 * 4)
+        self.assertEqual(sum(points.values_list('samples', flat=True)), 240)
+        self.assertEqual(points.order_by('-bucket_start').first().progress_percentage, 239.0)
+
+        before = list(points.order_by('bucket_start').values_list('resolution', 'bucket_start', 'samples'))
+        rollup_progress(now=self.now, raw_retention_days=7, daily_retention_days=30)
+        self.assertEqual(list(points.order_by('bucket_start').values_list('resolution', 'bucket_start', 'samples')),
+                         before)
+
+    def test_range_api_returns_bounded_series(self):
+        url = f'/recommendations/roadmap/{self.roadmap.id}/progress/'
+        r = self.client.get(url, {'max_points': 50})
+        self.assertEqual(r.status_code, 200)
+        self.assertLessEqual(len(r.data['points']), 50)
+        self.assertEqual(r.data['points'][-1]['progress_percentage'], 239.0)
+
+        start = (self.now - timedelta(days=10)).date().isoformat()
+        r = self.client.get(url, {'start': start, 'resolution': 'day'})
+        self.assertIn(len(r.data['points']), (10, 11))
+        self.assertEqual(r.data['bucket_seconds'], 86400)
+        self.assertEqual(self.client.get(url, {'resolution': 'hour'}).status_code, 400)
+
+        r = self.client.get('/recommendations/personalized-roadmap/', {'expand': 'progress_snapshots'})
+        snapshots = r.data[0]['progress_snapshots']
+        self.assertEqual(len(snapshots), PersonalizedRoadmapSerializer.INLINE_PROGRESS_POINTS)
+        # Same keys the CareerProgressTracker snapshots were served with
+        self.assertEqual(set(snapshots[0]), set(CareerProgressTrackerSerializer().fields))
+        self.assertEqual(snapshots[0]['progress_percentage'], 239.0)
+
+    def test_range_reads_are_bounded_by_buckets_not_stored_points(self):
+        url = f'/recommendations/roadmap/{self.roadmap.id}/progress/'
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get(url, {'max_points': 10})
+        self.assertEqual([p['progress_percentage'] for p in r.data['points']][-1], 239.0)
+        self.assertLessEqual(len(r.data['points']), 10)
+        self.assertEqual(r.data['bucket_seconds'], 7 * 86400)
+        # Aggregate, then one row per week; the 240 stored points are never fetched
+        with self.assertNumQueries(2):
+            progress_series(self.roadmap, max_points=10)
+        self.assertIn('GROUP BY', ctx.captured_queries[-1]['sql'])
@@ -6,7 +6,8 @@ from rest_framework.decorators import api_view, permission_classes
 from django.db.models import Count, Q, Sum
 from django.db import models
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, time, timedelta
+from django.utils.dateparse import parse_date, parse_datetime
 from .models import (
     CareerPath, CareerRecommendation, RoadmapStep, ProjectRecommendation,
     PersonalizedRoadmap, RoadmapMilestone, LearningResource, SkillGapAnalysis, CareerProgressTracker
@@ -16,10 +17,18 @@ from .serializers import (
     PersonalizedRoadmapSerializer, RoadmapMilestoneSerializer, LearningResourceSerializer, SkillGapAnalysisSerializer
 )
 from skills.models import UserSkill, Skill
-from ml.recommender import score_career_paths
-from ml.career_model import CareerRecommendationModel
+from ml.career_model import get_career_model
+from ml.collaborative import suggest_peer_careers
+from .catalog import get_catalog
+from .progress import progress_series, record_progress
+from .response_cache import ResponseCache, cache_key
+from .services import (
+    ensure_project_recommendations, ensure_user_recommendations, generate_personalized_roadmap,
+    get_user_baseline, job_readiness, sync_roadmap_steps, update_milestone_status
+)
 from accounts.permissions import IsAdminOrReadOnly
 import json
+import numpy as np
 
 
 # Create your views here.
@@ -40,24 +49,47 @@ class CareerPathDetailView(generics.RetrieveUpdateDestroyAPIView):
 class RecommendationListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    MAX_LIMIT = 100
+
     def get(self, request):
         user = request.user
-        user_skill_levels = {us.skill_id: us.level for us in UserSkill.objects.filter(user=user).only('skill_id', 'level')}
-        mapping = {cp.id: list(cp.required_skills.values_list('id', flat=True)) for cp in CareerPath.objects.all()}
-
-        scored = score_career_paths(user_skill_levels, mapping)
+        limit = request.query_params.get('limit')
+        if limit is not None:
+            try:
+                limit = min(int(limit), self.MAX_LIMIT)
+                if limit < 1:
+                    raise ValueError
+            except ValueError:
+                return Response({'error': 'limit must be a positive integer'}, status=status.HTTP_400_BAD_REQUEST)
 
-        CareerRecommendation.objects.filter(user=user).delete()
-        CareerRecommendation.objects.bulk_create([
-            CareerRecommendation(user=user, career_path_id=cid, score=score)
-            for cid, score in scored if score > 0
-        ])
+        # Recompute only when the user's skills or the catalog changed since the last sync
+        ensure_user_recommendations(user)
 
-        queryset = CareerRecommendation.objects.filter(user=user).select_related('career_path').order_by('-score')
+        queryset = (
+            CareerRecommendation.objects.filter(user=user)
+            .select_related('career_path')
+            .prefetch_related('career_path__required_skills')
+            .order_by('-score')
+        )
+        if limit is not None:
+            # Served by the (user, -score) index, so only the top rows are read
+            queryset = queryset[:limit]
         data = CareerRecommendationSerializer(queryset, many=True).data
         return Response(data)
 
 
+class PeerCareerView(APIView):
+    """Careers pursued by users with similar skill profiles ("users like you")"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 5)), 1), 20)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(suggest_peer_careers(request.user, limit=limit))
+
+
 class RoadmapGenerateView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -66,49 +98,36 @@ class RoadmapGenerateView(APIView):
         career_path_id = request.data.get('career_path_id')
         if not career_path_id:
             return Response({'detail': 'career_path_id required'}, status=400)
-        # naive generator: one step per required skill if user level < 80
-        RoadmapStep.objects.filter(user=user, career_path_id=career_path_id).delete()
-        req_skill_ids = list(CareerPath.objects.get(id=career_path_id).required_skills.values_list('id', flat=True))
-        user_levels = {us.skill_id: us.level for us in UserSkill.objects.filter(user=user, skill_id__in=req_skill_ids)}
-        steps = []
-        order = 1
-        for sid in req_skill_ids:
-            level = user_levels.get(sid, 0)
-            if level < 80:
-                steps.append(RoadmapStep(
-                    user=user,
-                    career_path_id=career_path_id,
-                    skill_id=sid,
-                    title=f"Improve {sid} to 80+",
-                    description="Follow curated resources to reach proficiency.",
-                    order=order,
-                    estimated_hours=10,
-                    resource_url="https://roadmap.sh/"
-                ))
-                order += 1
-        if steps:
-            RoadmapStep.objects.bulk_create(steps)
-        data = RoadmapStepSerializer(RoadmapStep.objects.filter(user=user, career_path_id=career_path_id), many=True).data
-        return Response(data)
+        try:
+            career_path_id = int(career_path_id)
+        except (TypeError, ValueError):
+            return Response({'detail': 'career_path_id must be an integer'}, status=400)
+        catalog = get_catalog()
+        if career_path_id not in catalog:
+            return Response({'detail': 'Career path not found'}, status=404)
+        steps = sync_roadmap_steps(user, career_path_id, catalog)
+        return Response(RoadmapStepSerializer(steps, many=True).data)
 
 
 class ProjectRecommendationView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        user = request.user
-        top = CareerRecommendation.objects.filter(user=user).order_by('-score').first()
-        if not top:
-            return Response([])
-        ProjectRecommendation.objects.filter(user=user, career_path=top.career_path).delete()
-        samples = [
-            (f"Build a {top.career_path.title} demo", "Create a small app featuring core skills", 'intermediate'),
-            ("Capstone portfolio project", "End-to-end project with docs and tests", 'advanced'),
-        ]
-        created = [ProjectRecommendation(user=user, career_path=top.career_path, title=t, description=d, difficulty=diff) for t, d, diff in samples]
-        ProjectRecommendation.objects.bulk_create(created)
-        data = ProjectRecommendationSerializer(ProjectRecommendation.objects.filter(user=user, career_path=top.career_path), many=True).data
-        return Response(data)
+        projects = ensure_project_recommendations(request.user)
+        return Response(ProjectRecommendationSerializer(projects, many=True).data)
+
+
+def _parse_adjustments(adjustments):
+    """Coerce a {skill_id: level} mapping from request data, skipping malformed entries"""
+    parsed = {}
+    if not isinstance(adjustments, dict):
+        return parsed
+    for sid, lvl in adjustments.items():
+        try:
+            parsed[int(sid)] = int(lvl)
+        except Exception:
+            continue
+    return parsed
 
 
 class SimulationView(APIView):
@@ -116,20 +135,80 @@ class SimulationView(APIView):
 
     def post(self, request):
         # what-if: take provided skill adjustments and rescore
-        user = request.user
-        adjustments = request.data.get('adjustments', {})  # {skill_id: level}
-        user_skill_levels = {us.skill_id: us.level for us in UserSkill.objects.filter(user=user).only('skill_id', 'level')}
-        for sid, lvl in adjustments.items():
-            try:
-                sid_int = int(sid)
-                user_skill_levels[sid_int] = int(lvl)
-            except Exception:
-                continue
-        mapping = {cp.id: list(cp.required_skills.values_list('id', flat=True)) for cp in CareerPath.objects.all()}
-        scored = score_career_paths(user_skill_levels, mapping)
+        adjustments = _parse_adjustments(request.data.get('adjustments', {}))  # {skill_id: level}
+        try:
+            limit = int(request.data['limit']) if request.data.get('limit') is not None else None
+        except (TypeError, ValueError):
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Only careers requiring an adjusted skill are rescored against the cached baseline
+        catalog = get_catalog()
+        baseline = get_user_baseline(request.user, catalog)
+        scored = catalog.engine.score_with_adjustments(baseline, adjustments, limit=limit)
         return Response([{ 'career_path_id': cid, 'score': score } for cid, score in scored])
 
 
+class BatchSimulationView(APIView):
+    """Score many what-if scenarios in one round trip, with deltas against the user's baseline"""
+    permission_classes = [permissions.IsAuthenticated]
+    MAX_SCENARIOS = 100
+    MAX_TOP_K = 50
+
+    def post(self, request):
+        scenarios = request.data.get('scenarios')
+        if not isinstance(scenarios, list) or not scenarios:
+            return Response({'error': 'scenarios must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(scenarios) > self.MAX_SCENARIOS:
+            return Response(
+                {'error': f'At most {self.MAX_SCENARIOS} scenarios per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            top_k = min(max(int(request.data.get('top_k', 5)), 1), self.MAX_TOP_K)
+        except (TypeError, ValueError):
+            return Response({'error': 'top_k must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Each scenario is either {skill_id: level} or {'adjustments': {skill_id: level}}
+        parsed = [
+            _parse_adjustments(s.get('adjustments', {}) if isinstance(s, dict) and 'adjustments' in s else s)
+            for s in scenarios
+        ]
+        catalog = get_catalog()
+        engine = catalog.engine
+        user_skill_levels = get_user_baseline(request.user, catalog).levels
+        baseline, scenario_scores = engine.score_scenarios(user_skill_levels, parsed)
+        baseline_rounded = np.round(baseline, 2)
+        id_to_index = {int(cid): i for i, cid in enumerate(engine.career_ids)}
+
+        results = []
+        for i, scores in enumerate(scenario_scores):
+            top = engine.rank(scores, limit=top_k)
+            results.append({
+                'index': i,
+                'adjustments': parsed[i],
+                'top': [
+                    {
+                        'career_path_id': cid,
+                        'score': score,
+                        'delta': round(score - float(baseline_rounded[id_to_index[cid]]), 2),
+                    }
+                    for cid, score in top
+                ],
+            })
+
+        return Response({
+            'baseline': [{'career_path_id': cid, 'score': score} for cid, score in engine.rank(baseline, limit=top_k)],
+            'scenarios': results,
+        })
+
+
+# Roadmap payloads are pure functions of the profile skills, inputs and model version;
+# only successful (200) payloads are cached, error bodies are recomputed on every request
+roadmap_response_cache = ResponseCache(
+    'career_roadmap', ttl=300, stale_ttl=3600, cacheable=lambda payload: 'error' not in payload,
+)
+
+
 class CareerRoadmapView(APIView):
     """Enhanced career roadmap endpoint using ML recommendations"""
     permission_classes = [permissions.IsAuthenticated]
@@ -150,26 +229,35 @@ class CareerRoadmapView(APIView):
         if hasattr(user, 'profile') and user.profile.skills_json:
             user_skills = {skill['name']: skill['level'] for skill in user.profile.skills_json}
         
-        # Use ML model for recommendations
-        career_model = CareerRecommendationModel()
-        roadmap = career_model.generate_learning_roadmap(user_skills, target_career)
+        # Shared catalog-backed model; fitted once per process, refitted in the background
+        career_model = get_career_model()
+        key = cache_key(sorted(user_skills.items()), target_career, user_interests, career_model.fingerprint)
+        payload, cache_status = roadmap_response_cache.get(
+            key, lambda: self._build_payload(career_model, user_skills, target_career, user_interests)
+        )
         
+        response = Response(payload, status=status.HTTP_404_NOT_FOUND if 'error' in payload else status.HTTP_200_OK)
+        response['X-Cache'] = cache_status
+        return response
+    
+    def _build_payload(self, career_model, user_skills, target_career, user_interests):
+        roadmap = career_model.generate_learning_roadmap(user_skills, target_career)
         if 'error' in roadmap:
-            return Response(roadmap, status=status.HTTP_404_NOT_FOUND)
+            return roadmap
         
-        # Also get general career recommendations
-        recommendations = career_model.recommend_careers(user_skills, user_interests)
+        # Alternatives come from the precomputed career similarity index (O(k) per request)
+        alternatives = career_model.similar_careers(user_skills, target_career, user_interests, limit=5)
         
-        return Response({
+        return {
             'roadmap': roadmap,
-            'alternative_careers': recommendations[:5],
+            'alternative_careers': alternatives,
             'user_skills_count': len(user_skills),
             'recommendations': {
                 'next_steps': self._generate_next_steps(roadmap),
                 'resources': self._get_learning_resources(),
                 'timeline': self._estimate_timeline(roadmap)
             }
-        })
+        }
     
     def _generate_next_steps(self, roadmap):
         """Generate actionable next steps"""
@@ -227,14 +315,26 @@ class CareerRoadmapView(APIView):
         }
 
 
+def _csv_param(request, name):
+    """Comma-separated query parameter as a list, or None when absent"""
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
 class PersonalizedRoadmapView(APIView):
     """Create and manage personalized roadmaps"""
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request):
-        """Get user's existing roadmaps"""
-        roadmaps = PersonalizedRoadmap.objects.filter(user=request.user, is_active=True)
-        serializer = PersonalizedRoadmapSerializer(roadmaps, many=True)
+        """Get user's existing roadmaps; ?fields= and ?expand= trim the tree (e.g. headers only)"""
+        fields = _csv_param(request, 'fields')
+        expand = _csv_param(request, 'expand')
+        roadmaps = PersonalizedRoadmapSerializer.prefetch(
+            PersonalizedRoadmap.objects.filter(user=request.user, is_active=True), fields, expand
+        )
+        serializer = PersonalizedRoadmapSerializer(roadmaps, many=True, fields=fields, expand=expand)
         return Response(serializer.data)
     
     def post(self, request):
@@ -244,7 +344,6 @@ class PersonalizedRoadmapView(APIView):
         # Extract user inputs
         target_career_id = data.get('target_career_id')
         learning_style = data.get('learning_style', 'mixed')
-        hours_per_week = data.get('hours_per_week', 10)
         current_skills = data.get('current_skills', {})
         
         if not target_career_id:
@@ -252,237 +351,32 @@ class PersonalizedRoadmapView(APIView):
                 {'error': 'target_career_id is required'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
         try:
-            target_career = CareerPath.objects.get(id=target_career_id)
-        except CareerPath.DoesNotExist:
+            target_career_id = int(target_career_id)
+            hours_per_week = int(data.get('hours_per_week', 10))
+        except (TypeError, ValueError):
             return Response(
-                {'error': 'Career path not found'}, 
-                status=status.HTTP_404_NOT_FOUND
+                {'error': 'target_career_id and hours_per_week must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
             )
+        if hours_per_week < 1:
+            return Response({'error': 'hours_per_week must be at least 1'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Check if user already has a roadmap for this career
-        existing_roadmap = PersonalizedRoadmap.objects.filter(
-            user=request.user, 
-            target_career=target_career, 
-            is_active=True
-        ).first()
-        
-        if existing_roadmap:
-            # Update existing roadmap
-            existing_roadmap.learning_style = learning_style
-            existing_roadmap.hours_per_week = hours_per_week
-            existing_roadmap.save()
-            roadmap = existing_roadmap
-        else:
-            # Create new roadmap
-            roadmap = PersonalizedRoadmap.objects.create(
-                user=request.user,
-                target_career=target_career,
-                title=f"Path to {target_career.title}",
-                learning_style=learning_style,
-                hours_per_week=hours_per_week
+        catalog = get_catalog()
+        if target_career_id not in catalog:
+            return Response(
+                {'error': 'Career path not found'}, 
+                status=status.HTTP_404_NOT_FOUND
             )
         
-        # Generate skill gap analysis
-        self._generate_skill_gap_analysis(roadmap, current_skills)
-        
-        # Generate milestones
-        self._generate_roadmap_milestones(roadmap, current_skills)
-        
-        # Calculate estimated completion time
-        self._calculate_timeline(roadmap)
+        # Skill gap, milestones, resources and timeline are written in one transaction
+        roadmap = generate_personalized_roadmap(
+            request.user, target_career_id, learning_style, hours_per_week, current_skills, catalog
+        )
         
+        roadmap = PersonalizedRoadmapSerializer.prefetch(PersonalizedRoadmap.objects.filter(id=roadmap.id)).get()
         serializer = PersonalizedRoadmapSerializer(roadmap)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
-    
-    def _generate_skill_gap_analysis(self, roadmap, current_skills):
-        """Generate comprehensive skill gap analysis"""
-        required_skills = {}
-        for skill in roadmap.target_career.required_skills.all():
-            required_skills[skill.name] = 80  # Assume 80 is proficient level
-        
-        missing_skills = []
-        weak_skills = []
-        strong_skills = []
-        
-        for skill_name, required_level in required_skills.items():
-            current_level = current_skills.get(skill_name, 0)
-            
-            if current_level == 0:
-                missing_skills.append(skill_name)
-            elif current_level < required_level:
-                weak_skills.append({
-                    'skill': skill_name,
-                    'current_level': current_level,
-                    'required_level': required_level,
-                    'gap': required_level - current_level
-                })
-            else:
-                strong_skills.append({
-                    'skill': skill_name,
-                    'current_level': current_level,
-                    'required_level': required_level
-                })
-        
-        # Calculate skill match percentage
-        total_skills = len(required_skills)
-        matched_skills = len(strong_skills) + len([s for s in weak_skills if s['current_level'] >= s['required_level'] * 0.7])
-        skill_match_percentage = (matched_skills / total_skills * 100) if total_skills > 0 else 0
-        
-        # Create or update skill gap analysis
-        SkillGapAnalysis.objects.update_or_create(
-            roadmap=roadmap,
-            defaults={
-                'current_skills': current_skills,
-                'required_skills': required_skills,
-                'missing_skills': missing_skills,
-                'weak_skills': weak_skills,
-                'strong_skills': strong_skills,
-                'skill_match_percentage': skill_match_percentage
-            }
-        )
-    
-    def _generate_roadmap_milestones(self, roadmap, current_skills):
-        """Generate comprehensive roadmap milestones"""
-        # Clear existing milestones
-        roadmap.milestones.all().delete()
-        
-        # Get skill gap analysis
-        skill_gap = roadmap.skill_gap_analysis
-        
-        milestones = []
-        order_foundation = 1
-        order_intermediate = 1
-        order_advanced = 1
-        
-        # Foundation Phase: Missing skills
-        for skill_name in skill_gap.missing_skills:
-            milestone = RoadmapMilestone(
-                roadmap=roadmap,
-                title=f"Learn {skill_name} Fundamentals",
-                description=f"Start learning {skill_name} from scratch. Focus on basic concepts and hands-on practice.",
-                phase='Foundation',
-                order_in_phase=order_foundation,
-                estimated_hours=20,
-                estimated_weeks=3,
-                priority='high' if order_foundation <= 3 else 'medium'
-            )
-            milestones.append(milestone)
-            order_foundation += 1
-        
-        # Intermediate Phase: Weak skills
-        for skill_info in skill_gap.weak_skills:
-            milestone = RoadmapMilestone(
-                roadmap=roadmap,
-                title=f"Master {skill_info['skill']}",
-                description=f"Improve your {skill_info['skill']} skills from level {skill_info['current_level']} to {skill_info['required_level']}.",
-                phase='Intermediate',
-                order_in_phase=order_intermediate,
-                estimated_hours=15,
-                estimated_weeks=2,
-                priority='medium'
-            )
-            milestones.append(milestone)
-            order_intermediate += 1
-        
-        # Advanced Phase: Specialization and Projects
-        advanced_milestones = [
-            {
-                'title': 'Build Portfolio Project #1',
-                'description': 'Create a comprehensive project showcasing your newly acquired skills.',
-                'hours': 25,
-                'weeks': 4
-            },
-            {
-                'title': 'Gain Industry Certification',
-                'description': 'Obtain a relevant certification to validate your skills.',
-                'hours': 30,
-                'weeks': 6
-            },
-            {
-                'title': 'Build Portfolio Project #2',
-                'description': 'Create an advanced project demonstrating mastery of the tech stack.',
-                'hours': 35,
-                'weeks': 5
-            },
-            {
-                'title': 'Practice Technical Interviews',
-                'description': 'Prepare for job interviews with coding challenges and system design.',
-                'hours': 20,
-                'weeks': 4
-            },
-            {
-                'title': 'Network and Apply for Jobs',
-                'description': 'Build professional network and start applying for positions.',
-                'hours': 15,
-                'weeks': 8
-            }
-        ]
-        
-        for adv_milestone in advanced_milestones:
-            milestone = RoadmapMilestone(
-                roadmap=roadmap,
-                title=adv_milestone['title'],
-                description=adv_milestone['description'],
-                phase='Advanced',
-                order_in_phase=order_advanced,
-                estimated_hours=adv_milestone['hours'],
-                estimated_weeks=adv_milestone['weeks'],
-                priority='medium'
-            )
-            milestones.append(milestone)
-            order_advanced += 1
-        
-        # Bulk create milestones
-        RoadmapMilestone.objects.bulk_create(milestones)
-        
-        # Add learning resources to milestones
-        self._add_learning_resources(roadmap)
-    
-    def _add_learning_resources(self, roadmap):
-        """Add learning resources to milestones"""
-        milestones = roadmap.milestones.all()
-        
-        # Resource templates based on learning style
-        resource_templates = {
-            'self_paced': [
-                {'title': 'Coursera Course', 'type': 'course', 'provider': 'Coursera', 'cost': 'paid'},
-                {'title': 'Free Tutorial Series', 'type': 'tutorial', 'provider': 'YouTube', 'cost': 'free'},
-                {'title': 'Documentation', 'type': 'documentation', 'provider': 'Official Docs', 'cost': 'free'}
-            ],
-            'bootcamp': [
-                {'title': 'Bootcamp Program', 'type': 'bootcamp', 'provider': 'Various', 'cost': 'paid'},
-                {'title': 'Intensive Workshop', 'type': 'course', 'provider': 'Udemy', 'cost': 'paid'}
-            ],
-            'certification': [
-                {'title': 'Official Certification', 'type': 'certification', 'provider': 'Industry Standard', 'cost': 'paid'},
-                {'title': 'Practice Tests', 'type': 'practice', 'provider': 'Practice Platform', 'cost': 'freemium'}
-            ]
-        }
-        
-        style_resources = resource_templates.get(roadmap.learning_style, resource_templates['self_paced'])
-        
-        for milestone in milestones:
-            for resource_template in style_resources:
-                LearningResource.objects.create(
-                    milestone=milestone,
-                    title=f"{resource_template['title']} for {milestone.title}",
-                    resource_type=resource_template['type'],
-                    provider=resource_template['provider'],
-                    cost_type=resource_template['cost'],
-                    difficulty_level='beginner' if milestone.phase == 'Foundation' else 'intermediate',
-                    is_recommended=True
-                )
-    
-    def _calculate_timeline(self, roadmap):
-        """Calculate estimated completion timeline"""
-        total_hours = roadmap.milestones.aggregate(total=models.Sum('estimated_hours'))['total'] or 0
-        estimated_weeks = total_hours / roadmap.hours_per_week
-        
-        roadmap.estimated_completion_weeks = int(estimated_weeks)
-        roadmap.target_completion_date = timezone.now() + timedelta(weeks=estimated_weeks)
-        roadmap.save()
 
 
 class RoadmapMilestoneView(APIView):
@@ -508,40 +402,66 @@ class RoadmapMilestoneView(APIView):
         except (PersonalizedRoadmap.DoesNotExist, RoadmapMilestone.DoesNotExist):
             return Response({'error': 'Milestone not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        # Update milestone
+        # Update milestone status; roadmap counters and progress move with it
         status_update = request.data.get('status')
-        if status_update in ['pending', 'in_progress', 'completed', 'skipped']:
-            milestone.status = status_update
-            
-            if status_update == 'completed':
-                milestone.completion_date = timezone.now()
-            elif status_update == 'in_progress':
-                milestone.start_date = timezone.now()
-            
-            milestone.save()
-            
-            # Update roadmap progress
-            roadmap.update_progress()
-            
-            # Create progress snapshot
-            CareerProgressTracker.objects.create(
-                roadmap=roadmap,
-                completed_milestones=roadmap.milestones.filter(status='completed').count(),
-                total_milestones=roadmap.milestones.count(),
-                progress_percentage=roadmap.overall_progress_percentage,
-                job_readiness_score=roadmap.job_readiness_score
-            )
+        if status_update in PersonalizedRoadmap.STATUS_COUNTER_FIELDS:
+            if update_milestone_status(roadmap, milestone, status_update):
+                # Append a point to the progress time series
+                record_progress(roadmap)
         
         # Add user notes if provided
         user_notes = request.data.get('user_notes')
         if user_notes:
             milestone.user_notes = user_notes
-            milestone.save()
+            milestone.save(update_fields=['user_notes'])
         
         serializer = RoadmapMilestoneSerializer(milestone)
         return Response(serializer.data)
 
 
+class RoadmapProgressView(APIView):
+    """Downsampled progress time series for charts"""
+    permission_classes = [permissions.IsAuthenticated]
+    RESOLUTIONS = ('auto', 'day', 'week')
+    
+    def get(self, request, roadmap_id):
+        try:
+            roadmap = PersonalizedRoadmap.objects.get(id=roadmap_id, user=request.user)
+        except PersonalizedRoadmap.DoesNotExist:
+            return Response({'error': 'Roadmap not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        params = request.query_params
+        resolution = params.get('resolution', 'auto')
+        if resolution not in self.RESOLUTIONS:
+            return Response(
+                {'error': f"resolution must be one of {', '.join(self.RESOLUTIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            max_points = int(params.get('max_points', 200))
+            start = _parse_moment(params.get('start'))
+            end = _parse_moment(params.get('end'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(progress_series(roadmap, start, end, resolution, max_points))
+
+
+def _parse_moment(value):
+    """ISO date or datetime query parameter as an aware datetime; None when absent"""
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Invalid date: {value}')
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
 class JobReadinessScoreView(APIView):
     """Calculate and return job readiness score"""
     permission_classes = [permissions.IsAuthenticated]
@@ -553,40 +473,13 @@ class JobReadinessScoreView(APIView):
         except PersonalizedRoadmap.DoesNotExist:
             return Response({'error': 'Roadmap not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        # Calculate detailed job readiness breakdown
-        milestones = roadmap.milestones.all()
-        completed_milestones = milestones.filter(status='completed')
-        
-        # Skills assessment (40% of score)
-        skill_gap = getattr(roadmap, 'skill_gap_analysis', None)
-        skills_score = skill_gap.skill_match_percentage if skill_gap else 0
-        
-        # Project completion (30% of score)
-        project_milestones = milestones.filter(title__icontains='project')
-        project_completion = (project_milestones.filter(status='completed').count() / 
-                            max(project_milestones.count(), 1)) * 100
-        
-        # Certification (20% of score)
-        cert_milestones = milestones.filter(title__icontains='certification')
-        cert_completion = (cert_milestones.filter(status='completed').count() / 
-                         max(cert_milestones.count(), 1)) * 100
-        
-        # Interview prep (10% of score)
-        interview_milestones = milestones.filter(title__icontains='interview')
-        interview_completion = (interview_milestones.filter(status='completed').count() / 
-                              max(interview_milestones.count(), 1)) * 100
-        
-        # Calculate weighted score
-        job_readiness_score = (
-            skills_score * 0.4 + 
-            project_completion * 0.3 + 
-            cert_completion * 0.2 + 
-            interview_completion * 0.1
-        )
-        
-        # Update roadmap score
-        roadmap.job_readiness_score = int(job_readiness_score)
-        roadmap.save()
+        # One conditional aggregate query; GET never writes
+        readiness = job_readiness(roadmap)
+        job_readiness_score = readiness['score']
+        skills_score = readiness['parts']['skills']
+        project_completion = readiness['parts']['project']
+        cert_completion = readiness['parts']['certification']
+        interview_completion = readiness['parts']['interview']
         
         return Response({
             'job_readiness_score': int(job_readiness_score),
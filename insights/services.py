@@ -4,10 +4,15 @@ from typing import Dict, List, Any, Optional
 import json
 from urllib.parse import urlencode
 
+from ml.matcher import KeywordMatcher
+
 
 class JobInsightsService:
     """Service for fetching job market data from external APIs"""
     
+    # Skill keyword matcher, compiled on first use and shared by every instance
+    _skills_matcher = None
+    
     def __init__(self):
         self.adzuna_api_id = os.getenv('ADZUNA_API_ID')
         self.adzuna_api_key = os.getenv('ADZUNA_API_KEY')
@@ -260,22 +265,20 @@ class JobInsightsService:
         if not description:
             return []
         
-        description_lower = description.lower()
-        
         # Common tech skills to look for
-        skills_keywords = {
+        skills_keywords = [
             'Python', 'JavaScript', 'Java', 'React', 'Angular', 'Vue', 'Node.js',
             'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Docker', 'Kubernetes',
             'AWS', 'Azure', 'GCP', 'Git', 'Jenkins', 'CI/CD', 'REST', 'API',
             'HTML', 'CSS', 'TypeScript', 'PHP', 'Ruby', 'Go', 'Rust', 'Swift',
             'Machine Learning', 'AI', 'TensorFlow', 'PyTorch', 'Pandas', 'NumPy',
             'Django', 'Flask', 'Spring', 'Express', 'Laravel', 'Rails'
-        }
+        ]
         
-        found_skills = []
-        for skill in skills_keywords:
-            if skill.lower() in description_lower:
-                found_skills.append(skill)
+        if self._skills_matcher is None:
+            JobInsightsService._skills_matcher = KeywordMatcher(skills_keywords)
+        # Whole-word matches in order of first mention
+        found_skills = list(self._skills_matcher.first_positions(description))
         
         return found_skills[:5]  # Limit to top 5 skills
     
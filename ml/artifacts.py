@@ -0,0 +1,149 @@
+import json
+import os
+import shutil
+from typing import Any, Dict, Optional
+
+import numpy as np
+from scipy import sparse
+
+try:
+    import joblib
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
+
+MANIFEST_FILE = 'manifest.json'
+SPARSE_PARTS = ('data', 'indices', 'indptr')
+
+
+class ArtifactBundle:
+    """
+    A directory of prebuilt model data, opened read-only.
+
+    Arrays (including the parts of sparse matrices) are memory-mapped, so every
+    worker process that opens the same bundle shares one physical copy through
+    the page cache instead of holding its own. Values are loaded lazily and
+    cached on the bundle.
+    """
+
+    def __init__(self, directory: str, manifest: Dict[str, Any]):
+        self.directory = directory
+        self.manifest = manifest
+        self._cache: Dict[str, Any] = {}
+
+    @property
+    def fingerprint(self) -> str:
+        return self.manifest['fingerprint']
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return self.manifest.get('meta', {})
+
+    def array(self, name: str) -> np.ndarray:
+        key = f'array:{name}'
+        if key not in self._cache:
+            self._cache[key] = np.load(os.path.join(self.directory, f'{name}.npy'), mmap_mode='r')
+        return self._cache[key]
+
+    def matrix(self, name: str):
+        key = f'matrix:{name}'
+        if key not in self._cache:
+            spec = self.manifest['matrices'][name]
+            parts = tuple(self.array(f'{name}.{part}') for part in SPARSE_PARTS)
+            cls = sparse.csc_matrix if spec['format'] == 'csc' else sparse.csr_matrix
+            self._cache[key] = cls(parts, shape=tuple(spec['shape']), copy=False)
+        return self._cache[key]
+
+    def object(self, name: str) -> Any:
+        key = f'object:{name}'
+        if key not in self._cache:
+            self._cache[key] = joblib.load(os.path.join(self.directory, f'{name}.joblib'), mmap_mode='r')
+        return self._cache[key]
+
+    def has_object(self, name: str) -> bool:
+        return name in self.manifest.get('objects', [])
+
+
+def bundle_path(root: str, name: str, fingerprint: str) -> str:
+    return os.path.join(root, name, fingerprint)
+
+
+def open_bundle(root: Optional[str], name: str, fingerprint: str) -> Optional[ArtifactBundle]:
+    """Open the ``name`` bundle built for ``fingerprint``; None when it has not been built yet"""
+    if not root:
+        return None
+    directory = bundle_path(root, name, fingerprint)
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE)) as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('fingerprint') != fingerprint:
+        return None
+    return ArtifactBundle(directory, manifest)
+
+
+def write_bundle(root: str, name: str, fingerprint: str,
+                 arrays: Optional[Dict[str, np.ndarray]] = None,
+                 matrices: Optional[Dict[str, Any]] = None,
+                 objects: Optional[Dict[str, Any]] = None,
+                 meta: Optional[Dict[str, Any]] = None,
+                 keep: int = 2) -> str:
+    """
+    Write a bundle to ``<root>/<name>/<fingerprint>`` and return its path.
+
+    Files are written to a private temporary directory that is renamed into place
+    once complete, so readers never see a partial bundle. Bundles are immutable:
+    if one already exists for the fingerprint it is left as is. Only the ``keep``
+    most recent bundles per name are retained; processes still mapping an older one
+    keep their pages until they reopen.
+    """
+    target = bundle_path(root, name, fingerprint)
+    if os.path.exists(os.path.join(target, MANIFEST_FILE)):
+        return target
+
+    parent = os.path.dirname(target)
+    os.makedirs(parent, exist_ok=True)
+    tmp = os.path.join(parent, f'.{fingerprint}.{os.getpid()}.tmp')
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    manifest = {'fingerprint': fingerprint, 'arrays': [], 'matrices': {}, 'objects': [], 'meta': meta or {}}
+    try:
+        for array_name, array in (arrays or {}).items():
+            np.save(os.path.join(tmp, f'{array_name}.npy'), np.ascontiguousarray(array))
+            manifest['arrays'].append(array_name)
+        for matrix_name, matrix in (matrices or {}).items():
+            fmt = 'csc' if sparse.isspmatrix_csc(matrix) else 'csr'
+            matrix = matrix.tocsc() if fmt == 'csc' else matrix.tocsr()
+            for part in SPARSE_PARTS:
+                np.save(os.path.join(tmp, f'{matrix_name}.{part}.npy'), getattr(matrix, part))
+            manifest['matrices'][matrix_name] = {'format': fmt, 'shape': list(matrix.shape)}
+        for object_name, obj in (objects or {}).items():
+            if not JOBLIB_AVAILABLE:
+                break
+            joblib.dump(obj, os.path.join(tmp, f'{object_name}.joblib'))
+            manifest['objects'].append(object_name)
+        with open(os.path.join(tmp, MANIFEST_FILE), 'w') as fh:
+            json.dump(manifest, fh)
+        os.rename(tmp, target)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if os.path.exists(os.path.join(target, MANIFEST_FILE)):
+            # Another process finished the same bundle first
+            return target
+        raise
+
+    _prune(parent, keep)
+    return target
+
+
+def _prune(parent: str, keep: int):
+    bundles = [
+        os.path.join(parent, entry) for entry in os.listdir(parent)
+        if not entry.startswith('.') and os.path.isdir(os.path.join(parent, entry))
+    ]
+    bundles.sort(key=os.path.getmtime, reverse=True)
+    for stale in bundles[keep:]:
+        shutil.rmtree(stale, ignore_errors=True)
@@ -0,0 +1,166 @@
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .scoring import CareerScoringEngine
+
+
+Chunk = Tuple[List[int], np.ndarray, np.ndarray, np.ndarray]
+
+_worker_engine: Optional[CareerScoringEngine] = None
+
+
+def score_chunk(engine: CareerScoringEngine, chunk: Chunk) -> Dict[int, List[Tuple[int, float]]]:
+    """Score a chunk of users in one sparse product; returns positive scores per user"""
+    user_ids, rows, skill_ids, levels = chunk
+    scores = engine.score_users(engine.user_matrix(rows, skill_ids, levels, len(user_ids)))
+    scores.data = np.round(scores.data, 2)
+
+    results = {}
+    for row, user_id in enumerate(user_ids):
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        results[user_id] = [
+            (int(engine.career_ids[col]), float(score))
+            for col, score in zip(scores.indices[start:end], scores.data[start:end])
+        ]
+    return results
+
+
+def iter_user_id_batches(chunk_size: int) -> Iterator[List[int]]:
+    """Ids of users with skills, ascending, in batches of chunk_size (keyset-paginated)"""
+    from skills.models import UserSkill
+
+    last_id = 0
+    while True:
+        user_ids = list(
+            UserSkill.objects.filter(user_id__gt=last_id).order_by('user_id')
+            .values_list('user_id', flat=True).distinct()[:chunk_size]
+        )
+        if not user_ids:
+            return
+        yield user_ids
+        last_id = user_ids[-1]
+
+
+def load_user_skill_chunk(user_ids: List[int]) -> Chunk:
+    """UserSkill rows of the given (ascending) user ids as a chunk for score_chunk"""
+    from skills.models import UserSkill
+
+    positions = {user_id: row for row, user_id in enumerate(user_ids)}
+    queryset = UserSkill.objects.filter(user_id__gte=user_ids[0], user_id__lte=user_ids[-1]).values_list(
+        'user_id', 'skill_id', 'level'
+    )
+    rows: List[int] = []
+    skill_ids: List[int] = []
+    levels: List[int] = []
+    for user_id, skill_id, level in queryset.iterator(chunk_size=max(len(user_ids) * 8, 2000)):
+        # Users that gained their first skill after the batch was listed are left for the next run
+        row = positions.get(user_id)
+        if row is not None:
+            rows.append(row)
+            skill_ids.append(skill_id)
+            levels.append(level)
+    return user_ids, np.array(rows, dtype=np.int64), np.array(skill_ids, dtype=np.int64), np.array(levels)
+
+
+def iter_user_skill_chunks(chunk_size: int) -> Iterator[Chunk]:
+    """UserSkill rows grouped into chunks of chunk_size users"""
+    for user_ids in iter_user_id_batches(chunk_size):
+        yield load_user_skill_chunk(user_ids)
+
+
+def precompute_recommendations(chunk_size: int = 1000, workers: int = 1,
+                               progress: Optional[Callable[[Dict[str, float]], None]] = None) -> Dict[str, float]:
+    """
+    Score every user with skills against the whole catalog and upsert CareerRecommendation.
+
+    Users are read from UserSkill in chunks; each chunk is scored with a single sparse
+    user x skill by skill x career product, either in-process or on a pool of ``workers``
+    processes (at most two chunks per worker are in flight, so memory stays bounded).
+    Database writes always happen in the calling process through
+    ``careers.services.sync_recommendations``, which leaves unchanged scores untouched
+    and marks each user's recommendations as current.
+    """
+    from careers.catalog import get_catalog
+    from careers.models import RecommendationState
+    from careers.services import sync_recommendations
+
+    catalog = get_catalog()
+    engine = catalog.engine
+    stats = {'users': 0, 'created': 0, 'updated': 0, 'deleted': 0}
+    started = time.perf_counter()
+
+    def skills_versions(user_ids: List[int]) -> Dict[int, int]:
+        # Must be read before the users' skills: a skill edit that lands in between then
+        # bumps skills_version past the version stored with the scores, leaving the user stale
+        return dict(
+            RecommendationState.objects.filter(user_id__in=user_ids).values_list('user_id', 'skills_version')
+        )
+
+    def write(results: Dict[int, List[Tuple[int, float]]], versions: Dict[int, int]):
+        counts = sync_recommendations(results, catalog.fingerprint, versions)
+        stats['users'] += len(results)
+        for key, value in counts.items():
+            stats[key] += value
+        if progress:
+            progress(_with_throughput(stats, started))
+
+    batches = iter_user_id_batches(chunk_size)
+    if workers <= 1:
+        for user_ids in batches:
+            versions = skills_versions(user_ids)
+            write(score_chunk(engine, load_user_skill_chunk(user_ids)), versions)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(engine,)) as pool:
+            pending = deque()
+            for user_ids in batches:
+                versions = skills_versions(user_ids)
+                chunk = load_user_skill_chunk(user_ids)
+                pending.append((pool.submit(_score_chunk_in_worker, chunk), versions))
+                if len(pending) >= workers * 2:
+                    future, versions = pending.popleft()
+                    write(future.result(), versions)
+            while pending:
+                future, versions = pending.popleft()
+                write(future.result(), versions)
+
+    return _with_throughput(stats, started)
+
+
+def peak_memory_mb() -> Optional[float]:
+    """Peak resident set size of this process and its finished children, in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak = max(peak, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def _with_throughput(stats: Dict[str, float], started: float) -> Dict[str, float]:
+    elapsed = time.perf_counter() - started
+    return {
+        **stats,
+        'elapsed_seconds': round(elapsed, 3),
+        'users_per_second': round(stats['users'] / elapsed, 1) if elapsed > 0 else 0.0,
+        'peak_memory_mb': peak_memory_mb(),
+    }
+
+
+def _init_worker(engine: CareerScoringEngine):
+    global _worker_engine
+    _worker_engine = engine
+
+
+def _score_chunk_in_worker(chunk: Chunk) -> Dict[int, List[Tuple[int, float]]]:
+    return score_chunk(_worker_engine, chunk)
@@ -1,8 +1,16 @@
+import hashlib
+import heapq
+import logging
 import numpy as np
+from scipy import sparse
 from typing import Dict, List, Tuple, Optional, Any
-from collections import defaultdict
+from collections import Counter, defaultdict
 import json
 
+from .artifacts import open_bundle, write_bundle
+from .registry import ModelRegistry
+from .similarity import CareerSimilarityIndex
+
 # Import ML libraries with fallbacks
 try:
     from sklearn.feature_extraction.text import TfidfVectorizer
@@ -12,17 +20,78 @@ try:
 except ImportError:
     SKLEARN_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
 class CareerRecommendationModel:
     """
     Advanced career recommendation system using machine learning
     for better career path suggestions.
     """
     
-    def __init__(self):
-        self.career_data = self._load_career_data()
+    # CareerPath has no per-skill weights, so a career's skills are ranked by how many
+    # catalog careers require them (shared skills are foundational) and spread over this range
+    SKILL_IMPORTANCE_RANGE = (0.5, 0.95)
+    # Interest similarity adds up to this many points to a career's score
+    INTEREST_BONUS_MAX = 20.0
+    # Alternative careers: share of the blended score that comes from career-to-career similarity
+    SIMILARITY_WEIGHT = 0.5
+    SIMILAR_CAREERS_K = 20
+    ARTIFACT_NAME = 'career_model'
+    
+    def __init__(self, career_data: Optional[Dict[str, Dict[str, Any]]] = None, catalog_version: Optional[int] = None,
+                 artifacts_dir: Optional[str] = None, write_artifacts: bool = False):
+        self.career_data = career_data or self._load_career_data()
+        self.catalog_version = catalog_version
         self.tfidf_vectorizer = TfidfVectorizer() if SKLEARN_AVAILABLE else None
-        self.career_embeddings = {}
-        self._build_embeddings()
+        self.career_names = list(self.career_data.keys())
+        self.career_rows = {name: i for i, name in enumerate(self.career_names)}
+        self.career_embeddings = None  # sparse careers x vocabulary TF-IDF matrix, rows L2-normalised
+        self.similarity_index = None
+        self.fingerprint = self._compute_fingerprint()
+        if not self._load_artifacts(artifacts_dir):
+            self._build_embeddings()
+            self.similarity_index = CareerSimilarityIndex.build(
+                self._skill_matrix(), self.career_embeddings, k=self.SIMILAR_CAREERS_K
+            )
+            if write_artifacts:
+                self.save_artifacts(artifacts_dir)
+    
+    @classmethod
+    def from_catalog(cls, catalog, artifacts_dir: Optional[str] = None,
+                     write_artifacts: bool = False) -> 'CareerRecommendationModel':
+        """Fit the model on a careers.catalog snapshot, falling back to built-in data when it is empty"""
+        demand = Counter(sid for skill_ids in catalog.required_skills.values() for sid in skill_ids)
+        career_data = {}
+        for career_id, info in catalog.careers.items():
+            if info['title'] in career_data:
+                # Careers are addressed by title (unique on CareerPath); should a snapshot
+                # still repeat one, the first (lowest id) career keeps it
+                logger.warning("Skipping career %s: title %r is already used by career %s",
+                               career_id, info['title'], career_data[info['title']]['id'])
+                continue
+            skill_ids = sorted(catalog.required_skills[career_id], key=lambda sid: -demand[sid])
+            skills = [catalog.skills[sid] for sid in skill_ids]
+            categories = Counter(skill['category'] for skill in skills if skill['category'])
+            salaries = [info['entry_level_salary'], info['senior_level_salary'] or info['mid_level_salary']]
+            career_data[info['title']] = {
+                'id': career_id,
+                'skills': [skill['name'] for skill in skills],
+                'importance': cls._ranked_importance(len(skills)),
+                'description': info['description'],
+                'category': categories.most_common(1)[0][0] if categories else 'General',
+                'salary_range': '-'.join(str(s) for s in salaries if s) or 'Not specified',
+                'demand_level': info['demand_level'],
+            }
+        return cls(career_data, catalog_version=catalog.version, artifacts_dir=artifacts_dir,
+                   write_artifacts=write_artifacts)
+    
+    @classmethod
+    def _ranked_importance(cls, count: int) -> List[float]:
+        """Importance for ``count`` skills in rank order, evenly spaced from high to low"""
+        low, high = cls.SKILL_IMPORTANCE_RANGE
+        if count == 1:
+            return [high]
+        return [round(high - (high - low) * rank / (count - 1), 3) for rank in range(count)]
     
     def _load_career_data(self):
         """Load predefined career and skill data"""
@@ -62,59 +131,169 @@ class CareerRecommendationModel:
         if not SKLEARN_AVAILABLE:
             return
             
-        career_documents = []
-        for career, info in self.career_data.items():
-            skills_text = ' '.join(info['skills'])
-            description_text = info['description']
-            combined_text = f"{skills_text} {description_text}"
-            career_documents.append(combined_text)
+        career_documents = [self._career_document(info) for info in self.career_data.values()]
         
         try:
-            career_tfidf_matrix = self.tfidf_vectorizer.fit_transform(career_documents)
-            career_names = list(self.career_data.keys())
-            
-            for i, career in enumerate(career_names):
-                self.career_embeddings[career] = career_tfidf_matrix[i].toarray().flatten()
-        except Exception as e:
-            print(f"Error building embeddings: {e}")
+            self.career_embeddings = self.tfidf_vectorizer.fit_transform(career_documents).tocsr()
+        except Exception:
+            self.career_embeddings = None
+            logger.exception("Error building embeddings")
+    
+    def _career_document(self, career_info: Dict) -> str:
+        skills_text = ' '.join(career_info['skills'])
+        return f"{skills_text} {career_info['description']}"
+    
+    def _compute_fingerprint(self) -> str:
+        """Content hash of everything the fitted artifacts depend on"""
+        digest = hashlib.sha1(f'k={self.SIMILAR_CAREERS_K}'.encode())
+        for name in self.career_names:
+            info = self.career_data[name]
+            digest.update(json.dumps([name, info['skills'], info['importance'], info['description']]).encode())
+        return digest.hexdigest()
+    
+    def _skill_matrix(self) -> sparse.csr_matrix:
+        """Careers x skills matrix weighted by skill importance"""
+        skill_columns: Dict[str, int] = {}
+        rows, cols, weights = [], [], []
+        for row, name in enumerate(self.career_names):
+            info = self.career_data[name]
+            for skill, importance in zip(info['skills'], info['importance']):
+                rows.append(row)
+                cols.append(skill_columns.setdefault(skill, len(skill_columns)))
+                weights.append(importance)
+        return sparse.csr_matrix((weights, (rows, cols)), shape=(len(self.career_names), len(skill_columns)))
+    
+    def _load_artifacts(self, artifacts_dir: Optional[str]) -> bool:
+        """Open prebuilt, memory-mapped artifacts for this catalog content instead of fitting"""
+        bundle = open_bundle(artifacts_dir, self.ARTIFACT_NAME, self.fingerprint)
+        if bundle is None:
+            return False
+        self.similarity_index = CareerSimilarityIndex.from_bundle(bundle)
+        if SKLEARN_AVAILABLE and bundle.has_object('tfidf_vectorizer'):
+            self.tfidf_vectorizer = bundle.object('tfidf_vectorizer')
+            self.career_embeddings = bundle.matrix('career_embeddings')
+        return True
+    
+    def save_artifacts(self, artifacts_dir: Optional[str]) -> Optional[str]:
+        """Persist the fitted matrices so other processes can memory-map them"""
+        if not artifacts_dir:
+            return None
+        matrices, objects = {}, {}
+        if self.career_embeddings is not None:
+            matrices['career_embeddings'] = self.career_embeddings
+            objects['tfidf_vectorizer'] = self.tfidf_vectorizer
+        try:
+            return write_bundle(artifacts_dir, self.ARTIFACT_NAME, self.fingerprint,
+                                arrays=self.similarity_index.arrays(), matrices=matrices, objects=objects,
+                                meta={'careers': len(self.career_names)})
+        except OSError:
+            logger.exception("Error saving career model artifacts")
+            return None
     
     def recommend_careers(self, user_skills: Dict[str, float], 
                          user_interests: List[str] = None) -> List[Dict[str, Any]]:
         """Recommend careers based on user skills and interests"""
-        recommendations = []
+        interest_bonuses = self._calculate_interest_bonuses(user_interests)
         
-        for career_name, career_info in self.career_data.items():
-            score = self._calculate_career_score(user_skills, career_info, user_interests)
-            
+        scored = []
+        for i, career_name in enumerate(self.career_names):
+            career_info = self.career_data[career_name]
+            score = self._calculate_career_score(user_skills, career_info, interest_bonuses[i])
             if score > 0:
-                recommendation = {
-                    'career': career_name,
-                    'score': round(score, 2),
-                    'description': career_info['description'],
-                    'category': career_info['category'],
-                    'salary_range': career_info['salary_range'],
-                    'matching_skills': self._get_matching_skills(user_skills, career_info),
-                    'missing_skills': self._get_missing_skills(user_skills, career_info),
-                    'recommendations': self._generate_career_advice(user_skills, career_info)
-                }
-                recommendations.append(recommendation)
-        
-        return sorted(recommendations, key=lambda x: x['score'], reverse=True)[:10]
+                scored.append((score, career_name))
+        
+        # Details are only built for the careers that make the cut
+        return [
+            self._career_details(user_skills, career_name, score)
+            for score, career_name in heapq.nlargest(10, scored, key=lambda x: x[0])
+        ]
+    
+    def similar_careers(self, user_skills: Dict[str, float], target_career: str,
+                        user_interests: List[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Alternatives to ``target_career``: its precomputed nearest careers, re-ranked by
+        blending similarity with the user's own score for each of them. Only the k
+        neighbours are scored, so the cost does not grow with the catalog. When the
+        target has fewer than ``limit`` similar careers the rest are filled from the
+        user's top recommendations (with similarity 0).
+        """
+        row = self.career_rows.get(target_career)
+        if row is None:
+            return []
+        
+        neighbors = self.similarity_index.neighbors_of(row)
+        interest_bonuses = self._calculate_interest_bonuses(user_interests, [col for col, _ in neighbors])
+        
+        blended = []
+        for (col, similarity), bonus in zip(neighbors, interest_bonuses):
+            career_name = self.career_names[col]
+            user_score = self._calculate_career_score(user_skills, self.career_data[career_name], bonus)
+            score = self.SIMILARITY_WEIGHT * similarity * 100 + (1 - self.SIMILARITY_WEIGHT) * user_score
+            blended.append((score, -col, career_name, similarity))
+        
+        alternatives = []
+        for score, _, career_name, similarity in heapq.nlargest(limit, blended):
+            details = self._career_details(user_skills, career_name, score)
+            details['similarity'] = round(similarity, 4)
+            alternatives.append(details)
+        
+        if len(alternatives) < limit:
+            chosen = {target_career, *(details['career'] for details in alternatives)}
+            for details in self.recommend_careers(user_skills, user_interests):
+                if len(alternatives) >= limit:
+                    break
+                if details['career'] not in chosen:
+                    details['similarity'] = 0.0
+                    alternatives.append(details)
+        return alternatives
+    
+    def _career_details(self, user_skills: Dict[str, float], career_name: str, score: float) -> Dict[str, Any]:
+        career_info = self.career_data[career_name]
+        return {
+            'career': career_name,
+            'score': round(score, 2),
+            'description': career_info['description'],
+            'category': career_info['category'],
+            'salary_range': career_info['salary_range'],
+            'matching_skills': self._get_matching_skills(user_skills, career_info),
+            'missing_skills': self._get_missing_skills(user_skills, career_info),
+            'recommendations': self._generate_career_advice(user_skills, career_info)
+        }
     
     def _calculate_career_score(self, user_skills: Dict[str, float], 
-                              career_info: Dict, user_interests: List[str]) -> float:
+                              career_info: Dict, interest_bonus: float = 0.0) -> float:
         """Calculate compatibility score for a career"""
         skill_score = self._calculate_skill_match_score(user_skills, career_info)
+        return min(skill_score + interest_bonus, 100.0)
+    
+    def _calculate_interest_bonuses(self, user_interests: Optional[List[str]],
+                                    rows: Optional[List[int]] = None) -> np.ndarray:
+        """
+        Interest bonus for every career at once (up to INTEREST_BONUS_MAX points), or
+        only for the career ``rows`` given. The interests are vectorised once and
+        compared to the careers with a single sparse product against the precomputed
+        TF-IDF matrix.
+        """
+        if rows is None:
+            rows = range(len(self.career_names))
+        bonuses = np.zeros(len(rows))
+        if not user_interests:
+            return bonuses
+        if isinstance(user_interests, str):
+            user_interests = [user_interests]
         
-        # Interest bonus (up to 20% boost)
-        interest_bonus = 0
-        if user_interests:
-            career_text = f"{career_info['description']} {' '.join(career_info['skills'])}"
-            for interest in user_interests:
-                if interest.lower() in career_text.lower():
-                    interest_bonus += 5
+        if self.career_embeddings is not None:
+            query = self.tfidf_vectorizer.transform([' '.join(str(i) for i in user_interests)])
+            embeddings = self.career_embeddings if isinstance(rows, range) else self.career_embeddings[rows]
+            similarities = (embeddings @ query.T).toarray().ravel()
+            return similarities * self.INTEREST_BONUS_MAX
         
-        return min(skill_score + interest_bonus, 100.0)
+        # Fallback without scikit-learn: 5 points per interest found in the career text
+        for i, row in enumerate(rows):
+            career_name = self.career_names[row]
+            career_text = self._career_document(self.career_data[career_name]).lower()
+            bonuses[i] = 5 * sum(1 for interest in user_interests if str(interest).lower() in career_text)
+        return bonuses
     
     def _calculate_skill_match_score(self, user_skills: Dict[str, float], 
                                    career_info: Dict) -> float:
@@ -235,19 +414,38 @@ class CareerRecommendationModel:
         return roadmap
 
 
+def _build_from_catalog() -> CareerRecommendationModel:
+    from django.conf import settings
+    from careers.catalog import get_catalog
+    return CareerRecommendationModel.from_catalog(
+        get_catalog(), getattr(settings, 'ML_ARTIFACTS_DIR', None),
+        write_artifacts=getattr(settings, 'ML_ARTIFACTS_WRITE_ON_DEMAND', False),
+    )
+
+
+def _catalog_version() -> int:
+    from careers.catalog import catalog_version
+    return catalog_version()
+
+
+def _close_db_connections():
+    from django.db import connections
+    connections.close_all()
+
+
+career_model_registry = ModelRegistry(
+    'career_recommendation_model', _build_from_catalog, _catalog_version, cleanup=_close_db_connections
+)
+
+
+def get_career_model() -> CareerRecommendationModel:
+    """Shared, catalog-backed model; refitted in the background when the catalog changes"""
+    return career_model_registry.get()
+
+
 # Legacy function for backward compatibility
 def score_career_paths(user_skill_levels: Dict[int, int],
-                      career_to_required_skills: Dict[int, List[int]]) -> List[Tuple[int, float]]:
+                      career_to_required_skills: Optional[Dict[int, List[int]]] = None) -> List[Tuple[int, float]]:
     """Legacy function for backward compatibility"""
-    scores: List[Tuple[int, float]] = []
-    for career_id, required_ids in career_to_required_skills.items():
-        if not required_ids:
-            scores.append((career_id, 0.0))
-            continue
-        total_possible = len(required_ids) * 100
-        achieved = 0
-        for sid in required_ids:
-            achieved += max(0, min(100, user_skill_levels.get(sid, 0)))
-        score = round((achieved / total_possible) * 100.0, 2)
-        scores.append((career_id, score))
-    return sorted(scores, key=lambda x: x[1], reverse=True)
\ No newline at end of file
+    from .recommender import score_career_paths as _score_career_paths
+    return _score_career_paths(user_skill_levels, career_to_required_skills)
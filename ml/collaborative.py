@@ -0,0 +1,165 @@
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+def build_user_skill_matrix(rows: List[Tuple[int, int, int]]) -> Tuple[np.ndarray, sparse.csr_matrix]:
+    """
+    Sparse user x skill matrix from (user_id, skill_id, level) rows, L2-normalised per user
+    so a row product is the cosine similarity between two users' skill profiles.
+    """
+    user_index: Dict[int, int] = {}
+    skill_index: Dict[int, int] = {}
+    r, c, data = [], [], []
+    for user_id, skill_id, level in rows:
+        level = min(max(level, 0), 100)
+        if level <= 0:
+            continue
+        r.append(user_index.setdefault(user_id, len(user_index)))
+        c.append(skill_index.setdefault(skill_id, len(skill_index)))
+        data.append(float(level))
+
+    matrix = sparse.csr_matrix((data, (r, c)), shape=(len(user_index), len(skill_index)))
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    matrix = sparse.diags(1.0 / norms) @ matrix
+    user_ids = np.fromiter(user_index.keys(), dtype=np.int64, count=len(user_index))
+    return user_ids, matrix.tocsr()
+
+
+def nearest_neighbors(matrix: sparse.csr_matrix, k: int = 20, block_size: int = 256,
+                      min_similarity: float = 0.05):
+    """
+    Yield (row, neighbour_rows, similarities) with each user's top-k cosine neighbours.
+
+    Similarities are computed block by block (block_size users x all users) so memory
+    stays bounded; users sharing no skill never appear in the sparse block product.
+    """
+    transposed = matrix.T.tocsr()
+    for start in range(0, matrix.shape[0], block_size):
+        block = (matrix[start:start + block_size] @ transposed).tocsr()
+        for offset in range(block.shape[0]):
+            row = start + offset
+            lo, hi = block.indptr[offset], block.indptr[offset + 1]
+            cols = block.indices[lo:hi]
+            sims = block.data[lo:hi]
+            keep = (cols != row) & (sims >= min_similarity)
+            cols, sims = cols[keep], sims[keep]
+            if len(cols) > k:
+                top = np.argpartition(-sims, k - 1)[:k]
+                cols, sims = cols[top], sims[top]
+            order = np.lexsort((cols, -sims))
+            yield row, cols[order], sims[order]
+
+
+def refresh_neighbor_table(k: int = 20, block_size: int = 256, min_similarity: float = 0.05,
+                           batch_size: int = 5000) -> Dict[str, Any]:
+    """
+    Offline job: rebuild careers.UserNeighbor from the current UserSkill table.
+    The old table is replaced inside one transaction, so readers never see a partial refresh.
+    """
+    from django.db import transaction
+    from careers.models import UserNeighbor
+    from skills.models import UserSkill
+
+    started = time.perf_counter()
+    rows = UserSkill.objects.values_list('user_id', 'skill_id', 'level').iterator(chunk_size=10000)
+    user_ids, matrix = build_user_skill_matrix(rows)
+
+    written = 0
+    with transaction.atomic():
+        UserNeighbor.objects.all().delete()
+        pending = []
+        for row, neighbor_rows, sims in nearest_neighbors(matrix, k, block_size, min_similarity):
+            user_id = int(user_ids[row])
+            for rank, (neighbor_row, similarity) in enumerate(zip(neighbor_rows, sims), start=1):
+                pending.append(UserNeighbor(
+                    user_id=user_id, neighbor_id=int(user_ids[neighbor_row]),
+                    similarity=round(float(similarity), 4), rank=rank,
+                ))
+            if len(pending) >= batch_size:
+                UserNeighbor.objects.bulk_create(pending)
+                written += len(pending)
+                pending = []
+        if pending:
+            UserNeighbor.objects.bulk_create(pending)
+            written += len(pending)
+
+    return {
+        'users': len(user_ids),
+        'neighbors': written,
+        'elapsed_seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+# Peer roadmaps shown per suggested career, most similar peers first
+PEER_ROADMAPS_PER_CAREER = 3
+PEER_ROADMAP_FIELDS = (
+    'id', 'title', 'learning_style', 'hours_per_week', 'estimated_completion_weeks', 'current_phase',
+    'overall_progress_percentage', 'milestones_completed', 'milestones_total',
+)
+
+
+def suggest_peer_careers(user, limit: int = 5, catalog=None) -> List[Dict[str, Any]]:
+    """
+    Online path: careers that the user's precomputed nearest neighbours are pursuing.
+
+    Two indexed queries (neighbour list, neighbours' active roadmaps) plus an in-memory
+    aggregation; careers the user already has a roadmap for are skipped. Each career is
+    scored by the summed similarity of the peers pursuing it and carries the roadmaps of
+    its most similar peers (plan and progress only, nothing identifying the peer).
+    """
+    from careers.catalog import get_catalog
+    from careers.models import PersonalizedRoadmap, UserNeighbor
+
+    neighbors = dict(UserNeighbor.objects.filter(user=user).values_list('neighbor_id', 'similarity'))
+    if not neighbors:
+        return []
+
+    roadmaps = PersonalizedRoadmap.objects.filter(
+        user_id__in=[*neighbors, user.id], is_active=True
+    ).order_by().values('user_id', 'target_career_id', *PEER_ROADMAP_FIELDS)
+
+    own_careers = set()
+    scores: Dict[int, float] = defaultdict(float)
+    peers: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for roadmap in roadmaps:
+        user_id, career_id = roadmap['user_id'], roadmap['target_career_id']
+        if user_id == user.id:
+            own_careers.add(career_id)
+            continue
+        scores[career_id] += neighbors[user_id]
+        peers[career_id].append({
+            'roadmap_id': roadmap['id'],
+            'title': roadmap['title'],
+            'learning_style': roadmap['learning_style'],
+            'hours_per_week': roadmap['hours_per_week'],
+            'estimated_completion_weeks': roadmap['estimated_completion_weeks'],
+            'current_phase': roadmap['current_phase'],
+            'progress': roadmap['overall_progress_percentage'],
+            'milestones_completed': roadmap['milestones_completed'],
+            'milestones_total': roadmap['milestones_total'],
+            'similarity': neighbors[user_id],
+        })
+
+    catalog = catalog or get_catalog()
+    ranked = sorted(
+        (cid for cid in scores if cid not in own_careers and cid in catalog),
+        key=lambda cid: (-scores[cid], cid),
+    )
+    return [
+        {
+            'career_path_id': cid,
+            'title': catalog.careers[cid]['title'],
+            'score': round(scores[cid], 4),
+            'peer_count': len(peers[cid]),
+            'average_peer_progress': round(sum(p['progress'] for p in peers[cid]) / len(peers[cid]), 1),
+            'peer_roadmaps': sorted(peers[cid], key=lambda p: (-p['similarity'], p['roadmap_id']))[
+                :PEER_ROADMAPS_PER_CAREER
+            ],
+        }
+        for cid in ranked[:limit]
+    ]
@@ -0,0 +1,118 @@
+from collections import Counter, deque
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton that finds every occurrence of many keywords in one pass.
+
+    Matching is case-insensitive and honours word boundaries at the keyword's edges:
+    a keyword that starts (ends) with a word character only matches where it is not
+    preceded (followed) by another word character, like ``\\b`` in a regex. Edges that
+    are punctuation ("C++", "C#") need no boundary. Scanning is linear in the text
+    length plus the number of matches, independent of how many keywords there are.
+
+    ``keywords`` is an iterable of strings or a mapping of keyword to a value (e.g. a
+    skill category) returned with each match.
+    """
+
+    def __init__(self, keywords: Union[Iterable[str], Dict[str, Any]]):
+        items = keywords.items() if isinstance(keywords, dict) else ((k, k) for k in keywords)
+        self.keywords: List[str] = []
+        self.values: List[Any] = []
+        self._lengths: List[int] = []
+        self._bounded: List[Tuple[bool, bool]] = []
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._out_link: List[int] = [0]
+
+        for keyword, value in items:
+            folded = keyword.lower()
+            if not folded:
+                continue
+            node = 0
+            for ch in folded:
+                child = self._goto[node].get(ch)
+                if child is None:
+                    child = self._goto[node][ch] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._out_link.append(0)
+                node = child
+            self._out[node].append(len(self.keywords))
+            self.keywords.append(keyword)
+            self.values.append(value)
+            self._lengths.append(len(folded))
+            self._bounded.append((_is_word_char(folded[0]), _is_word_char(folded[-1])))
+        self._link()
+
+    def _link(self):
+        # Breadth-first so every fail target is final before its children are linked
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                target = target if target != child else 0
+                self._fail[child] = target
+                # Nearest node on the fail chain that completes a keyword
+                self._out_link[child] = target if self._out[target] else self._out_link[target]
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def finditer(self, text: str, lowered: bool = False) -> Iterator[Tuple[int, int, int]]:
+        """
+        (start, end, keyword index) for every boundary-respecting occurrence, by end position.
+        Pass ``lowered=True`` when ``text`` is already lower-cased to skip folding it again.
+        """
+        # Offsets refer to text.lower(), which only differs in length for rare non-ASCII input
+        folded = text if lowered else text.lower()
+        goto, fail, out, out_link = self._goto, self._fail, self._out, self._out_link
+        lengths, bounded = self._lengths, self._bounded
+        size = len(folded)
+        node = 0
+        for end, ch in enumerate(folded, start=1):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = node if out[node] else out_link[node]
+            while hit:
+                for index in out[hit]:
+                    start = end - lengths[index]
+                    left, right = bounded[index]
+                    if left and start > 0 and _is_word_char(folded[start - 1]):
+                        continue
+                    if right and end < size and _is_word_char(folded[end]):
+                        continue
+                    yield start, end, index
+                hit = out_link[hit]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str, Any]]:
+        """(start, end, keyword, value) for every occurrence"""
+        return [(start, end, self.keywords[i], self.values[i]) for start, end, i in self.finditer(text)]
+
+    def counts(self, text: str, lowered: bool = False) -> Counter:
+        """Occurrences per keyword (as given, not lower-cased)"""
+        return Counter(self.keywords[i] for _, _, i in self.finditer(text, lowered))
+
+    def first_positions(self, text: str) -> Dict[str, int]:
+        """Start of each keyword's first occurrence, in order of appearance"""
+        first: Dict[str, int] = {}
+        for start, _, i in sorted(self.finditer(text)):
+            first.setdefault(self.keywords[i], start)
+        return first
+
+    def total(self, text: str, lowered: bool = False) -> int:
+        return sum(1 for _ in self.finditer(text, lowered))
@@ -1,26 +1,28 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from .scoring import CareerScoringEngine
 
 
 def score_career_paths(
     user_skill_levels: Dict[int, int],
-    career_to_required_skills: Dict[int, List[int]],
+    career_to_required_skills: Optional[Dict[int, List[int]]] = None,
+    limit: Optional[int] = None,
 ) -> List[Tuple[int, float]]:
     """
     Returns list of (career_path_id, score_percent) sorted desc.
     Simple overlap-weighted scoring: sum(user_level for required skills) / (len(required)*100) * 100.
+    Scoring is delegated to CareerScoringEngine, which evaluates the whole catalog as one
+    sparse matrix-vector product. Without an explicit ``career_to_required_skills`` the
+    CareerPath catalog's shared engine is used, so nothing is rebuilt per call; an explicit
+    mapping gets a throwaway engine.
+    With a ``limit`` only careers sharing a skill with the user are scored (via the engine's
+    skill -> careers inverted index) and the top ``limit`` positive scores are returned.
     """
-    scores: List[Tuple[int, float]] = []
-    for career_id, required_ids in career_to_required_skills.items():
-        if not required_ids:
-            scores.append((career_id, 0.0))
-            continue
-        total_possible = len(required_ids) * 100
-        achieved = 0
-        for sid in required_ids:
-            achieved += max(0, min(100, user_skill_levels.get(sid, 0)))
-        score = round((achieved / total_possible) * 100.0, 2)
-        scores.append((career_id, score))
-    scores.sort(key=lambda x: x[1], reverse=True)
-    return scores
-
-
+    if career_to_required_skills is None:
+        from careers.catalog import get_catalog
+        engine = get_catalog().engine
+    else:
+        engine = CareerScoringEngine(career_to_required_skills)
+    if limit is not None:
+        return engine.score_candidates(user_skill_levels, limit=limit)
+    return engine.score(user_skill_levels)
@@ -0,0 +1,91 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """
+    Process-wide holder for a fitted model.
+
+    The first ``get()`` builds the model synchronously. After that, callers always
+    receive the current instance immediately; when ``version()`` reports a new
+    source version a single background thread refits the model and swaps it in
+    once it is ready, so request latency never includes model construction.
+    """
+
+    def __init__(self, name: str, build: Callable[[], Any], version: Callable[[], Hashable],
+                 cleanup: Optional[Callable[[], None]] = None):
+        self.name = name
+        self._build = build
+        self._version = version
+        self._cleanup = cleanup
+        self._lock = threading.Lock()
+        self._model = None
+        self._model_version = None
+        self._refitting = False
+        self._last_fit_seconds: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    def get(self):
+        version = self._version()
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model, self._model_version = self._fit(), version
+            return self._model
+
+        if version != self._model_version and not self._refitting:
+            with self._lock:
+                if version != self._model_version and not self._refitting:
+                    self._refitting = True
+                    threading.Thread(
+                        target=self._refit_in_background, args=(version,),
+                        name=f'{self.name}-refit', daemon=True,
+                    ).start()
+        return self._model
+
+    def warm_up(self):
+        """Build the model now instead of on first use"""
+        return self.get()
+
+    def reset(self):
+        """Drop the fitted model; the next get() rebuilds it synchronously"""
+        with self._lock:
+            self._model = None
+            self._model_version = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'loaded': self._model is not None,
+            'version': self._model_version,
+            'refitting': self._refitting,
+            'last_fit_seconds': self._last_fit_seconds,
+            'last_error': self._last_error,
+        }
+
+    def _fit(self):
+        started = time.perf_counter()
+        model = self._build()
+        self._last_fit_seconds = round(time.perf_counter() - started, 4)
+        return model
+
+    def _refit_in_background(self, version: Hashable):
+        try:
+            # Fit without the lock so get() keeps serving the current model meanwhile
+            model = self._fit()
+            with self._lock:
+                self._model, self._model_version = model, version
+                self._last_error = None
+        except Exception as e:
+            # Keep serving the previous model; the next get() retries the refit.
+            self._last_error = str(e)
+            logger.exception("Error refitting %s", self.name)
+        finally:
+            with self._lock:
+                self._refitting = False
+            if self._cleanup:
+                self._cleanup()
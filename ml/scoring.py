@@ -0,0 +1,335 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+class CareerScoringEngine:
+    """
+    Vectorized career scorer.
+
+    Keeps the catalog as a sparse career x skill matrix where each row holds a 1
+    for every required skill. A user's clipped skill levels form a dense vector,
+    so scoring the whole catalog is one sparse mat-vec product followed by an
+    argpartition top-k. Scores match ``ml.recommender.score_career_paths``:
+    sum(user_level for required skills) / (len(required) * 100) * 100.
+    """
+
+    def __init__(self, career_to_required_skills: Dict[int, List[int]]):
+        self.career_ids = np.fromiter(career_to_required_skills.keys(), dtype=np.int64,
+                                      count=len(career_to_required_skills))
+        self.skill_index: Dict[int, int] = {}
+
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, required_ids in enumerate(career_to_required_skills.values()):
+            for sid in required_ids:
+                col = self.skill_index.setdefault(sid, len(self.skill_index))
+                rows.append(row)
+                cols.append(col)
+
+        shape = (len(self.career_ids), len(self.skill_index))
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, cols)), shape=shape
+        )
+        # Duplicate entries are summed by the constructor, matching the loop
+        # implementation which counted a repeated skill twice.
+        self.required_counts = np.asarray(self.matrix.sum(axis=1)).ravel()
+        # Column-major copy doubles as the skill -> careers inverted index
+        self.skill_matrix = self.matrix.tocsc()
+
+    @classmethod
+    def from_bundle(cls, bundle) -> 'CareerScoringEngine':
+        """Engine over memory-mapped arrays written by ``artifacts()``; nothing is recomputed"""
+        engine = cls.__new__(cls)
+        engine.career_ids = bundle.array('career_ids')
+        engine.skill_index = {int(sid): col for col, sid in enumerate(bundle.array('skill_ids'))}
+        engine.matrix = bundle.matrix('matrix')
+        engine.required_counts = bundle.array('required_counts')
+        engine.skill_matrix = bundle.matrix('skill_matrix')
+        return engine
+
+    def artifacts(self) -> Dict[str, Dict[str, object]]:
+        """Arrays and sparse matrices to persist with ``ml.artifacts.write_bundle``"""
+        skill_ids = np.fromiter(self.skill_index.keys(), dtype=np.int64, count=len(self.skill_index))
+        return {
+            'arrays': {'career_ids': self.career_ids, 'skill_ids': skill_ids,
+                       'required_counts': self.required_counts},
+            'matrices': {'matrix': self.matrix, 'skill_matrix': self.skill_matrix},
+        }
+
+    @property
+    def n_careers(self) -> int:
+        return len(self.career_ids)
+
+    def user_vector(self, user_skill_levels: Dict[int, int]) -> np.ndarray:
+        """Dense skill vector with levels clipped to 0-100; unknown skills are ignored."""
+        vector = np.zeros(len(self.skill_index), dtype=np.float64)
+        for sid, level in user_skill_levels.items():
+            col = self.skill_index.get(sid)
+            if col is not None:
+                vector[col] = level
+        return np.clip(vector, 0, 100, out=vector)
+
+    def score_vector(self, user_skill_levels: Dict[int, int]) -> np.ndarray:
+        """Unrounded score_percent for every career, aligned with ``career_ids``."""
+        achieved = self.matrix @ self.user_vector(user_skill_levels)
+        return self._to_percent(achieved)
+
+    def score(self, user_skill_levels: Dict[int, int],
+              limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Returns list of (career_path_id, score_percent) sorted desc."""
+        return self.rank(self.score_vector(user_skill_levels), limit=limit)
+
+    def careers_for_skill(self, skill_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Row positions of the careers requiring ``skill_id`` and how often each requires it"""
+        col = self.skill_index.get(skill_id)
+        if col is None:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+        start, end = self.skill_matrix.indptr[col], self.skill_matrix.indptr[col + 1]
+        return self.skill_matrix.indices[start:end], self.skill_matrix.data[start:end]
+
+    def score_candidates(self, user_skill_levels: Dict[int, int],
+                         limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Positive-scoring careers only, sorted desc, optionally limited to the top ``limit``.
+
+        Candidates come from the skill -> careers inverted index, so careers sharing no
+        skill with the user (which always score zero) are never touched. With a ``limit``
+        the top k are selected by partition and only those are sorted. Ties keep catalog
+        order as in ``score``.
+        """
+        touched_rows: List[np.ndarray] = []
+        touched_values: List[np.ndarray] = []
+        for sid, level in user_skill_levels.items():
+            level = min(max(level, 0), 100)
+            rows, weights = self.careers_for_skill(sid)
+            if level > 0 and len(rows):
+                touched_rows.append(rows)
+                touched_values.append(weights * level)
+        if not touched_rows or limit == 0:
+            return []
+
+        rows = np.concatenate(touched_rows)
+        values = np.concatenate(touched_values)
+        candidates, inverse = np.unique(rows, return_inverse=True)
+        achieved = np.zeros(len(candidates))
+        np.add.at(achieved, inverse, values)
+        scores = np.round((achieved / (self.required_counts[candidates] * 100)) * 100.0, 2)
+
+        # candidates are sorted rows, so positions within them follow catalog order
+        positive = np.flatnonzero(scores > 0)
+        order = positive[self._top_indices(scores[positive], limit)]
+        return [(int(self.career_ids[candidates[i]]), float(scores[i])) for i in order]
+
+    def baseline(self, user_skill_levels: Dict[int, int]) -> 'UserBaseline':
+        """Full score vector and ranking for a user, reusable for delta scoring"""
+        levels = {sid: min(max(level, 0), 100) for sid, level in user_skill_levels.items()}
+        achieved = self.matrix @ self.user_vector(levels)
+        scores = np.round(self._to_percent(achieved), 2)
+        return UserBaseline(self, levels, achieved, scores, self._top_indices(scores, None))
+
+    def score_with_adjustments(self, baseline: 'UserBaseline', adjustments: Dict[int, int],
+                               limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Rank careers after overriding a few skill levels on top of a cached baseline.
+
+        Only careers that require an adjusted skill are rescored, found through the
+        skill -> careers inverted index. With a ``limit`` the result is merged from
+        the baseline ranking, so the cost depends on the number of touched careers
+        and k rather than on the catalog size.
+        """
+        touched_rows: List[np.ndarray] = []
+        touched_deltas: List[np.ndarray] = []
+        for sid, level in adjustments.items():
+            delta = min(max(level, 0), 100) - baseline.levels.get(sid, 0)
+            rows, weights = self.careers_for_skill(sid)
+            if delta and len(rows):
+                touched_rows.append(rows)
+                touched_deltas.append(weights * delta)
+
+        if not touched_rows:
+            return self._merge_ranking(baseline, np.empty(0, dtype=np.int64), np.empty(0), limit)
+
+        rows = np.concatenate(touched_rows)
+        deltas = np.concatenate(touched_deltas)
+        unique_rows, inverse = np.unique(rows, return_inverse=True)
+        achieved_delta = np.zeros(len(unique_rows))
+        np.add.at(achieved_delta, inverse, deltas)
+
+        achieved = baseline.achieved[unique_rows] + achieved_delta
+        total_possible = self.required_counts[unique_rows] * 100
+        new_scores = np.round((achieved / total_possible) * 100.0, 2)
+        return self._merge_ranking(baseline, unique_rows, new_scores, limit)
+
+    def _merge_ranking(self, baseline: 'UserBaseline', rows: np.ndarray, new_scores: np.ndarray,
+                       limit: Optional[int]) -> List[Tuple[int, float]]:
+        if limit is None or limit >= self.n_careers:
+            scores = baseline.scores.copy()
+            scores[rows] = new_scores
+            return self.rank(scores)
+
+        # Both sides are ordered by (score desc, catalog position); merge until k items
+        touched = sorted(zip((-new_scores).tolist(), rows.tolist()))
+        touched_set = set(rows.tolist())
+        result: List[Tuple[int, float]] = []
+        t = 0
+        for row in baseline.order:
+            if len(result) >= limit:
+                break
+            if row in touched_set:
+                continue
+            key = (-float(baseline.scores[row]), int(row))
+            while t < len(touched) and touched[t] < key and len(result) < limit:
+                result.append((int(self.career_ids[touched[t][1]]), -touched[t][0]))
+                t += 1
+            if len(result) < limit:
+                result.append((int(self.career_ids[row]), float(baseline.scores[row])))
+        while t < len(touched) and len(result) < limit:
+            result.append((int(self.career_ids[touched[t][1]]), -touched[t][0]))
+            t += 1
+        return result
+
+    def user_matrix(self, rows: np.ndarray, skill_ids: np.ndarray, levels: np.ndarray,
+                    n_users: int) -> sparse.csr_matrix:
+        """
+        Sparse user x skill matrix from (row, skill_id, level) triples.
+        Skills outside the catalog are dropped and levels clipped to 0-100.
+        """
+        cols = np.fromiter((self.skill_index.get(int(sid), -1) for sid in skill_ids),
+                           dtype=np.int64, count=len(skill_ids))
+        known = cols >= 0
+        data = np.clip(np.asarray(levels, dtype=np.float64)[known], 0, 100)
+        return sparse.csr_matrix(
+            (data, (np.asarray(rows)[known], cols[known])),
+            shape=(n_users, len(self.skill_index)),
+        )
+
+    def score_users(self, user_matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+        """
+        Score many users at once with one sparse product.
+
+        Returns a users x careers CSR matrix of unrounded score_percent values; careers
+        sharing no skill with a user are simply absent from that row.
+        """
+        achieved = (user_matrix @ self.matrix.T).tocsr()
+        achieved.data = (achieved.data / (self.required_counts[achieved.indices] * 100)) * 100.0
+        achieved.eliminate_zeros()
+        return achieved
+
+    def score_scenarios(self, user_skill_levels: Dict[int, int],
+                        scenarios: List[Dict[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score N what-if scenarios against the catalog in one vectorized pass.
+
+        Each scenario overrides some of the user's skill levels. The overrides are
+        stacked into an N x skills sparse matrix of level deltas, so the whole batch
+        costs one product with the catalog matrix on top of the baseline mat-vec.
+        Returns (baseline scores, N x careers scenario scores), both unrounded.
+        """
+        baseline = self.user_vector(user_skill_levels)
+        rows: List[int] = []
+        cols: List[int] = []
+        deltas: List[float] = []
+        for row, adjustments in enumerate(scenarios):
+            for sid, level in adjustments.items():
+                col = self.skill_index.get(sid)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+                    deltas.append(min(max(level, 0), 100) - baseline[col])
+
+        delta_matrix = sparse.csr_matrix(
+            (np.asarray(deltas, dtype=np.float64), (rows, cols)),
+            shape=(len(scenarios), len(self.skill_index)),
+        )
+        baseline_achieved = self.matrix @ baseline
+        achieved = baseline_achieved[np.newaxis, :] + (delta_matrix @ self.matrix.T).toarray()
+        return self._to_percent(baseline_achieved), self._to_percent(achieved)
+
+    def rank(self, scores: np.ndarray, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Round and order a score vector, keeping catalog order for ties."""
+        rounded = np.round(scores, 2)
+        order = self._top_indices(rounded, limit)
+        return [(int(self.career_ids[i]), float(rounded[i])) for i in order]
+
+    def _to_percent(self, achieved: np.ndarray) -> np.ndarray:
+        total_possible = self.required_counts * 100
+        out = np.zeros_like(achieved, dtype=np.float64)
+        np.divide(achieved, total_possible, out=out, where=total_possible > 0)
+        return out * 100.0
+
+    @staticmethod
+    def _top_indices(scores: np.ndarray, limit: Optional[int]) -> np.ndarray:
+        n = len(scores)
+        if limit is None or limit >= n:
+            candidates = np.arange(n)
+        elif limit <= 0:
+            return np.empty(0, dtype=np.int64)
+        else:
+            # Everything above the k-th best score, then the earliest of the tied ones, so
+            # ties at the cut keep catalog order just like the full sort
+            kth = -np.partition(-scores, limit - 1)[limit - 1]
+            above = np.flatnonzero(scores > kth)
+            candidates = np.concatenate((above, np.flatnonzero(scores == kth)[:limit - len(above)]))
+        # lexsort sorts by the last key first: score desc, then catalog position.
+        return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+
+class UserBaseline:
+    """A user's clipped skill levels with their raw and rounded catalog scores and ranking"""
+
+    __slots__ = ('engine', 'levels', 'achieved', 'scores', 'order')
+
+    def __init__(self, engine: CareerScoringEngine, levels: Dict[int, int], achieved: np.ndarray,
+                 scores: np.ndarray, order: np.ndarray):
+        self.engine = engine
+        self.levels = levels
+        self.achieved = achieved
+        self.scores = scores
+        self.order = order
+
+
+class BaselineCache:
+    """
+    Bounded LRU of per-user baselines.
+
+    Entries are keyed by user id and remember the engine and a caller-supplied
+    version token (e.g. the user's skills version); a different engine or token
+    rebuilds the entry.
+    """
+
+    def __init__(self, maxsize: int = 2048):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[int, Tuple[Hashable, UserBaseline]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, engine: CareerScoringEngine, version: Hashable,
+            load_levels: Callable[[], Dict[int, int]]) -> UserBaseline:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] == version and entry[1].engine is engine:
+                self._entries.move_to_end(user_id)
+                return entry[1]
+
+        baseline = engine.baseline(load_levels())
+        with self._lock:
+            self._entries[user_id] = (version, baseline)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return baseline
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+baseline_cache = BaselineCache()
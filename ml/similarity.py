@@ -0,0 +1,91 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+def _normalize_rows(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return (sparse.diags(1.0 / norms) @ matrix).tocsr()
+
+
+def top_k_similar(skill_matrix: sparse.csr_matrix, text_matrix: Optional[sparse.csr_matrix] = None,
+                  k: int = 20, skill_weight: float = 0.7,
+                  block_size: int = 512) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k most similar careers for every career.
+
+    Similarity is the cosine over required skills, blended with the cosine over
+    description TF-IDF vectors when ``text_matrix`` is given. Rows are processed in
+    blocks so only a block_size x careers slice is ever dense. Returns
+    (neighbors, similarities), both careers x k; unused slots hold -1 and 0.
+    """
+    n = skill_matrix.shape[0]
+    k = max(min(k, n - 1), 0)
+    neighbors = np.full((n, k), -1, dtype=np.int32)
+    similarities = np.zeros((n, k), dtype=np.float32)
+    if k == 0:
+        return neighbors, similarities
+
+    skills = _normalize_rows(skill_matrix)
+    skills_t = skills.T.tocsr()
+    if text_matrix is None:
+        skill_weight = 1.0
+    else:
+        text = _normalize_rows(text_matrix)
+        text_t = text.T.tocsr()
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        block = skill_weight * (skills[start:stop] @ skills_t).toarray()
+        if skill_weight < 1.0:
+            block += (1.0 - skill_weight) * (text[start:stop] @ text_t).toarray()
+        block[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        for offset, cols in enumerate(top):
+            sims = block[offset, cols]
+            order = np.lexsort((cols, -sims))
+            cols, sims = cols[order], sims[order]
+            keep = sims > 0
+            row = start + offset
+            neighbors[row, :keep.sum()] = cols[keep]
+            similarities[row, :keep.sum()] = sims[keep]
+    return neighbors, similarities
+
+
+class CareerSimilarityIndex:
+    """
+    Precomputed career x career nearest neighbours as two fixed-width arrays.
+
+    When opened from an ``ml.artifacts`` bundle the arrays are memory-mapped, so a
+    lookup touches one k-wide row regardless of catalog size.
+    """
+
+    def __init__(self, neighbors: np.ndarray, similarities: np.ndarray):
+        self.neighbors = neighbors
+        self.similarities = similarities
+
+    @classmethod
+    def build(cls, skill_matrix, text_matrix, k: int = 20, skill_weight: float = 0.7) -> 'CareerSimilarityIndex':
+        return cls(*top_k_similar(skill_matrix, text_matrix, k, skill_weight))
+
+    @classmethod
+    def from_bundle(cls, bundle) -> 'CareerSimilarityIndex':
+        return cls(bundle.array('similar_careers'), bundle.array('similarities'))
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {'similar_careers': self.neighbors, 'similarities': self.similarities}
+
+    @property
+    def n_careers(self) -> int:
+        return self.neighbors.shape[0]
+
+    def neighbors_of(self, row: int) -> List[Tuple[int, float]]:
+        """(career row, similarity) pairs for one career, most similar first"""
+        return [
+            (int(col), float(sim))
+            for col, sim in zip(self.neighbors[row], self.similarities[row])
+            if col >= 0
+        ]
@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None when it cannot be read"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    try:
+        import resource
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * resource.getpagesize()
+    except (OSError, ImportError, ValueError, IndexError):
+        return None
+
+
+class NLPModelRegistry:
+    """
+    Process-wide holder for the heavy NLP models used by resume analysis.
+
+    Each model is loaded at most once per process, on first ``get()`` or on
+    ``warm_up()``, and the same instance is handed to every analyzer. Loads are
+    serialised by one lock so concurrent first requests do not load a model twice
+    and the memory attributed to each model is not mixed with another load.
+    A model whose library is missing or that fails to load is recorded as such and
+    not retried until ``reset()``.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        self._loaders[name] = loader
+        self._status[name] = self._initial_status()
+
+    def get(self, name: str) -> Optional[Any]:
+        """The shared model, loading it if needed; None when it is unavailable"""
+        if name in self._models:
+            return self._models[name]
+        if self._status[name]['state'] in ('unavailable', 'failed'):
+            return None
+        with self._lock:
+            if name not in self._models and self._status[name]['state'] == 'not_loaded':
+                self._load(name)
+        return self._models.get(name)
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Load the given models (default: all) now instead of on first use"""
+        for name in names or list(self._loaders):
+            self.get(name)
+        return self.status()
+
+    def reset(self, name: Optional[str] = None):
+        """Drop loaded models (or one of them) so the next get() loads again"""
+        with self._lock:
+            for key in [name] if name else list(self._loaders):
+                self._models.pop(key, None)
+                self._status[key] = self._initial_status()
+
+    def names(self) -> List[str]:
+        return list(self._loaders)
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [{'name': name, **dict(self._status[name])} for name in self._loaders]
+
+    @staticmethod
+    def _initial_status() -> Dict[str, Any]:
+        return {'state': 'not_loaded', 'load_seconds': None, 'memory_bytes': None, 'error': None}
+
+    def _load(self, name: str):
+        before = _rss_bytes()
+        started = time.perf_counter()
+        try:
+            model = self._loaders[name]()
+        except ImportError as e:
+            self._status[name].update(state='unavailable', error=str(e))
+            return
+        except Exception as e:
+            self._status[name].update(state='failed', error=str(e))
+            logger.exception("Could not load NLP model %s", name)
+            return
+        after = _rss_bytes()
+        self._models[name] = model
+        self._status[name].update(
+            state='loaded',
+            load_seconds=round(time.perf_counter() - started, 4),
+            memory_bytes=after - before if before is not None and after is not None else None,
+        )
+
+
+def _load_spacy():
+    import spacy
+    try:
+        return spacy.load("en_core_web_sm")
+    except OSError:
+        try:
+            return spacy.load("en_core_web_md")
+        except OSError:
+            raise ImportError(
+                "spaCy English model not found. Install with: python -m spacy download en_core_web_sm"
+            )
+
+
+def _load_sentiment():
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", model="cardiffnlp/twitter-roberta-base-sentiment-latest")
+
+
+def _load_ner():
+    from transformers import pipeline
+    return pipeline("ner", model="dbmdz/bert-large-cased-finetuned-conll03-english")
+
+
+def _load_keybert():
+    from keybert import KeyBERT
+    return KeyBERT()
+
+
+def _load_yake():
+    import yake
+    return yake.KeywordExtractor(lan="en", n=3, dedupLim=0.7, top=20)
+
+
+nlp_models = NLPModelRegistry()
+nlp_models.register('spacy', _load_spacy)
+nlp_models.register('sentiment', _load_sentiment)
+nlp_models.register('ner', _load_ner)
+nlp_models.register('keybert', _load_keybert)
+nlp_models.register('yake', _load_yake)
@@ -1,12 +1,17 @@
 import re
 import os
+import unicodedata
 import json
 import requests
 from typing import List, Dict, Any, Tuple, Optional
 from collections import Counter
+from functools import cached_property
 import tempfile
 from pathlib import Path
 
+from ml.matcher import KeywordMatcher
+from .nlp_models import nlp_models
+
 # Import packages with fallbacks for when they're not available
 try:
     import spacy
@@ -49,61 +54,142 @@ except ImportError:
     ADVANCED_LIBS_AVAILABLE = False
 
 
+# Patterns are compiled once at import and shared by every analysis
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(\+?1?[-. ]?)?\(?([0-9]{3})\)?[-. ]?([0-9]{3})[-. ]?([0-9]{4})')
+LINKEDIN_PATTERN = re.compile(r'(linkedin\.com/in/[A-Za-z0-9-]+)', re.IGNORECASE)
+GITHUB_PATTERN = re.compile(r'(github\.com/[A-Za-z0-9-]+)', re.IGNORECASE)
+DEGREE_PATTERNS = [
+    re.compile(r'(Bachelor|Master|PhD|Ph\.D|MBA|BS|BA|MS|MA)\s+(?:of\s+)?(?:Science\s+)?(?:Arts\s+)?(?:in\s+)?([^,\n.]+)', re.IGNORECASE),
+    re.compile(r'(B\.S\.|B\.A\.|M\.S\.|M\.A\.|Ph\.D\.)\s+(?:in\s+)?([^,\n.]+)', re.IGNORECASE),
+]
+JOB_PATTERNS = [
+    re.compile(r'([A-Z][a-z]+\s+[A-Z][a-z]+)\s+at\s+([A-Z][a-zA-Z\s&.]+)'),
+    re.compile(r'([A-Z][a-z]+\s+[A-Z][a-z]+)\s+-\s+([A-Z][a-zA-Z\s&.]+)'),
+    re.compile(r'([A-Z][a-z]+\s+[A-Z][a-z]+)\s+\|\s+([A-Z][a-zA-Z\s&.]+)'),
+]
+PROJECT_PATTERNS = [
+    re.compile(r'Project:\s*([^\n]+)'),
+    re.compile(r'([A-Z][a-zA-Z\s]+)\s+Project'),
+    re.compile(r'Built\s+([^.]+)'),
+    re.compile(r'Developed\s+([^.]+)'),
+    re.compile(r'Created\s+([^.]+)'),
+]
+ACHIEVEMENT_PATTERNS = [
+    re.compile(r'(increased?|improved?|reduced?|saved?|generated?)\s+[^\d]*([\d,]+\%?)', re.IGNORECASE),
+    re.compile(r'([\d,]+\%?)\s+(increase|improvement|reduction|growth)', re.IGNORECASE),
+    re.compile(r'(\$[\d,]+)\s+(saved?|generated?|revenue)', re.IGNORECASE),
+    re.compile(r'([\d,]+)\s+(users?|customers?|clients?|projects?)', re.IGNORECASE),
+    re.compile(r'(managed?|led)\s+([\d,]+)\s+(people|team|members)', re.IGNORECASE),
+]
+TOKEN_PATTERN = re.compile(r'\S+')
+KEYWORD_WORD_PATTERN = re.compile(r'\b[a-z]{3,}\b')
+
+CERTIFICATION_KEYWORDS = [
+    'AWS Certified', 'Azure Certified', 'Google Cloud', 'PMP', 'Scrum Master',
+    'CISSP', 'CompTIA', 'Cisco', 'Microsoft Certified', 'Oracle Certified',
+    'Kubernetes', 'Docker Certified', 'Salesforce', 'Tableau', 'Power BI'
+]
+PROGRAMMING_LANGUAGES = [
+    'Python', 'JavaScript', 'Java', 'C++', 'C#', 'PHP', 'Ruby', 'Go', 'Rust',
+    'Swift', 'Kotlin', 'TypeScript', 'Scala', 'R', 'MATLAB', 'SQL'
+]
+SPOKEN_LANGUAGES = [
+    'English', 'Spanish', 'French', 'German', 'Chinese', 'Japanese',
+    'Korean', 'Italian', 'Portuguese', 'Russian', 'Arabic', 'Hindi'
+]
+
+
+class AnalysisContext:
+    """
+    One resume (or job description) prepared once for every extractor.
+
+    Holds the normalised text (NFKC, ``\\n`` line endings), its lower-case view,
+    whitespace token offsets, period-delimited sentence spans and, lazily, the spaCy
+    ``Doc``. Regex results and keyword counts are memoised, so extractors that need
+    the same matches (contact details and the ATS score, skills and job matching)
+    scan the text once.
+    """
+    
+    def __init__(self, text: str, nlp_model=None):
+        self.text = unicodedata.normalize('NFKC', text or '').replace('\r\n', '\n').replace('\r', '\n')
+        self.lower = self.text.lower()
+        self._nlp_model = nlp_model
+        self._findall: Dict[Any, list] = {}
+        self._keyword_counts: Dict[int, Counter] = {}
+    
+    @classmethod
+    def of(cls, text, nlp_model=None) -> 'AnalysisContext':
+        """Wrap raw text; an existing context is returned unchanged"""
+        return text if isinstance(text, cls) else cls(text, nlp_model)
+    
+    @cached_property
+    def token_spans(self) -> List[Tuple[int, int]]:
+        return [match.span() for match in TOKEN_PATTERN.finditer(self.text)]
+    
+    @cached_property
+    def tokens(self) -> List[str]:
+        return [self.text[start:end] for start, end in self.token_spans]
+    
+    @cached_property
+    def sentence_spans(self) -> List[Tuple[int, int]]:
+        spans, start = [], 0
+        for sentence in self.text.split('.'):
+            spans.append((start, start + len(sentence)))
+            start += len(sentence) + 1
+        return spans
+    
+    @cached_property
+    def doc(self):
+        """spaCy ``Doc`` for the text, parsed on first use; None without a model"""
+        return self._nlp_model(self.text) if self._nlp_model else None
+    
+    def findall(self, pattern: 're.Pattern') -> list:
+        if pattern not in self._findall:
+            self._findall[pattern] = pattern.findall(self.text)
+        return self._findall[pattern]
+    
+    def keyword_counts(self, matcher: KeywordMatcher) -> Counter:
+        key = id(matcher)
+        if key not in self._keyword_counts:
+            self._keyword_counts[key] = matcher.counts(self.lower, lowered=True)
+        return self._keyword_counts[key]
+
+
 class ResumeNLPAnalyzer:
     """
     Advanced NLP utilities for resume analysis using spaCy, Hugging Face models,
     and traditional NLP techniques with fallbacks for missing dependencies.
     """
     
+    # Compiled keyword matchers shared by every analyzer (see ml.matcher)
+    _shared_matchers: Dict[str, KeywordMatcher] = {}
+    
     def __init__(self):
         self.skills_database = self._load_skills_database()
         self.job_titles_database = self._load_job_titles_database()
         self.action_verbs = self._load_action_verbs()
-        
-        # Initialize NLP models if available
-        self.nlp_model = None
-        self.sentiment_analyzer = None
-        self.ner_pipeline = None
-        self.keyword_extractor = None
-        self.yake_extractor = None
-        
-        self._initialize_models()
     
-    def _initialize_models(self):
-        """Initialize available NLP models"""
-        # Initialize spaCy if available
-        if SPACY_AVAILABLE:
-            try:
-                self.nlp_model = spacy.load("en_core_web_sm")
-            except OSError:
-                try:
-                    # Try to load a smaller model
-                    self.nlp_model = spacy.load("en_core_web_md")
-                except OSError:
-                    print("spaCy English model not found. Install with: python -m spacy download en_core_web_sm")
-        
-        # Initialize Hugging Face models if available
-        if TRANSFORMERS_AVAILABLE:
-            try:
-                self.sentiment_analyzer = pipeline("sentiment-analysis", 
-                                                 model="cardiffnlp/twitter-roberta-base-sentiment-latest")
-                self.ner_pipeline = pipeline("ner", 
-                                           model="dbmdz/bert-large-cased-finetuned-conll03-english")
-            except Exception as e:
-                print(f"Could not load Hugging Face models: {e}")
-        
-        # Initialize advanced text analysis tools
-        if ADVANCED_LIBS_AVAILABLE:
-            try:
-                self.keyword_extractor = KeyBERT()
-                self.yake_extractor = yake.KeywordExtractor(
-                    lan="en",
-                    n=3,
-                    dedupLim=0.7,
-                    top=20
-                )
-            except Exception as e:
-                print(f"Could not load advanced analysis tools: {e}")
+    # Heavy models are loaded once per process by the shared registry (see nlp_models)
+    @property
+    def nlp_model(self):
+        return nlp_models.get('spacy') if SPACY_AVAILABLE else None
+    
+    @property
+    def sentiment_analyzer(self):
+        return nlp_models.get('sentiment') if TRANSFORMERS_AVAILABLE else None
+    
+    @property
+    def ner_pipeline(self):
+        return nlp_models.get('ner') if TRANSFORMERS_AVAILABLE else None
+    
+    @property
+    def keyword_extractor(self):
+        return nlp_models.get('keybert') if ADVANCED_LIBS_AVAILABLE else None
+    
+    @property
+    def yake_extractor(self):
+        return nlp_models.get('yake') if ADVANCED_LIBS_AVAILABLE else None
     
     def analyze_resume_text(self, text: str, job_description: str = "") -> Dict[str, Any]:
         """
@@ -129,57 +215,53 @@ class ResumeNLPAnalyzer:
             "improvement_suggestions": []
         }
         
+        # Normalise and index the text once; every extractor reads from the same context
+        ctx = AnalysisContext(text, self.nlp_model)
+        
         # Extract basic information
-        analysis["contact_info"] = self._extract_contact_info(text)
-        analysis["education"] = self._extract_education(text)
-        analysis["experience"] = self._extract_experience(text)
-        analysis["skills"] = self._extract_skills(text)
-        analysis["certifications"] = self._extract_certifications(text)
-        analysis["languages"] = self._extract_languages(text)
-        analysis["projects"] = self._extract_projects(text)
-        analysis["keywords"] = self._extract_keywords(text)
+        analysis["contact_info"] = self._extract_contact_info(ctx)
+        analysis["education"] = self._extract_education(ctx)
+        analysis["experience"] = self._extract_experience(ctx)
+        analysis["skills"] = self._extract_skills(ctx)
+        analysis["certifications"] = self._extract_certifications(ctx)
+        analysis["languages"] = self._extract_languages(ctx)
+        analysis["projects"] = self._extract_projects(ctx)
+        analysis["keywords"] = self._extract_keywords(ctx)
         
         # Advanced analysis
-        analysis["quantifiable_achievements"] = self._find_quantifiable_achievements(text)
-        analysis["action_verbs_count"] = self._count_action_verbs(text)
-        analysis["ats_score"] = self._calculate_ats_score(text)
-        analysis["readability_score"] = self._calculate_readability_score(text)
-        analysis["sentiment_score"] = self._analyze_sentiment(text)
+        analysis["quantifiable_achievements"] = self._find_quantifiable_achievements(ctx)
+        analysis["action_verbs_count"] = self._count_action_verbs(ctx)
+        analysis["ats_score"] = self._calculate_ats_score(ctx)
+        analysis["readability_score"] = self._calculate_readability_score(ctx)
+        analysis["sentiment_score"] = self._analyze_sentiment(ctx)
         
         # Job matching if job description provided
         if job_description:
-            analysis["skills_match"], analysis["job_fit_score"] = self._match_job_requirements(text, job_description)
+            analysis["skills_match"], analysis["job_fit_score"] = self._match_job_requirements(ctx, job_description)
         
         # Generate suggestions
-        analysis["suggested_changes"] = self._generate_suggestions(analysis, text)
+        analysis["suggested_changes"] = self._generate_suggestions(analysis, ctx)
         
         return analysis
     
     def _extract_contact_info(self, text: str) -> Dict[str, str]:
         """Extract contact information from resume text"""
+        ctx = AnalysisContext.of(text)
         contact_info = {}
         
-        # Email pattern
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
+        emails = ctx.findall(EMAIL_PATTERN)
         if emails:
             contact_info['email'] = emails[0]
         
-        # Phone pattern
-        phone_pattern = r'(\+?1?[-. ]?)?\(?([0-9]{3})\)?[-. ]?([0-9]{3})[-. ]?([0-9]{4})'
-        phones = re.findall(phone_pattern, text)
+        phones = ctx.findall(PHONE_PATTERN)
         if phones:
             contact_info['phone'] = ''.join(phones[0])
         
-        # LinkedIn pattern
-        linkedin_pattern = r'(linkedin\.com/in/[A-Za-z0-9-]+)'
-        linkedin = re.findall(linkedin_pattern, text, re.IGNORECASE)
+        linkedin = ctx.findall(LINKEDIN_PATTERN)
         if linkedin:
             contact_info['linkedin'] = f"https://{linkedin[0]}"
         
-        # GitHub pattern
-        github_pattern = r'(github\.com/[A-Za-z0-9-]+)'
-        github = re.findall(github_pattern, text, re.IGNORECASE)
+        github = ctx.findall(GITHUB_PATTERN)
         if github:
             contact_info['github'] = f"https://{github[0]}"
         
@@ -187,17 +269,11 @@ class ResumeNLPAnalyzer:
     
     def _extract_education(self, text: str) -> List[Dict[str, str]]:
         """Extract education information"""
+        ctx = AnalysisContext.of(text)
         education = []
         
-        # Common degree patterns
-        degree_patterns = [
-            r'(Bachelor|Master|PhD|Ph\.D|MBA|BS|BA|MS|MA)\s+(?:of\s+)?(?:Science\s+)?(?:Arts\s+)?(?:in\s+)?([^,\n.]+)',
-            r'(B\.S\.|B\.A\.|M\.S\.|M\.A\.|Ph\.D\.)\s+(?:in\s+)?([^,\n.]+)',
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for pattern in DEGREE_PATTERNS:
+            for match in ctx.findall(pattern):
                 education.append({
                     'degree': match[0],
                     'field': match[1].strip()
@@ -205,24 +281,43 @@ class ResumeNLPAnalyzer:
         
         return education
     
+    def _keyword_matcher(self) -> KeywordMatcher:
+        """
+        One matcher for all built-in keyword lists (skills, languages, certifications,
+        action verbs), compiled once per process. Counts are keyed by keyword, so each
+        extractor picks its own list out of the same scan.
+        """
+        matcher = self._shared_matchers.get('resume')
+        if matcher is None:
+            keywords = [skill for skills_list in self.skills_database.values() for skill in skills_list]
+            keywords += PROGRAMMING_LANGUAGES + SPOKEN_LANGUAGES + CERTIFICATION_KEYWORDS + self.action_verbs
+            matcher = self._shared_matchers['resume'] = KeywordMatcher(list(dict.fromkeys(keywords)))
+        return matcher
+    
+    def _keyword_counts(self, text: str) -> Counter:
+        """Occurrences of every built-in keyword, from one pass over the text"""
+        return AnalysisContext.of(text).keyword_counts(self._keyword_matcher())
+    
     def _extract_skills(self, text: str) -> List[Dict[str, float]]:
         """Extract and score skills from text"""
         skills_found = []
-        text_lower = text.lower()
-        
-        for skill_category, skills_list in self.skills_database.items():
-            for skill in skills_list:
-                skill_lower = skill.lower()
-                # Count occurrences and calculate confidence
-                count = len(re.findall(r'\b' + re.escape(skill_lower) + r'\b', text_lower))
-                if count > 0:
-                    confidence = min(count / 3.0, 1.0)  # Max confidence at 3+ mentions
-                    skills_found.append({
-                        'skill': skill,
-                        'category': skill_category,
-                        'confidence': round(confidence, 2),
-                        'mentions': count
-                    })
+        skill_categories = {
+            skill: skill_category
+            for skill_category, skills_list in self.skills_database.items()
+            for skill in skills_list
+        }
+        
+        counts = self._keyword_counts(text)
+        for skill, skill_category in skill_categories.items():
+            count = counts.get(skill, 0)
+            if count > 0:
+                confidence = min(count / 3.0, 1.0)  # Max confidence at 3+ mentions
+                skills_found.append({
+                    'skill': skill,
+                    'category': skill_category,
+                    'confidence': round(confidence, 2),
+                    'mentions': count
+                })
         
         # Sort by confidence and return top skills
         return sorted(skills_found, key=lambda x: x['confidence'], reverse=True)[:20]
@@ -304,18 +399,12 @@ class ResumeNLPAnalyzer:
     
     def _extract_experience(self, text: str) -> List[Dict[str, str]]:
         """Extract work experience from resume text"""
+        ctx = AnalysisContext.of(text)
         experience = []
         
         # Look for job titles and companies
-        job_patterns = [
-            r'([A-Z][a-z]+\s+[A-Z][a-z]+)\s+at\s+([A-Z][a-zA-Z\s&.]+)',
-            r'([A-Z][a-z]+\s+[A-Z][a-z]+)\s+-\s+([A-Z][a-zA-Z\s&.]+)',
-            r'([A-Z][a-z]+\s+[A-Z][a-z]+)\s+\|\s+([A-Z][a-zA-Z\s&.]+)',
-        ]
-        
-        for pattern in job_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
+        for pattern in JOB_PATTERNS:
+            for match in ctx.findall(pattern):
                 experience.append({
                     'position': match[0],
                     'company': match[1].strip()
@@ -325,63 +414,23 @@ class ResumeNLPAnalyzer:
     
     def _extract_certifications(self, text: str) -> List[str]:
         """Extract certifications from resume text"""
-        certifications = []
-        text_lower = text.lower()
-        
-        # Common certifications
-        cert_keywords = [
-            'AWS Certified', 'Azure Certified', 'Google Cloud', 'PMP', 'Scrum Master',
-            'CISSP', 'CompTIA', 'Cisco', 'Microsoft Certified', 'Oracle Certified',
-            'Kubernetes', 'Docker Certified', 'Salesforce', 'Tableau', 'Power BI'
-        ]
-        
-        for cert in cert_keywords:
-            if cert.lower() in text_lower:
-                certifications.append(cert)
-        
-        return certifications
+        found = self._keyword_counts(text)
+        return [cert for cert in CERTIFICATION_KEYWORDS if cert in found]
     
     def _extract_languages(self, text: str) -> List[str]:
         """Extract programming/spoken languages from resume text"""
-        languages = []
-        text_lower = text.lower()
-        
-        # Programming languages
-        prog_languages = [
-            'Python', 'JavaScript', 'Java', 'C++', 'C#', 'PHP', 'Ruby', 'Go', 'Rust',
-            'Swift', 'Kotlin', 'TypeScript', 'Scala', 'R', 'MATLAB', 'SQL'
-        ]
-        
-        # Spoken languages
-        spoken_languages = [
-            'English', 'Spanish', 'French', 'German', 'Chinese', 'Japanese',
-            'Korean', 'Italian', 'Portuguese', 'Russian', 'Arabic', 'Hindi'
-        ]
-        
-        all_languages = prog_languages + spoken_languages
-        
-        for lang in all_languages:
-            if lang.lower() in text_lower:
-                languages.append(lang)
-        
-        return languages
+        # Whole-word matches, so "R" or "Go" are not found inside other words
+        found = self._keyword_counts(text)
+        return [lang for lang in PROGRAMMING_LANGUAGES + SPOKEN_LANGUAGES if lang in found]
     
     def _extract_projects(self, text: str) -> List[Dict[str, str]]:
         """Extract project information from resume text"""
+        ctx = AnalysisContext.of(text)
         projects = []
         
         # Look for project sections and descriptions
-        project_patterns = [
-            r'Project:\s*([^\n]+)',
-            r'([A-Z][a-zA-Z\s]+)\s+Project',
-            r'Built\s+([^.]+)',
-            r'Developed\s+([^.]+)',
-            r'Created\s+([^.]+)'
-        ]
-        
-        for pattern in project_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
+        for pattern in PROJECT_PATTERNS:
+            for match in ctx.findall(pattern):
                 if isinstance(match, tuple):
                     match = match[0]
                 projects.append({
@@ -393,20 +442,12 @@ class ResumeNLPAnalyzer:
     
     def _find_quantifiable_achievements(self, text: str) -> List[str]:
         """Find quantifiable achievements in resume text"""
+        ctx = AnalysisContext.of(text)
         achievements = []
         
         # Patterns for numbers and percentages
-        patterns = [
-            r'(increased?|improved?|reduced?|saved?|generated?)\s+[^\d]*([\d,]+\%?)',
-            r'([\d,]+\%?)\s+(increase|improvement|reduction|growth)',
-            r'(\$[\d,]+)\s+(saved?|generated?|revenue)',
-            r'([\d,]+)\s+(users?|customers?|clients?|projects?)',
-            r'(managed?|led)\s+([\d,]+)\s+(people|team|members)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for pattern in ACHIEVEMENT_PATTERNS:
+            for match in ctx.findall(pattern):
                 achievement = ' '.join(match).strip()
                 if achievement:
                     achievements.append(achievement)
@@ -415,50 +456,47 @@ class ResumeNLPAnalyzer:
     
     def _count_action_verbs(self, text: str) -> int:
         """Count action verbs in resume text"""
-        text_lower = text.lower()
-        count = 0
-        
-        for verb in self.action_verbs:
-            count += len(re.findall(r'\b' + verb.lower() + r'\b', text_lower))
-        
-        return count
+        found = self._keyword_counts(text)
+        return sum(found[verb] for verb in self.action_verbs)
     
     def _calculate_ats_score(self, text: str) -> int:
         """Calculate ATS (Applicant Tracking System) friendliness score"""
+        ctx = AnalysisContext.of(text)
         score = 0
         
         # Check for standard sections
         sections = ['experience', 'education', 'skills', 'contact']
         for section in sections:
-            if section.lower() in text.lower():
+            if section in ctx.lower:
                 score += 20
         
         # Check for bullet points or structured format
-        if '•' in text or '*' in text or '-' in text:
+        if '•' in ctx.text or '*' in ctx.text or '-' in ctx.text:
             score += 10
         
-        # Check for phone and email
-        if re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text):
+        # Check for phone and email (same matches as contact extraction)
+        if ctx.findall(EMAIL_PATTERN):
             score += 5
-        if re.search(r'(\+?1?[-. ]?)?\(?([0-9]{3})\)?[-. ]?([0-9]{3})[-. ]?([0-9]{4})', text):
+        if ctx.findall(PHONE_PATTERN):
             score += 5
         
         return min(score, 100)
     
     def _calculate_readability_score(self, text: str) -> int:
         """Calculate readability score using textstat library"""
+        ctx = AnalysisContext.of(text)
         if ADVANCED_LIBS_AVAILABLE:
             try:
                 # Flesch Reading Ease Score
-                flesch_score = textstat.flesch_reading_ease(text)
+                flesch_score = textstat.flesch_reading_ease(ctx.text)
                 # Convert to 0-100 scale where higher is better
                 return max(0, min(100, int(flesch_score)))
             except:
                 pass
         
         # Fallback: simple readability based on sentence and word length
-        sentences = text.split('.')
-        words = text.split()
+        sentences = ctx.sentence_spans
+        words = ctx.tokens
         
         if len(sentences) == 0 or len(words) == 0:
             return 50
@@ -477,9 +515,10 @@ class ResumeNLPAnalyzer:
     
     def _analyze_sentiment(self, text: str) -> float:
         """Analyze sentiment of resume text"""
+        ctx = AnalysisContext.of(text)
         if self.sentiment_analyzer:
             try:
-                result = self.sentiment_analyzer(text[:512])  # Limit text length
+                result = self.sentiment_analyzer(ctx.text[:512])  # Limit text length
                 if result[0]['label'] == 'POSITIVE':
                     return result[0]['score']
                 else:
@@ -490,7 +529,7 @@ class ResumeNLPAnalyzer:
         # Fallback using TextBlob if available
         if TEXTBLOB_AVAILABLE:
             try:
-                blob = TextBlob(text)
+                blob = TextBlob(ctx.text)
                 return blob.sentiment.polarity
             except:
                 pass
@@ -499,13 +538,14 @@ class ResumeNLPAnalyzer:
     
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract keywords using advanced NLP techniques"""
+        ctx = AnalysisContext.of(text, self.nlp_model)
         keywords = []
         
         # Use KeyBERT if available
         if self.keyword_extractor and ADVANCED_LIBS_AVAILABLE:
             try:
                 keybert_keywords = self.keyword_extractor.extract_keywords(
-                    text, 
+                    ctx.text, 
                     keyphrase_ngram_range=(1, 3), 
                     stop_words='english',
                     top_k=15
@@ -517,7 +557,7 @@ class ResumeNLPAnalyzer:
         # Use YAKE if available
         if self.yake_extractor and ADVANCED_LIBS_AVAILABLE:
             try:
-                yake_keywords = self.yake_extractor.extract_keywords(text)
+                yake_keywords = self.yake_extractor.extract_keywords(ctx.text)
                 keywords.extend([kw[1] for kw in yake_keywords[:10]])
             except Exception as e:
                 print(f"YAKE extraction failed: {e}")
@@ -525,7 +565,7 @@ class ResumeNLPAnalyzer:
         # Use spaCy if available
         if self.nlp_model:
             try:
-                doc = self.nlp_model(text)
+                doc = ctx.doc
                 # Extract named entities
                 entities = [ent.text for ent in doc.ents if ent.label_ in ['ORG', 'PRODUCT', 'TECH']]
                 keywords.extend(entities)
@@ -538,7 +578,7 @@ class ResumeNLPAnalyzer:
         
         # Fallback: simple keyword extraction
         if not keywords:
-            keywords = self._simple_keyword_extraction(text)
+            keywords = self._simple_keyword_extraction(ctx)
         
         # Remove duplicates and return top keywords
         unique_keywords = list(dict.fromkeys(keywords))  # Preserve order
@@ -554,7 +594,7 @@ class ResumeNLPAnalyzer:
         }
         
         # Extract words that appear frequently and are not stop words
-        words = re.findall(r'\b[A-Za-z]{3,}\b', text.lower())
+        words = KEYWORD_WORD_PATTERN.findall(AnalysisContext.of(text).lower)
         word_freq = Counter(words)
         
         keywords = []
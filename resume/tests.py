@@ -0,0 +1,133 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from insights.services import JobInsightsService
+from ml.matcher import KeywordMatcher
+from .nlp_models import NLPModelRegistry, nlp_models
+from .nlp_utils import EMAIL_PATTERN, AnalysisContext, ResumeNLPAnalyzer
+
+
+class NLPModelRegistryTests(SimpleTestCase):
+    def test_concurrent_first_use_loads_once(self):
+        loads = []
+
+        def load():
+            loads.append(1)
+            time.sleep(0.05)
+            return object()
+
+        registry = NLPModelRegistry()
+        registry.register('slow', load)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get('slow'))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(len({id(model) for model in results}), 1)
+        status = registry.status()[0]
+        self.assertEqual(status['state'], 'loaded')
+        self.assertGreater(status['load_seconds'], 0)
+
+    def test_missing_library_is_not_retried(self):
+        calls = []
+
+        def load():
+            calls.append(1)
+            raise ImportError('no module named fancy_nlp')
+
+        registry = NLPModelRegistry()
+        registry.register('fancy', load)
+        self.assertIsNone(registry.get('fancy'))
+        self.assertIsNone(registry.get('fancy'))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(registry.status()[0]['state'], 'unavailable')
+        registry.reset('fancy')
+        registry.get('fancy')
+        self.assertEqual(len(calls), 2)
+
+    def test_analyzers_share_model_instances(self):
+        first, second = ResumeNLPAnalyzer(), ResumeNLPAnalyzer()
+        self.assertIs(first.nlp_model, second.nlp_model)
+        self.assertIs(first.yake_extractor, second.yake_extractor)
+
+
+class KeywordMatcherTests(SimpleTestCase):
+    def test_matches_whole_words_in_one_pass(self):
+        matcher = KeywordMatcher({'SQL': 'db', 'SQL Server': 'db', 'C++': 'lang', 'R': 'lang', 'Go': 'lang'})
+        text = 'Tuned SQL Server and sql queries; wrote C++ and R. No Golang, no Rust.'
+        self.assertEqual(matcher.counts(text), {'SQL': 2, 'SQL Server': 1, 'C++': 1, 'R': 1})
+        self.assertEqual(matcher.find_all('c++')[0], (0, 3, 'C++', 'lang'))
+
+    def test_scales_without_per_keyword_scans(self):
+        keywords = [f'skill{i}' for i in range(50000)] + ['Kubernetes']
+        matcher = KeywordMatcher(keywords)
+        self.assertEqual(matcher.counts('kubernetes and skill49999 but not skill499990'),
+                         {'Kubernetes': 1, 'skill49999': 1})
+
+    def test_analyzer_and_job_insights_use_word_boundaries(self):
+        analyzer = ResumeNLPAnalyzer()
+        text = 'Python developer. Python, Django and Go. Managed and led a team; led releases.'
+        skills = {s['skill']: s['mentions'] for s in analyzer._extract_skills(text)}
+        self.assertEqual(skills, {'Python': 2, 'Django': 1, 'Go': 1})
+        self.assertEqual(analyzer._extract_languages('Good grammar in English'), ['English'])
+        self.assertEqual(analyzer._count_action_verbs(text), 3)
+        self.assertEqual(analyzer._extract_certifications('PMP and AWS Certified'), ['AWS Certified', 'PMP'])
+
+        description = 'Docker and Python required; React nice to have. Going remote.'
+        self.assertEqual(JobInsightsService()._extract_skills_from_description(description),
+                         ['Docker', 'Python', 'React'])
+
+
+class AnalysisContextTests(SimpleTestCase):
+    RESUME = ('Jane Doe\r\njane@example.com | (555) 123-4567 | linkedin.com/in/janedoe\r\n'
+              'Experience: Senior Engineer at Acme Corp. Led 5 people and improved latency by 40%.\r\n'
+              'Education: Bachelor of Science in Computer Science. Skills: Python, Django, SQL.')
+
+    def test_normalises_once_and_indexes_tokens(self):
+        ctx = AnalysisContext('Ｐｙｔｈｏｎ dev.\r\nUses  SQL.')
+        self.assertEqual(ctx.text, 'Python dev.\nUses  SQL.')
+        self.assertEqual(ctx.lower, 'python dev.\nuses  sql.')
+        self.assertEqual(ctx.tokens, ['Python', 'dev.', 'Uses', 'SQL.'])
+        self.assertEqual([ctx.text[a:b] for a, b in ctx.sentence_spans], ['Python dev', '\nUses  SQL', ''])
+        self.assertIs(AnalysisContext.of(ctx), ctx)
+
+    def test_extractors_give_the_same_results_from_a_shared_context(self):
+        analyzer = ResumeNLPAnalyzer()
+        ctx = AnalysisContext(self.RESUME)
+        for extract in (analyzer._extract_contact_info, analyzer._extract_education, analyzer._extract_experience,
+                        analyzer._extract_skills, analyzer._find_quantifiable_achievements,
+                        analyzer._count_action_verbs, analyzer._calculate_ats_score,
+                        analyzer._calculate_readability_score):
+            self.assertEqual(extract(ctx), extract(self.RESUME), extract.__name__)
+        # Contact extraction and the ATS score share one scan for e-mail addresses
+        self.assertIs(ctx.findall(EMAIL_PATTERN), ctx.findall(EMAIL_PATTERN))
+        self.assertEqual(ctx.findall(EMAIL_PATTERN), ['jane@example.com'])
+
+    def test_full_analysis_uses_the_context(self):
+        analysis = ResumeNLPAnalyzer().analyze_resume_text(self.RESUME, 'Python and SQL required')
+        self.assertEqual(analysis['contact_info']['email'], 'jane@example.com')
+        self.assertEqual(analysis['job_fit_score'], 100.0)
+
+
+class NLPStatusViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(username='ivy', password='Str0ngP@ss!')
+        self.client.force_authenticate(self.user)
+
+    def test_status_lists_every_model(self):
+        r = self.client.get('/resume/nlp-status/')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([m['name'] for m in r.data['models']], nlp_models.names())
+        self.assertEqual(self.client.post('/resume/nlp-status/', {}, format='json').status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        r = self.client.post('/resume/nlp-status/', {'models': ['bogus']}, format='json')
+        self.assertEqual(r.status_code, 400)
@@ -7,5 +7,6 @@ urlpatterns = [
     path('analyze/', views.analyze_resume_enhanced, name='analyze-resume-enhanced'),
     path('analyze/advanced/', views.analyze_resume_advanced_insights, name='analyze-resume-advanced'),
     path('<int:resume_id>/analysis/', views.get_analysis, name='get-analysis'),
+    path('nlp-status/', views.nlp_status, name='nlp-status'),
     path('debug/', views.debug_auth, name='debug-auth'),
 ]
@@ -6,6 +6,7 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from django.contrib.auth import get_user_model
 from .models import Resume, ResumeAnalysis, JobMatch, ResumeData
 from .serializers import ResumeSerializer, ResumeWithAnalysisSerializer, ResumeAnalysisSerializer
+from .nlp_models import nlp_models
 from .nlp_utils import ResumeNLPAnalyzer
 from .pdf_utils import AdvancedDocumentProcessor
 import json
@@ -402,6 +403,21 @@ def get_analysis(request, resume_id):
         return Response({'error': 'Resume not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def nlp_status(request):
+    """Load state, load time and memory of each shared NLP model; staff can POST to warm them up"""
+    if request.method == 'POST':
+        if not request.user.is_staff:
+            return Response({'error': 'Only staff can warm up NLP models'}, status=status.HTTP_403_FORBIDDEN)
+        names = request.data.get('models') or nlp_models.names()
+        unknown = sorted(set(names) - set(nlp_models.names())) if isinstance(names, list) else names
+        if unknown:
+            return Response({'error': f'Unknown models: {unknown}'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'models': nlp_models.warm_up(names)})
+    return Response({'models': nlp_models.status()})
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def debug_auth(request):
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Skill, UserSkill
+from .models import Skill, SkillPrerequisite, UserSkill
 
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
@@ -11,3 +11,8 @@ class UserSkillAdmin(admin.ModelAdmin):
     list_display = ('user', 'skill', 'level', 'updated_at')
     list_filter = ('skill',)
     search_fields = ('user__username', 'skill__name')
+
+@admin.register(SkillPrerequisite)
+class SkillPrerequisiteAdmin(admin.ModelAdmin):
+    list_display = ('skill', 'prerequisite', 'created_at')
+    search_fields = ('skill__name', 'prerequisite__name')
@@ -0,0 +1,258 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Count, Max
+
+from .models import SkillPrerequisite
+
+logger = logging.getLogger(__name__)
+
+
+class SkillGraph:
+    """
+    Skill prerequisite DAG with its transitive closure held as integer bitsets.
+
+    Every skill id gets a bit position; ``ancestors[i]`` has a bit set for each skill
+    that position ``i`` transitively requires and ``descendants[i]`` for each skill
+    that transitively requires it. "Does a require b" is a single bit test, and an
+    added edge only ORs the new ancestors into the affected descendants.
+    """
+
+    def __init__(self):
+        self.positions: Dict[int, int] = {}
+        self.skill_ids: List[int] = []
+        self.ancestors: List[int] = []
+        self.descendants: List[int] = []
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[int, int]]) -> 'SkillGraph':
+        """Build from (skill id, prerequisite id) pairs in O(V + E) big-int ORs; ValueError on a cycle"""
+        graph = cls()
+        prereqs: Dict[int, List[int]] = {}
+        for skill_id, prerequisite_id in edges:
+            i, j = graph._position(skill_id), graph._position(prerequisite_id)
+            prereqs.setdefault(i, []).append(j)
+
+        children: Dict[int, List[int]] = {}
+        for i, js in prereqs.items():
+            for j in js:
+                children.setdefault(j, []).append(i)
+        indegree = [len(prereqs.get(i, ())) for i in range(len(graph.skill_ids))]
+        order = [i for i, degree in enumerate(indegree) if degree == 0]
+        for i in order:
+            for child in children.get(i, ()):
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    order.append(child)
+        if len(order) != len(graph.skill_ids):
+            raise ValueError('Skill prerequisites contain a cycle')
+
+        for i in order:
+            for j in prereqs.get(i, ()):
+                graph.ancestors[i] |= graph.ancestors[j] | (1 << j)
+        for i in reversed(order):
+            for child in children.get(i, ()):
+                graph.descendants[i] |= graph.descendants[child] | (1 << child)
+        return graph
+
+    def requires(self, skill_id: int, prerequisite_id: int) -> bool:
+        """True when ``skill_id`` transitively requires ``prerequisite_id``"""
+        i, j = self.positions.get(skill_id), self.positions.get(prerequisite_id)
+        if i is None or j is None:
+            return False
+        return bool(self.ancestors[i] >> j & 1)
+
+    def add_edge(self, skill_id: int, prerequisite_id: int):
+        """
+        Record that ``skill_id`` requires ``prerequisite_id`` and update the closure of
+        the affected skills only. Raises ValueError if the edge would close a cycle.
+        """
+        if skill_id == prerequisite_id or self.requires(prerequisite_id, skill_id):
+            raise ValueError(f'Skill {skill_id} cannot require {prerequisite_id}: it would create a cycle')
+        i, j = self._position(skill_id), self._position(prerequisite_id)
+        if self.ancestors[i] >> j & 1:
+            return
+
+        new_ancestors = self.ancestors[j] | (1 << j)
+        new_descendants = self.descendants[i] | (1 << i)
+        for k in self._bits(new_descendants):
+            self.ancestors[k] |= new_ancestors
+        for k in self._bits(new_ancestors):
+            self.descendants[k] |= new_descendants
+
+    def order(self, skill_ids: Iterable[int]) -> List[int]:
+        """
+        Deduplicate ``skill_ids`` and order them so prerequisites come first.
+
+        A skill always has more ancestors than anything it requires, so a stable sort
+        on the ancestor count is a topological order that otherwise keeps the input order.
+        """
+        unique = list(dict.fromkeys(skill_ids))
+        return sorted(unique, key=self.depth)
+
+    def depth(self, skill_id: int) -> int:
+        """Number of skills ``skill_id`` transitively requires"""
+        i = self.positions.get(skill_id)
+        return 0 if i is None else self.ancestors[i].bit_count()
+
+    def edges_within(self, skill_ids: Iterable[int]) -> List[Tuple[int, int]]:
+        """
+        (skill id, prerequisite id) pairs among ``skill_ids`` with implied pairs removed,
+        i.e. the transitive reduction of the closure restricted to those skills.
+        """
+        members = [skill_id for skill_id in dict.fromkeys(skill_ids) if skill_id in self.positions]
+        mask = 0
+        for skill_id in members:
+            mask |= 1 << self.positions[skill_id]
+        edges = []
+        for skill_id in members:
+            within = self.ancestors[self.positions[skill_id]] & mask
+            implied = 0
+            for k in self._bits(within):
+                implied |= self.ancestors[k]
+            edges.extend((skill_id, self.skill_ids[k]) for k in self._bits(within & ~implied))
+        return edges
+
+    def _position(self, skill_id: int) -> int:
+        i = self.positions.get(skill_id)
+        if i is None:
+            i = self.positions[skill_id] = len(self.skill_ids)
+            self.skill_ids.append(skill_id)
+            self.ancestors.append(0)
+            self.descendants.append(0)
+        return i
+
+    @staticmethod
+    def _bits(bitset: int):
+        while bitset:
+            low = bitset & -bitset
+            yield low.bit_length() - 1
+            bitset ^= low
+
+
+# How often a process compares its cached graph with the database, which catches
+# edges written by other processes (signals only reach the process that wrote them)
+VERSION_CHECK_SECONDS = 5.0
+# pg_advisory_xact_lock key serialising prerequisite writes across processes
+PREREQUISITE_LOCK_KEY = 0x5C111
+
+_lock = threading.Lock()
+_graph: Optional[SkillGraph] = None
+_graph_version: Optional[Tuple[int, Optional[int]]] = None
+_checked_at = 0.0
+
+
+def graph_version(using: str = DEFAULT_DB_ALIAS) -> Tuple[int, Optional[int]]:
+    """
+    Database-wide version of the prerequisite edges: (edge count, newest edge id).
+    Any insert raises the newest id and any delete lowers the count, whichever process made it.
+    """
+    stats = SkillPrerequisite.objects.using(using).aggregate(count=Count('id'), newest=Max('id'))
+    return stats['count'], stats['newest']
+
+
+def get_skill_graph() -> SkillGraph:
+    """Process-wide graph, loaded with one query and re-checked against the database every few seconds"""
+    graph = _graph
+    if graph is not None and time.monotonic() - _checked_at < VERSION_CHECK_SECONDS:
+        return graph
+    return _load()
+
+
+def _load(using: str = DEFAULT_DB_ALIAS) -> SkillGraph:
+    global _graph, _graph_version, _checked_at
+    with _lock:
+        version = graph_version(using)
+        if _graph is None or _graph_version != version:
+            _graph, _graph_version = _build(_edges(using)), version
+        _checked_at = time.monotonic()
+        return _graph
+
+
+def _edges(using: str) -> List[Tuple[int, int]]:
+    # Oldest first, so a cycle is broken at the edge that closed it
+    return list(SkillPrerequisite.objects.using(using).order_by('id').values_list('skill_id', 'prerequisite_id'))
+
+
+def _build(edges: List[Tuple[int, int]]) -> SkillGraph:
+    try:
+        return SkillGraph.from_edges(edges)
+    except ValueError:
+        # Never fail the request path: keep every edge that does not close a cycle
+        logger.exception("Skill prerequisites contain a cycle; ignoring the edges that close it")
+        graph = SkillGraph()
+        for skill_id, prerequisite_id in edges:
+            try:
+                graph.add_edge(skill_id, prerequisite_id)
+            except ValueError:
+                logger.error("Ignoring skill prerequisite %s -> %s", skill_id, prerequisite_id)
+        return graph
+
+
+def invalidate_skill_graph():
+    """Drop the cached graph; the next get_skill_graph() reloads it"""
+    global _graph, _graph_version
+    with _lock:
+        _graph, _graph_version = None, None
+
+
+def apply_prerequisite(skill_id: int, prerequisite_id: int, edge_id: Optional[int] = None):
+    """Fold a committed edge into the cached graph, reloading it if the edge does not fit"""
+    global _graph_version
+    with _lock:
+        if _graph is None:
+            return
+        try:
+            _graph.add_edge(skill_id, prerequisite_id)
+            # Expected version after this one insert; any other change still makes the next check reload
+            if _graph_version is not None and edge_id is not None:
+                count, newest = _graph_version
+                _graph_version = (count + 1, max(newest or 0, edge_id))
+            return
+        except ValueError:
+            logger.exception("Error applying skill prerequisite %s -> %s", skill_id, prerequisite_id)
+    invalidate_skill_graph()
+
+
+def check_prerequisite(skill_id: int, prerequisite_id: int, using: str = DEFAULT_DB_ALIAS):
+    """
+    Raise ValueError if ``skill_id`` requiring ``prerequisite_id`` would create a cycle.
+
+    Must run inside ``transaction.atomic()``, before the edge is written: it takes a
+    lock that serialises prerequisite writes across processes until the transaction
+    ends, then checks against the edges committed in the database rather than this
+    process's cached copy, so concurrent adds cannot together close a cycle.
+    """
+    _lock_prerequisite_writes(using)
+    if skill_id == prerequisite_id or _fresh_graph(using).requires(prerequisite_id, skill_id):
+        raise ValueError(f'Skill {skill_id} cannot require {prerequisite_id}: it would create a cycle')
+
+
+def _fresh_graph(using: str) -> SkillGraph:
+    # The cached graph when it matches the database, else a private copy: edges read
+    # inside the caller's transaction may still roll back, so they never reach the cache
+    version = graph_version(using)
+    with _lock:
+        if _graph is not None and _graph_version == version:
+            return _graph
+    return _build(_edges(using))
+
+
+def _lock_prerequisite_writes(using: str):
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [PREREQUISITE_LOCK_KEY])
+    else:
+        # SQLite allows a single writer per database; any write statement takes that lock until commit
+        SkillPrerequisite.objects.using(using).filter(pk=0).update(prerequisite_id=0)
+
+
+def add_prerequisite(skill_id: int, prerequisite_id: int) -> SkillPrerequisite:
+    """Store that ``skill_id`` requires ``prerequisite_id``; ValueError if it would create a cycle"""
+    # SkillPrerequisite.save() runs check_prerequisite under the write lock
+    link, _ = SkillPrerequisite.objects.get_or_create(skill_id=skill_id, prerequisite_id=prerequisite_id)
+    return link
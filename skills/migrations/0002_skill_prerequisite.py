@@ -0,0 +1,31 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillPrerequisite',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('prerequisite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dependent_links', to='skills.skill')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prerequisite_links', to='skills.skill')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='skillprerequisite',
+            constraint=models.CheckConstraint(check=models.Q(('skill', models.F('prerequisite')), _negated=True), name='skill_prerequisite_not_self'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='skillprerequisite',
+            unique_together={('skill', 'prerequisite')},
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, router, transaction
 from django.conf import settings
 
 # Create your models here.
@@ -23,3 +24,32 @@ class UserSkill(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.skill.name}: {self.level}"
+
+
+class SkillPrerequisite(models.Model):
+    """``skill`` requires ``prerequisite``; save() rejects edges that would make the graph cyclic"""
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='prerequisite_links')
+    prerequisite = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='dependent_links')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('skill', 'prerequisite')
+        constraints = [
+            models.CheckConstraint(check=~models.Q(skill=models.F('prerequisite')), name='skill_prerequisite_not_self'),
+        ]
+
+    def clean(self):
+        # Early form feedback only; save() repeats the check under the write lock
+        from .graph import get_skill_graph
+        if self.skill_id == self.prerequisite_id or get_skill_graph().requires(self.prerequisite_id, self.skill_id):
+            raise ValidationError('This prerequisite would create a cycle.')
+
+    def save(self, *args, **kwargs):
+        from .graph import check_prerequisite
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            check_prerequisite(self.skill_id, self.prerequisite_id, using)
+            super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.skill.name} requires {self.prerequisite.name}"
@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .graph import apply_prerequisite, invalidate_skill_graph
+from .models import SkillPrerequisite
+
+
+@receiver(post_save, sender=SkillPrerequisite)
+def skill_prerequisite_saved(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: apply_prerequisite(instance.skill_id, instance.prerequisite_id, instance.id))
+
+
+@receiver(post_delete, sender=SkillPrerequisite)
+def skill_prerequisite_deleted(sender, **kwargs):
+    # A closure cannot shrink incrementally, so removals reload the graph
+    invalidate_skill_graph()
+    transaction.on_commit(invalidate_skill_graph)
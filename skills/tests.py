@@ -1,7 +1,11 @@
-from django.test import TestCase
+import random
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
-from .models import Skill
+from .graph import SkillGraph, add_prerequisite, get_skill_graph, invalidate_skill_graph
+from .models import Skill, SkillPrerequisite
 
 
 class SkillEndpointsTests(TestCase):
@@ -20,4 +24,96 @@ class SkillEndpointsTests(TestCase):
         r = self.client.post('/skills/my/', { 'skill_id': self.skill.id, 'level': 60 }, format='json')
         self.assertEqual(r.status_code, 201)
 
-# Create your tests here.
+
+class SkillGraphTests(SimpleTestCase):
+    def test_incremental_edges_match_full_build(self):
+        rng = random.Random(3)
+        edges = [(i, j) for i in range(80) for j in range(i) if rng.random() < 0.05]
+        rng.shuffle(edges)
+        built = SkillGraph.from_edges(edges)
+        incremental = SkillGraph()
+        for skill_id, prerequisite_id in edges:
+            incremental.add_edge(skill_id, prerequisite_id)
+        for i in range(80):
+            for j in range(80):
+                self.assertEqual(incremental.requires(i, j), built.requires(i, j))
+
+        # Brute-force reachability agrees with the closure
+        prereqs = {}
+        for skill_id, prerequisite_id in edges:
+            prereqs.setdefault(skill_id, []).append(prerequisite_id)
+        def reachable(i):
+            seen, stack = set(), list(prereqs.get(i, ()))
+            while stack:
+                j = stack.pop()
+                if j not in seen:
+                    seen.add(j)
+                    stack.extend(prereqs.get(j, ()))
+            return seen
+        for i in range(80):
+            self.assertEqual({j for j in range(80) if built.requires(i, j)}, reachable(i))
+
+    def test_cycles_are_rejected(self):
+        graph = SkillGraph.from_edges([(2, 1), (3, 2)])
+        with self.assertRaises(ValueError):
+            graph.add_edge(1, 3)
+        with self.assertRaises(ValueError):
+            graph.add_edge(1, 1)
+        with self.assertRaises(ValueError):
+            SkillGraph.from_edges([(2, 1), (1, 2)])
+        self.assertFalse(graph.requires(1, 3))
+
+    def test_order_and_reduced_edges(self):
+        graph = SkillGraph.from_edges([(3, 2), (2, 1), (5, 4)])
+        self.assertEqual(graph.order([3, 5, 1, 3, 9, 2]), [1, 9, 5, 2, 3])
+        self.assertEqual(sorted(graph.edges_within([3, 2, 1])), [(2, 1), (3, 2)])
+        self.assertEqual(graph.edges_within([3, 1]), [(3, 1)])
+
+
+class SkillPrerequisiteTests(TestCase):
+    def setUp(self):
+        invalidate_skill_graph()
+        self.addCleanup(invalidate_skill_graph)
+        self.basics, self.python, self.django = [
+            Skill.objects.create(name=name) for name in ('Programming Basics', 'Python', 'Django')
+        ]
+
+    def test_cached_graph_follows_committed_edges(self):
+        graph = get_skill_graph()
+        with self.captureOnCommitCallbacks(execute=True):
+            add_prerequisite(self.python.id, self.basics.id)
+            add_prerequisite(self.django.id, self.python.id)
+        self.assertIs(get_skill_graph(), graph)
+        self.assertTrue(graph.requires(self.django.id, self.basics.id))
+        with self.assertRaises(ValueError):
+            add_prerequisite(self.basics.id, self.django.id)
+        self.assertEqual(SkillPrerequisite.objects.count(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SkillPrerequisite.objects.filter(skill=self.python).delete()
+        self.assertFalse(get_skill_graph().requires(self.django.id, self.basics.id))
+
+    def test_cache_picks_up_edges_written_by_other_processes(self):
+        graph = get_skill_graph()
+        # bulk_create sends no signals, like a write made by another worker
+        SkillPrerequisite.objects.bulk_create([SkillPrerequisite(skill=self.python, prerequisite=self.basics)])
+        self.assertIs(get_skill_graph(), graph)
+        with mock.patch('skills.graph.VERSION_CHECK_SECONDS', 0):
+            self.assertTrue(get_skill_graph().requires(self.python.id, self.basics.id))
+
+    def test_cycle_check_reads_edges_the_cache_has_not_seen(self):
+        get_skill_graph()
+        SkillPrerequisite.objects.bulk_create([SkillPrerequisite(skill=self.python, prerequisite=self.basics)])
+        with self.assertRaises(ValueError):
+            add_prerequisite(self.basics.id, self.python.id)
+        self.assertEqual(SkillPrerequisite.objects.count(), 1)
+
+    def test_cyclic_rows_are_logged_and_dropped_instead_of_raising(self):
+        SkillPrerequisite.objects.bulk_create([
+            SkillPrerequisite(skill=self.python, prerequisite=self.basics),
+            SkillPrerequisite(skill=self.basics, prerequisite=self.python),
+        ])
+        with self.assertLogs('skills.graph', 'ERROR'):
+            graph = get_skill_graph()
+        self.assertTrue(graph.requires(self.python.id, self.basics.id))
+        self.assertFalse(graph.requires(self.basics.id, self.python.id))